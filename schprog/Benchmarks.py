@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 09:12:40 2026
+
+@author: Marcus Naslund
+"""
+import itertools
+import os
+import pickle
+import time
+import schprog as SP
+import Libraries as LB
+
+""" BENCHMARKS: timing of the performance critical parts of the program.
+    Run from inside SCHDprog/schprog/ in the same way as MarcusPrototype.
+"""
+
+mVess = SP.Vessel(6.851, 2.008, 4500, 30.0, 12.0, 3.0, 0.875, 1.0)
+
+
+def create_members(nMembers):
+    """ Creates nMembers panels and nMembers stiffeners spread over sections
+        of 10 members each, which are not yet assigned to a structure.
+    """
+    panels = []
+    stiffeners = []
+    for i in range(0, nMembers):
+        secName = 'section %d' % (i // 10)
+        panels.append(SP.Panel(240.0, 845, 3.022, 0.12 + i*1e-3, 0, 'bottom', secName))
+        stiffeners.append(SP.Stiffener(845, 3.022, 0.24 + i*1e-3, 0, 240.0,
+                                       'bottom', 'longitudinal', secName))
+    return panels, stiffeners
+
+
+def bench_ingestion(sizes=(12500, 25000, 50000)):
+    """ Time to assign panels and stiffeners to a structure, one by one,
+        in bulk and with the old list concatenation (self.X = self.X + [obj]).
+        Linear scaling shows as a constant time per member.
+    """
+    print('%10s %22s %22s %22s' % ('members', 'assign_panel (us/mem)',
+                                   'assign_panels (us/mem)',
+                                   'list concat (us/mem)'))
+    for nMembers in sizes:
+        panels, stiffeners = create_members(nMembers // 2)
+
+        mStruct = SP.Structure(mVess)
+        start = time.perf_counter()
+        for objPan in panels:
+            mStruct.assign_panel(objPan)
+        for objStiff in stiffeners:
+            mStruct.assign_stiffener(objStiff)
+        single = time.perf_counter() - start
+
+        panels, stiffeners = create_members(nMembers // 2)
+        mStruct = SP.Structure(mVess)
+        start = time.perf_counter()
+        mStruct.assign_panels(panels)
+        mStruct.assign_stiffeners(stiffeners)
+        bulk = time.perf_counter() - start
+
+        start = time.perf_counter()
+        members = []
+        for obj in panels + stiffeners:
+            members = members + [obj]
+        concat = time.perf_counter() - start
+
+        print('%10d %22.2f %22.2f %22.2f' % (nMembers,
+                                             single / nMembers * 1e6,
+                                             bulk / nMembers * 1e6,
+                                             concat / nMembers * 1e6))
+
+
+def create_structure(nMembers, nSections=20):
+    """ Creates a structure with nMembers panels and nMembers stiffeners,
+        where sections of 10 members repeat along nSections positions.
+    """
+    panels, stiffeners = create_members(nMembers)
+    for i in range(0, nMembers):
+        panels[i].xPos = 0.3 * ((i // 10) % nSections)
+        stiffeners[i].xPos = 0.3 * ((i // 10) % nSections)
+    mStruct = SP.Structure(mVess)
+    mStruct.assign_panels(panels)
+    mStruct.assign_stiffeners(stiffeners)
+    mDes = SP.Designer()
+    mDes.assign_material_to_all_panels(mStruct, LB.mAL_5083_O)
+    mDes.assign_material_to_all_stiffeners(mStruct, LB.mAL_6082_T6_5)
+    return mStruct
+
+
+def bench_evaluate(sizes=(1000, 10000, 50000), repeats=5):
+    """ Time of one rule pass over all members, stage by stage
+        (calc_pressure_factors, calc_design_pressures, calc_scantling_req)
+        and fused (Designer.evaluate), with and without the rule cache.
+    """
+    mDes = SP.Designer()
+    print('%10s %18s %18s %18s %18s' % ('members', 'staged (ms)', 'fused (ms)',
+                                        'staged, no cache', 'fused, no cache'))
+    for nMembers in sizes:
+        mStruct = create_structure(nMembers // 2)
+        times = []
+        for cacheSize in (4096, 0):
+            mISO = SP.ISO12215('C')
+            mISO.cache = SP.RuleCache(cacheSize)
+
+            start = time.perf_counter()
+            for i in range(0, repeats):
+                mDes.calc_pressure_factors(mISO, mStruct, mVess)
+                mDes.calc_design_pressures(mISO, mStruct, mVess)
+                mDes.calc_scantling_req(mISO, mStruct, mVess)
+            times.append((time.perf_counter() - start) / repeats)
+
+            start = time.perf_counter()
+            for i in range(0, repeats):
+                mDes.evaluate(mISO, mStruct, mVess)
+            times.append((time.perf_counter() - start) / repeats)
+
+        print('%10d %18.2f %18.2f %18.2f %18.2f' % ((nMembers,) + tuple(t*1e3 for t in times)))
+
+
+def bench_task_overhead(sizes=(0, 10000, 50000), nStiff=6, repeats=20):
+    """ Serialisation cost per task of a parallel sweep, when the whole
+        structure and libraries are pickled into every task (a bound
+        iter_sweep_unit with its arguments) and when the numeric data is
+        published once with SharedArrays and the task only carries its
+        descriptor and indices (Optimizer.sweep_unit_shared with the
+        arguments iter_sweep_parallel submits). Both are pickled as the
+        (function, arguments) pair a ProcessPoolExecutor sends to a worker.
+        sizes are the number of other members in the structure, next to the
+        swept section.
+    """
+    mDes = SP.Designer()
+    mISO = SP.ISO12215('C')
+    mStress = SP.StressCalculator()
+    mOpt = SP.Optimizer()
+    panMat = [LB.mAL_5083_O]
+    stiffMat = [LB.mAL_6082_T6_5, LB.mAL_6061_T6]
+    extrusions = [LB.mFlatBar60x5, LB.mFlatBar40x5, LB.mTee40x40x4]
+    machined = LB.mProfLib.list_all_machined()
+    objCtx = mISO.get_rule_context(mVess)
+
+    print('%10s %16s %16s %16s %16s %16s' % ('members', 'pickled (kB)', 'pickled (ms)',
+                                             'shared (kB)', 'shared (ms)',
+                                             'publish (ms)'))
+    for nMembers in sizes:
+        mStruct = create_structure(nMembers // 2) if nMembers else SP.Structure(mVess)
+        mStrak = SP.Strake('Strake B1', 2, 480, 3, 0.240, 0)
+        mStruct.assign_strake(mStrak)
+        mDes.create_section(mStrak, 'B1 section1', 480, 845, 3.022, 0.240, 0, 'bottom')
+
+        libData = mOpt.sweep_library_arrays(mISO, panMat, stiffMat, [extrusions, machined],
+                                            LB.mPlaLib)
+        pickledTask = (mOpt.iter_sweep_unit,
+                       (mVess, mStruct, mISO, mDes, mStress, nStiff, panMat, stiffMat,
+                        [extrusions, machined], libData, 0, 0))
+        start = time.perf_counter()
+        for i in range(0, repeats):
+            data = pickle.dumps(pickledTask)
+            pickle.loads(data)
+        pickledTime = (time.perf_counter() - start) / repeats
+        pickledSize = len(data)
+
+        start = time.perf_counter()
+        [panMats, stiffMats, profSets, thicknesses, lastTP] = mOpt.sweep_library_arrays(
+            mISO, panMat, stiffMat, [extrusions, machined], LB.mPlaLib)
+        arrays = {'panMats': panMats, 'stiffMats': stiffMats,
+                  'extrusions': profSets[0], 'machined': profSets[1],
+                  'thicknesses': thicknesses, 'lastTP': lastTP}
+        objShared = SP.SharedArrays.create(arrays)
+        publishTime = time.perf_counter() - start
+
+        sharedTask = (SP.Optimizer.sweep_unit_shared,
+                      (objShared.descriptor(), objCtx, mISO.designCategory, 0, 0))
+        start = time.perf_counter()
+        for i in range(0, repeats):
+            data = pickle.dumps(sharedTask)
+            pickle.loads(data)
+        sharedTime = (time.perf_counter() - start) / repeats
+        sharedSize = len(data)
+        objShared.close()
+        objShared.unlink()
+
+        print('%10d %16.1f %16.3f %16.1f %16.3f %16.3f' % (nMembers,
+                                                          pickledSize / 1e3,
+                                                          pickledTime * 1e3,
+                                                          sharedSize / 1e3,
+                                                          sharedTime * 1e3,
+                                                          publishTime * 1e3))
+
+
+def bench_parallel_scaling(workers=(1, 2, 4), maxNrStiff=(6, 12), firstRows=10):
+    """ Time of a whole sweep of one section with workers processes (1 is
+        the serial sweep_method) and the speedup against the serial sweep,
+        next to the time until firstRows rows have been read and the
+        iteration is stopped, which cancels the units that have not started.
+        The speedup is bounded by os.cpu_count().
+    """
+    mDes = SP.Designer()
+    mISO = SP.ISO12215('C')
+    mStress = SP.StressCalculator()
+    mOpt = SP.Optimizer()
+    mats = [value for value in vars(LB).values() if isinstance(value, SP.MaterialsLibrary)]
+    extrusions = [value for value in vars(LB).values() if isinstance(value, SP.Extrusions)]
+    machined = LB.mProfLib.list_all_machined()
+    mStruct = SP.Structure(mVess)
+    mStrak = SP.Strake('Strake B1', 2, 480, 3, 0.240, 0)
+    mStruct.assign_strake(mStrak)
+    mDes.create_section(mStrak, 'B1 section1', 480, 845, 3.022, 0.240, 0, 'bottom')
+
+    print('CPUs: %d' % os.cpu_count())
+    print('%10s %10s %16s %16s %16s' % ('nStiff', 'workers', 'sweep (s)', 'speedup',
+                                        'early stop (s)'))
+    for nStiff in maxNrStiff:
+        serial = None
+        for nWorkers in workers:
+            args = (mVess, mStruct, mISO, mDes, LB.mPlaLib, mStress, 0, nStiff,
+                    mats, mats, extrusions, machined, 0, 0, nWorkers)
+            start = time.perf_counter()
+            mOpt.sweep_method(*args)
+            sweepTime = time.perf_counter() - start
+            if serial is None:
+                serial = sweepTime
+
+            start = time.perf_counter()
+            rows = mOpt.iter_sweep(*args)
+            list(itertools.islice(rows, firstRows))
+            rows.close()
+            earlyTime = time.perf_counter() - start
+
+            print('%10d %10d %16.3f %16.2f %16.3f' % (nStiff, nWorkers, sweepTime,
+                                                      serial / sweepTime, earlyTime))
+
+
+if __name__ == '__main__':
+    bench_ingestion()
+    bench_evaluate()
+    bench_task_overhead()
+    bench_parallel_scaling()
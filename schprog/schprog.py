@@ -1,4 +1,4 @@
-#!/usr/bin/env python3.6
+#!/usr/bin/env python3.8
 # -*- coding: utf-8 -*-
 """
 ...
@@ -7,10 +7,19 @@
 
 import logging
 import math
+import weakref
+import concurrent.futures
+import heapq
+from multiprocessing import shared_memory
 import numpy
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 import xlsxwriter
-from collections import Counter
+from collections import Counter, namedtuple, OrderedDict
+try:
+    # Optional, only needed by Optimizer.machined_method
+    from scipy import optimize as scipyOptimize
+except ImportError:
+    scipyOptimize = None
 
 
 #from schprog import __version__
@@ -52,6 +61,15 @@ class Vessel:
                 self.craftMode: Running mode of the vessel,
                                 displacement(2) or planing(1) (int)
 
+            ...__setattr__...
+            Objective:
+                Sets an attribute and counts up self.revision, so that rule
+                contexts built from the vessel know when they are out of date.
+            Input:
+                name, value
+            Output:
+                self.revision: Number of attribute changes (int)
+
             ...assign_structure...
             Objective:
                 Assign Structure object as attribute to self (Vessel object).
@@ -74,6 +92,11 @@ class Vessel:
         pass
         # TODO: add variable check
 
+    def __setattr__(self, name, value):
+        """ Sets an attribute and counts up the revision of the vessel. """
+        self.__dict__['revision'] = self.__dict__.get('revision', 0) + 1
+        self.__dict__[name] = value
+
     def calc_craft_mode(self):
         """ Calculates the craft mode according to ISO rules:
             Return: 1 (planing) or 2 (displacement) (int)
@@ -90,6 +113,512 @@ class Vessel:
         pass
 
 
+class MemberTable:
+    """ Columnar (struct-of-arrays) storage for structural members. Every
+        attribute is one column with one row per member. Numerical columns are
+        numpy arrays, all other columns (strings and objects such as location,
+        section, Material, Plate and Profile) are stored as categorical codes
+        pointing into a list of unique values.
+
+        Attributes:
+            ...__init__...
+            Objective:
+                Inits the table with empty columns.
+            Input:
+                numColumns: Names of the numerical columns (tuple of strings)
+                catColumns: Names of the categorical columns (tuple of strings)
+                capacity: Number of rows to allocate from the start (int)
+            Output:
+                self.num: Numerical columns, float arrays (dict)
+                self.assigned: True where a numerical value has been assigned,
+                    bool arrays (dict)
+                self.codes: Categorical codes, int arrays, -1 = not assigned (dict)
+                self.categories: Unique values of the categorical columns (dict)
+                self.members: Weak references to the member objects that are
+                    views of a row, by id, views of the same row are equal
+                    (dict)
+                self.size: Number of rows in use (int)
+
+            ...reserve...
+            Objective:
+                Makes sure that the columns can hold at least 'capacity' rows.
+                The capacity is at least doubled when it grows so appending
+                rows one by one is amortised constant time.
+            Input:
+                capacity: Number of rows (int)
+            Output:
+                self.capacity
+
+            ...append_row...
+            Objective:
+                Appends one row to the table.
+            Input:
+                values: Column values of the new row (dict)
+            Output:
+                row: Index of the new row (int)
+
+            ...append_rows...
+            Objective:
+                Appends several rows at once, allocating and writing each column
+                only once.
+            Input:
+                rows: Column values of the new rows (iterable of dicts)
+            Output:
+                start: Index of the first new row (int)
+
+            ...clear...
+            Objective:
+                Removes all the rows and categories but keeps the allocation.
+                The member objects that are views of a row get their values
+                back as normal attributes first, so they do not read or write
+                the rows of the members that are added later.
+
+            ...watch...
+            Objective:
+                Lets the owner of the table keep derived data up to date.
+                callback(name, rows, before) is called before and after any of
+                the named columns is written, with rows as an array of row
+                indices, and with rows = None when the table is cleared.
+            Input:
+                names: Column names (tuple of strings)
+                callback: Function (name, rows, before)
+
+            ...get / set...
+            Objective:
+                Reads / writes a single value. Reading a value that has not been
+                assigned yet raises an AttributeError, the same as for a normal
+                object attribute. Any value can be assigned, also NaN. A row
+                that is not in use raises an IndexError.
+            Input:
+                name: Column name (string)
+                row: Row index (int)
+                value: New value (set only)
+
+            ...column...
+            Objective:
+                Returns the numerical column, or the codes of a categorical
+                column, for the rows in use (numpy view, no copy).
+
+            ...values...
+            Objective:
+                Returns the decoded values of a categorical column as a list.
+
+            ...set_column...
+            Objective:
+                Writes a whole column, or the rows given, in one operation. A
+                single value is broadcast to all rows.
+            Input:
+                name: Column name (string)
+                values: Array/list of values or a single value
+                rows: Row indices to write, all rows if None (array of ints)
+
+            ...lookup...
+            Objective:
+                Gathers a numerical attribute from the objects in a categorical
+                column, e.g. the density of the Material of every member.
+            Input:
+                name: Categorical column name (string)
+                attr: Attribute name of the objects in the column (string)
+                rows: Row indices to gather, all rows if None (array of ints)
+            Output:
+                Float array, NaN where there is no object assigned.
+
+            ...recode...
+            Objective:
+                Translates the codes of a categorical column to the positions
+                in a fixed list of categories, e.g. to encode the location as
+                0 = 'bottom', 1 = 'side' for the rules.
+            Input:
+                name: Categorical column name (string)
+                categories: Fixed categories (tuple)
+            Output:
+                Int array, -1 where the value is not in categories.
+
+            ...mask...
+            Objective:
+                Boolean array of the rows where a categorical column equals value.
+    """
+    def __init__(self, numColumns, catColumns, capacity=0):
+        """ Inits the table with empty columns. """
+        self.numColumns = tuple(numColumns)
+        self.catColumns = tuple(catColumns)
+        self.num = {}
+        self.assigned = {}
+        self.codes = {}
+        self.categories = {}
+        self._catIndex = {}
+        for name in self.numColumns:
+            self.num[name] = numpy.empty(0)
+            self.assigned[name] = numpy.empty(0, dtype=bool)
+        for name in self.catColumns:
+            self.codes[name] = numpy.empty(0, dtype=numpy.int32)
+            self.categories[name] = []
+            self._catIndex[name] = {}
+        self.watchers = {}
+        self.members = {}
+        self.size = 0
+        self.capacity = 0
+        self.reserve(capacity)
+        pass
+
+    def __len__(self):
+        return self.size
+
+    def has_column(self, name):
+        """ True if name is a column of the table. """
+        return name in self.num or name in self.codes
+
+    def reserve(self, capacity):
+        """ Makes sure that the columns can hold at least 'capacity' rows. """
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, 2*self.capacity, 16)
+        for name in self.numColumns:
+            column = numpy.full(capacity, numpy.nan)
+            column[:self.size] = self.num[name][:self.size]
+            self.num[name] = column
+            assigned = numpy.zeros(capacity, dtype=bool)
+            assigned[:self.size] = self.assigned[name][:self.size]
+            self.assigned[name] = assigned
+        for name in self.catColumns:
+            column = numpy.full(capacity, -1, dtype=numpy.int32)
+            column[:self.size] = self.codes[name][:self.size]
+            self.codes[name] = column
+        self.capacity = capacity
+        pass
+
+    def append_row(self, values):
+        """ Appends one row to the table and returns its index. """
+        row = self.size
+        self.reserve(row + 1)
+        self.size = row + 1
+        for name in self.numColumns:
+            self.num[name][row] = numpy.nan
+            self.assigned[name][row] = False
+        for name in self.catColumns:
+            self.codes[name][row] = -1
+        for name, value in values.items():
+            self.set(name, row, value)
+        return row
+
+    def append_rows(self, rows):
+        """ Appends several rows in one operation and returns the index of the
+            first new row.
+        """
+        rows = list(rows)
+        start = self.size
+        stop = start + len(rows)
+        self.reserve(stop)
+        self.size = stop
+        for name in self.numColumns:
+            self.num[name][start:stop] = numpy.nan
+            self.assigned[name][start:stop] = False
+        for name in self.catColumns:
+            self.codes[name][start:stop] = -1
+        for name in self.numColumns + self.catColumns:
+            index = [i for i, values in enumerate(rows) if name in values]
+            if index:
+                self.set_column(name, [rows[i][name] for i in index],
+                                numpy.array(index) + start)
+        return start
+
+    def clear(self):
+        """ Removes all the rows and categories but keeps the allocation. """
+        for ref in list(self.members.values()):
+            member = ref()
+            if member is not None:
+                member.unbind()
+        self.members.clear()
+        self.size = 0
+        for name in self.catColumns:
+            self.categories[name] = []
+            self._catIndex[name] = {}
+        for name in self.watchers:
+            self.notify(name, None, False)
+        pass
+
+    def add_member(self, member):
+        """ Registers a member object that is a view of a row. """
+        key = id(member)
+        members = self.members
+        members[key] = weakref.ref(member, lambda ref: members.pop(key, None))
+        pass
+
+    def discard_member(self, member):
+        """ Unregisters a member object that is no longer a view of a row. """
+        self.members.pop(id(member), None)
+        pass
+
+    def encode(self, name, value):
+        """ Returns the code of value in a categorical column, adds the value
+            as a new category if it does not exist.
+        """
+        index = self._catIndex[name]
+        try:
+            return index[value]
+        except KeyError:
+            code = len(self.categories[name])
+            self.categories[name].append(value)
+            index[value] = code
+            return code
+
+    def get(self, name, row):
+        """ Reads a single value. """
+        if not 0 <= row < self.size:
+            raise IndexError('member row out of range')
+        if name in self.num:
+            if not self.assigned[name][row]:
+                raise AttributeError(name)
+            return float(self.num[name][row])
+        code = self.codes[name][row]
+        if code < 0:
+            raise AttributeError(name)
+        return self.categories[name][code]
+
+    def watch(self, names, callback):
+        """ Registers callback(name, rows, before) to be called before and
+            after the columns in names are written, rows is None when the
+            table is cleared.
+        """
+        for name in names:
+            self.watchers.setdefault(name, []).append(callback)
+        pass
+
+    def notify(self, name, rows, before):
+        """ Calls the callbacks that watch column name. """
+        for callback in self.watchers.get(name, ()):
+            callback(name, rows, before)
+        pass
+
+    def set(self, name, row, value):
+        """ Writes a single value. """
+        if not 0 <= row < self.size:
+            raise IndexError('member row out of range')
+        watched = name in self.watchers
+        if watched:
+            self.notify(name, numpy.array([row]), True)
+        if name in self.num:
+            self.num[name][row] = value
+            self.assigned[name][row] = True
+        else:
+            self.codes[name][row] = self.encode(name, value)
+        if watched:
+            self.notify(name, numpy.array([row]), False)
+        pass
+
+    def column(self, name):
+        """ Numerical column or categorical codes for the rows in use. """
+        if name in self.num:
+            return self.num[name][:self.size]
+        return self.codes[name][:self.size]
+
+    def values(self, name):
+        """ Decoded values of a categorical column. """
+        categories = self.categories[name] + [None]
+        return [categories[code] for code in self.codes[name][:self.size]]
+
+    def set_column(self, name, values, rows=None):
+        """ Writes a whole column, or the rows given, in one operation. """
+        watched = name in self.watchers
+        if rows is None:
+            rows = numpy.arange(self.size) if watched else slice(0, self.size)
+        if watched:
+            self.notify(name, rows, True)
+        if name in self.num:
+            self.num[name][rows] = values
+            self.assigned[name][rows] = True
+        elif isinstance(values, (list, tuple, numpy.ndarray)):
+            self.codes[name][rows] = [self.encode(name, value) for value in values]
+        else:
+            self.codes[name][rows] = self.encode(name, values)
+        if watched:
+            self.notify(name, rows, False)
+        pass
+
+    def lookup(self, name, attr, rows=None):
+        """ Gathers a numerical attribute from the objects in a categorical column. """
+        attrs = numpy.array([getattr(obj, attr, numpy.nan)
+                             for obj in self.categories[name]] + [numpy.nan],
+                            dtype=float)
+        if rows is None:
+            return attrs[self.codes[name][:self.size]]
+        return attrs[self.codes[name][rows]]
+
+    def recode(self, name, categories):
+        """ Codes of a categorical column translated to the positions in the
+            given categories, -1 for values that are not in categories.
+        """
+        positions = numpy.array([categories.index(value) if value in categories else -1
+                                 for value in self.categories[name]] + [-1],
+                                dtype=numpy.int32)
+        return positions[self.codes[name][:self.size]]
+
+    def mask(self, name, value):
+        """ Boolean array of the rows where a categorical column equals value. """
+        code = self._catIndex[name].get(value)
+        if code is None:
+            return numpy.zeros(self.size, dtype=bool)
+        return self.codes[name][:self.size] == code
+
+
+class MemberRow:
+    """ Mixin for the Panel and Stiffener classes. An object is a normal Python
+        object until it is assigned to a Structure, after which it becomes a
+        thin view of one row in the structures MemberTable. Attributes that are
+        columns in the table are read from and written to the table, other
+        attributes are kept on the object as usual.
+
+        Attributes:
+            ...bind...
+            Objective:
+                Moves the column attributes of the object into a table row and
+                makes the object a view of that row.
+            Input:
+                table: MemberTable object
+                row: Row index (int)
+
+            ...unbind...
+            Objective:
+                Copies the values of the row back to the object and makes it a
+                normal Python object again. Is called by the table when its
+                rows are removed.
+
+            ...row_values...
+            Objective:
+                Returns the column attributes of the object (dict), without
+                the derivedColumns. Those are recalculated by the Structure
+                the member is assigned to, a weight copied from another
+                structure would make its running totals subtract a weight
+                that was never added.
+    """
+    numColumns = ()
+    catColumns = ()
+    derivedColumns = ('weight',)
+
+    @classmethod
+    def view(cls, table, row):
+        """ Creates a view of a table row without calling __init__. """
+        obj = cls.__new__(cls)
+        obj.__dict__['_table'] = table
+        obj.__dict__['_row'] = row
+        table.add_member(obj)
+        return obj
+
+    def bind(self, table, row):
+        """ Makes the object a view of a table row. """
+        oldTable = self.__dict__.get('_table')
+        if oldTable is not None:
+            oldTable.discard_member(self)
+        columns = self.numColumns + self.catColumns
+        for name in columns:
+            self.__dict__.pop(name, None)
+        self.__dict__['_table'] = table
+        self.__dict__['_row'] = row
+        table.add_member(self)
+        pass
+
+    def unbind(self):
+        """ Copies the values of the row back to the object. """
+        table = self.__dict__.pop('_table', None)
+        row = self.__dict__.pop('_row', None)
+        if table is None:
+            return
+        table.discard_member(self)
+        for name in self.numColumns + self.catColumns:
+            try:
+                self.__dict__[name] = table.get(name, row)
+            except (AttributeError, IndexError):
+                pass
+        pass
+
+    def row_values(self):
+        """ Returns the column attributes of the object, except the derived
+            ones.
+        """
+        if self.__dict__.get('_table') is None:
+            return {name: value for name, value in self.__dict__.items()
+                    if (name in self.numColumns or name in self.catColumns)
+                    and name not in self.derivedColumns}
+        values = {}
+        for name in self.numColumns + self.catColumns:
+            if name in self.derivedColumns:
+                continue
+            try:
+                values[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return values
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        table = self.__dict__.get('_table')
+        if table is not None and table.has_column(name):
+            return table.get(name, self.__dict__['_row'])
+        raise AttributeError("'%s' object has no attribute '%s'"
+                             % (type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        table = self.__dict__.get('_table')
+        if table is not None and table.has_column(name):
+            table.set(name, self.__dict__['_row'], value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        if self.__dict__.get('_table') is None or not isinstance(other, MemberRow):
+            return self is other
+        return (self.__dict__['_table'] is other.__dict__.get('_table') and
+                self.__dict__['_row'] == other.__dict__.get('_row'))
+
+    def __hash__(self):
+        if self.__dict__.get('_table') is None:
+            return id(self)
+        return hash((id(self.__dict__['_table']), self.__dict__['_row']))
+
+
+class MemberList:
+    """ List-like access to the rows of a MemberTable, returning Panel or
+        Stiffener views, e.g. objStruct.Panel[i]. The table is the storage, so
+        views are created when they are accessed.
+    """
+    def __init__(self, table, rowClass):
+        self.table = table
+        self.rowClass = rowClass
+
+    def __len__(self):
+        return self.table.size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.rowClass.view(self.table, row)
+                    for row in range(*i.indices(self.table.size))]
+        if i < 0:
+            i = i + self.table.size
+        if not 0 <= i < self.table.size:
+            raise IndexError('member index out of range')
+        return self.rowClass.view(self.table, i)
+
+    def __iter__(self):
+        for row in range(0, self.table.size):
+            yield self.rowClass.view(self.table, row)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __repr__(self):
+        return '<%d %s members>' % (self.table.size, self.rowClass.__name__)
+
+
 class Structure:
     """ Superclass, contains the structural model on the highest level,
         such as the panel and stiffener objects and global variables from Rules.
@@ -103,11 +632,39 @@ class Structure:
                 Inits the Structure object.
             Input:
                 objVess: Vessel object from Vessel class.
+                debug: Check the running weight totals against a full
+                       recalculation every time they are read (bool)
             Output:
                 self.mLDC: Loaded displacements mass of the vessel (float, kg)
                 self.Strake: Prepare empty list for Strake objects from Strake class.
-                self.Panel: Prepare empty list for Panel objects from Panel class.
-                self.Stiffener: Prepare empty list for Stiffener objects from Stiffener class.
+                self.panTable: Columnar storage of all the panels (MemberTable)
+                self.stiffTable: Columnar storage of all the stiffeners (MemberTable)
+                self.Panel: List-like access to the panels, each item is a
+                            Panel object viewing one row of self.panTable.
+                self.Stiffener: List-like access to the stiffeners, each item is
+                                a Stiffener object viewing one row of
+                                self.stiffTable.
+                self.sectionIndex: Index from section name to its members,
+                                   kept up to date by the member tables.
+                                   {secName: {'panels': panel rows,
+                                              'stiffeners': stiffener rows,
+                                              'tp': governing plate thickness}}
+                self.panTotals / self.stiffTotals: Running totals of the weight
+                                and its first moments [W, W*x, W*y, W*z] of
+                                all panels / stiffeners, updated as deltas
+                                when plates, profiles, materials or the
+                                geometry of a member change. (float array)
+
+            ...reserve...
+            Objective:
+                Pre-sizes the member tables when the number of members is known
+                beforehand, so that they do not have to grow while assigning.
+            Input:
+                nPanels: Expected number of panels (int)
+                nStiffeners: Expected number of stiffeners (int)
+            Output:
+                self.panTable.capacity
+                self.stiffTable.capacity
 
             ...assign_strake...
             Objective:
@@ -125,6 +682,15 @@ class Structure:
             Output:
                 self.objPan[i]
 
+            ...assign_panels...
+            Objective:
+                Assign several Panel objects at once, the member table is
+                written column by column instead of once per panel.
+            Input:
+                members: Panel objects (iterable)
+            Output:
+                self.objPan[i:i+n]
+
             ...assign_stiffener...
             Objective:
                 Assign Stiffener object as attribute to self (Structure object).
@@ -133,6 +699,44 @@ class Structure:
             Output:
                 self.objStiff[i]
 
+            ...assign_stiffeners...
+            Objective:
+                Assign several Stiffener objects at once.
+            Input:
+                members: Stiffener objects (iterable)
+            Output:
+                self.objStiff[i:i+n]
+
+            ...assign_member_press_factors...
+            Objective:
+                Assigns the pressure factors of all members of a table at once,
+                the array counterpart of Panel/Stiffener.assign_press_factors.
+            Input:
+                objTable: self.panTable or self.stiffTable
+                [ruleType, kL, kAR_d, kAR_p, AD, kZ] (arrays)
+            Output:
+                objStruct.Panel[i] / objStruct.Stiffener[i].'pressure factors'
+
+            ...assign_member_design_pressure...
+            Objective:
+                Assigns the design pressure of all members of a table at once.
+            Input:
+                objTable: self.panTable or self.stiffTable
+                [ruleType, pMax] (pMax array)
+            Output:
+                objStruct.Panel[i] / objStruct.Stiffener[i].pMax
+
+            ...assign_member_scantling_req...
+            Objective:
+                Assigns the scantling requirements of all members of a table
+                at once.
+            Input:
+                objTable: self.panTable or self.stiffTable
+                [ruleType, k2, k3, FShear, MBend, tReq, tMin] for panels or
+                [ruleType, AwMin, SMMin] for stiffeners (arrays)
+            Output:
+                objStruct.Panel[i] / objStruct.Stiffener[i].'scantling requirements'
+
             ...assign_global_var...
             Objective:
                 Assign global variables from Rules as attributes to self (Structure object).
@@ -143,43 +747,287 @@ class Structure:
             Output:
                 self.Input
 
+            ...get_section_index...
+            Objective:
+                Returns the entry of self.sectionIndex for a section.
+            Input:
+                secName: Section name (string)
+            Output:
+                {'panels', 'stiffeners', 'tp'} (dict)
+
+            ...section_plate_thickness...
+            Objective:
+                Returns the governing plate thickness of a section, i.e. the
+                thinnest plate assigned to its panels. The value is kept up to
+                date when plates are assigned, so the lookup is constant time.
+            Input:
+                secName: Section name (string)
+            Output:
+                tp: Plate thickness (float, mm)
+
+            ...stiffener_plate_thickness...
+            Objective:
+                Returns the governing plate thickness of the section of every
+                stiffener, one section_plate_thickness lookup per section.
+            Input:
+                -
+            Output:
+                tp: Plate thickness (array of length N, mm)
+
             ...calc_total_weight...
             Objective:
-                Calculates the total weight of the entire structure
+                Calculates the total weight of the entire structure from the
+                running totals. Members without Plate/Profile or Material do
+                not contribute.
             Input:
                 -
             Output:
                 self.weight: Total weight of all the structural components (float, kg)
+                self.panWeight: Total weight of all panels (float, kg)
+                self.stiffWeight: Total weight of all stiffeners (float, kg)
 
             ...calc_CoG...
             Objective:
                 Calculates the centre of gravity (CoG) of the entire structure
+                from the running totals.
             Input:
                 -
             Output:
                 self.CoG: Centre of gravity of the entire structure (float, m)
+
+            ...calc_panel_weights / calc_stiffener_weights...
+            Objective:
+                Calculates the weight of all panels / stiffeners, or the rows
+                given, in one array operation and assigns them to the members.
+            Input:
+                rows: Row indices, all members if None (array of ints)
+            Output:
+                Weights (float array, kg), NaN for members that are missing
+                a Plate/Profile or Material.
+
+            ...calc_totals...
+            Objective:
+                Recalculates the weight totals of all members from scratch.
+            Input:
+                -
+            Output:
+                panTotals, stiffTotals: [W, W*x, W*y, W*z] (float arrays)
+
+            ...check_totals...
+            Objective:
+                Compares the running totals with calc_totals and raises an
+                AssertionError if they differ. Called from calc_total_weight
+                when self.debug is True.
     """
-    def __init__(self, objVess):
+    def __init__(self, objVess, debug=False):
         """ Inits the Structure object. """
         self.mLDC = objVess.mLDC
         self.Strake = []
-        self.Panel = []
-        self.Stiffener = []
+        self.debug = debug
+        self.panTable = MemberTable(Panel.numColumns, Panel.catColumns)
+        self.stiffTable = MemberTable(Stiffener.numColumns, Stiffener.catColumns)
+        self.sectionIndex = {}
+        self.panTable.watch(('section', 'Plate'), self._update_panel_index)
+        self.stiffTable.watch(('section',), self._update_stiffener_index)
+        self.panTotals = numpy.zeros(4)
+        self.stiffTotals = numpy.zeros(4)
+        self.panTable.watch(('area', 'xPos', 'yPos', 'zPos', 'Plate', 'Material'),
+                            self._update_panel_totals)
+        self.stiffTable.watch(('lStiff', 'xPos', 'yPos', 'zPos', 'Profile', 'Material'),
+                              self._update_stiffener_totals)
         pass
-    
+
+    @property
+    def Panel(self):
+        """ List-like access to the panels, objStruct.Panel[i] is a Panel view. """
+        return MemberList(self.panTable, Panel)
+
+    @Panel.setter
+    def Panel(self, members):
+        """ Replaces all panels, e.g. objStruct.Panel = [] removes them. """
+        members = [(objPan, objPan.row_values()) for objPan in members]
+        self.panTable.clear()
+        for objPan, values in members:
+            objPan.bind(self.panTable, self.panTable.append_row(values))
+        pass
+
+    @property
+    def Stiffener(self):
+        """ List-like access to the stiffeners, objStruct.Stiffener[i] is a
+            Stiffener view.
+        """
+        return MemberList(self.stiffTable, Stiffener)
+
+    @Stiffener.setter
+    def Stiffener(self, members):
+        """ Replaces all stiffeners, e.g. objStruct.Stiffener = [] removes them. """
+        members = [(objStiff, objStiff.row_values()) for objStiff in members]
+        self.stiffTable.clear()
+        for objStiff, values in members:
+            objStiff.bind(self.stiffTable, self.stiffTable.append_row(values))
+        pass
+
+    def reserve(self, nPanels=0, nStiffeners=0):
+        """ Pre-sizes the member tables for the expected number of members. """
+        self.panTable.reserve(nPanels)
+        self.stiffTable.reserve(nStiffeners)
+        pass
+
     def assign_strake(self, objStrak):
         """ Assign Strake object as attribute to self (Structure object). """
-        self.Strake = self.Strake + [objStrak]
+        self.Strake.append(objStrak)
         pass
 
     def assign_panel(self, objPan):
         """ Assign Panel object as attribute to self (Structure object). """
-        self.Panel = self.Panel + [objPan]
+        row = self.panTable.append_row(objPan.row_values())
+        objPan.bind(self.panTable, row)
+        pass
+
+    def assign_panels(self, members):
+        """ Assign several Panel objects to self (Structure object) at once. """
+        members = list(members)
+        start = self.panTable.append_rows([objPan.row_values() for objPan in members])
+        for i, objPan in enumerate(members):
+            objPan.bind(self.panTable, start + i)
         pass
 
     def assign_stiffener(self, objStiff):
         """ Assign Stiffener object as attribute to self (Structure object). """
-        self.Stiffener = self.Stiffener + [objStiff]
+        row = self.stiffTable.append_row(objStiff.row_values())
+        objStiff.bind(self.stiffTable, row)
+        pass
+
+    def assign_stiffeners(self, members):
+        """ Assign several Stiffener objects to self (Structure object) at once. """
+        members = list(members)
+        start = self.stiffTable.append_rows([objStiff.row_values()
+                                             for objStiff in members])
+        for i, objStiff in enumerate(members):
+            objStiff.bind(self.stiffTable, start + i)
+        pass
+
+    def get_section_index(self, secName):
+        """ Returns the section index entry for secName, creates it if needed. """
+        entry = self.sectionIndex.get(secName)
+        if entry is None:
+            entry = {'panels': [], 'stiffeners': [], 'tp': None, 'tpValid': True}
+            self.sectionIndex[secName] = entry
+        return entry
+
+    def _update_panel_index(self, name, rows, before):
+        """ Keeps self.sectionIndex up to date when the section or Plate of
+            panels change, is called by self.panTable.
+        """
+        if rows is None:
+            for entry in self.sectionIndex.values():
+                entry['panels'] = []
+                entry['tp'] = None
+                entry['tpValid'] = True
+            return
+        table = self.panTable
+        sections = table.categories['section']
+        plates = table.categories['Plate']
+        for row in rows:
+            code = table.codes['section'][row]
+            if code < 0:
+                continue
+            entry = self.get_section_index(sections[code])
+            plate = table.codes['Plate'][row]
+            tp = plates[plate].tp if plate >= 0 else None
+            if before:
+                if name == 'section':
+                    entry['panels'].remove(row)
+                if tp is not None and tp == entry['tp']:
+                    entry['tpValid'] = False
+            else:
+                if name == 'section':
+                    entry['panels'].append(int(row))
+                if tp is not None and entry['tpValid']:
+                    if entry['tp'] is None or tp < entry['tp']:
+                        entry['tp'] = tp
+        pass
+
+    def _update_stiffener_index(self, name, rows, before):
+        """ Keeps self.sectionIndex up to date when the section of stiffeners
+            change, is called by self.stiffTable.
+        """
+        if rows is None:
+            for entry in self.sectionIndex.values():
+                entry['stiffeners'] = []
+            return
+        table = self.stiffTable
+        sections = table.categories['section']
+        for row in rows:
+            code = table.codes['section'][row]
+            if code < 0:
+                continue
+            entry = self.get_section_index(sections[code])
+            if before:
+                entry['stiffeners'].remove(row)
+            else:
+                entry['stiffeners'].append(int(row))
+        pass
+
+    def section_plate_thickness(self, secName):
+        """ Returns the governing plate thickness of a section. """
+        entry = self.sectionIndex.get(secName)
+        if entry is None or not entry['panels']:
+            raise AttributeError("section '%s' has no panels" % (secName,))
+        if not entry['tpValid']:
+            tp = self.panTable.lookup('Plate', 'tp', entry['panels'])
+            tp = tp[~numpy.isnan(tp)]
+            entry['tp'] = tp.min() if tp.size else None
+            entry['tpValid'] = True
+        if entry['tp'] is None:
+            raise AttributeError("no plate is assigned to the panels of section '%s'"
+                                 % (secName,))
+        return entry['tp']
+
+    def stiffener_plate_thickness(self):
+        """ Returns the governing plate thickness of every stiffener. """
+        stiff = self.stiffTable
+        codes = stiff.column('section')
+        tpSec = numpy.full(len(stiff.categories['section']) + 1, numpy.nan)
+        for code in numpy.unique(codes):
+            if code >= 0:
+                tpSec[code] = self.section_plate_thickness(stiff.categories['section'][code])
+        return tpSec[codes]
+
+    def assign_member_press_factors(self, objTable, inputVec):
+        """ Assigns arrays of pressure factors to all members of a table. """
+        objTable.set_column('ruleType', inputVec[0])
+        if inputVec[0] == 'ISO':
+            # Assign ISO Values
+            objTable.set_column('kL', inputVec[1])
+            objTable.set_column('kAR_d', inputVec[2])
+            objTable.set_column('kAR_p', inputVec[3])
+            objTable.set_column('AD', inputVec[4])
+            objTable.set_column('kZ', inputVec[5])
+        pass
+
+    def assign_member_design_pressure(self, objTable, inputVec):
+        """ Assigns an array of design pressures to all members of a table. """
+        objTable.set_column('ruleType', inputVec[0])
+        if inputVec[0] == 'ISO':
+            # Assign ISO Values
+            objTable.set_column('pMax', inputVec[1])
+        pass
+
+    def assign_member_scantling_req(self, objTable, inputVec):
+        """ Assigns arrays of scantling requirements to all members of a table. """
+        objTable.set_column('ruleType', inputVec[0])
+        if inputVec[0] == 'ISO' and objTable is self.panTable:
+            # Assign ISO Values
+            objTable.set_column('k2', inputVec[1])
+            objTable.set_column('k3', inputVec[2])
+            objTable.set_column('FShear', inputVec[3])
+            objTable.set_column('MBend', inputVec[4])
+            objTable.set_column('tReq', inputVec[5])
+            objTable.set_column('tMin', inputVec[6])
+        elif inputVec[0] == 'ISO' and objTable is self.stiffTable:
+            objTable.set_column('AwMin', inputVec[1])
+            objTable.set_column('SMMin', inputVec[2])
         pass
 
     def assign_global_var(self, inputVec):
@@ -192,65 +1040,128 @@ class Structure:
 
     def calc_total_weight(self):
         """ Calculates the total weight of the entire structure """
-        panWeight = []
-        stiffWeight = []
-        for i in range(0, self.Panel.__len__()):
-            self.Panel[i].calc_weight()
-            panWeight = panWeight + [self.Panel[i].weight]
-        panWeight = sum(panWeight)
-        try:
-            for i in range(0, self.Stiffener.__len__()):
-                self.Stiffener[i].calc_weight()
-                stiffWeight = stiffWeight + [self.Stiffener[i].weight]
-            stiffWeight = sum(stiffWeight)
-        except:
-            stiffWeight = 0
-
-        self.weight = panWeight + stiffWeight
+        if self.debug:
+            self.check_totals()
+        self.panWeight = self.panTotals[0]
+        self.stiffWeight = self.stiffTotals[0]
+        self.weight = self.panWeight + self.stiffWeight
         pass
 
     def calc_CoG(self):
         """ Calculates the centre of gravity (CoG) of the entire structure """
-        panCoG = []
-        stiffCoG = []
-        for i in range(0, self.Panel.__len__()):
-            self.Panel[i].calc_weight()
-            panCoG = (panCoG + 
-                      [[self.Panel[i].weight * self.Panel[i].xPos] +
-                      [self.Panel[i].weight * self.Panel[i].yPos] +
-                      [self.Panel[i].weight * self.Panel[i].zPos]
-                      ]
-                      )
-        panCoG = numpy.array(panCoG) # convert to array in order to use numpy methods
-        panCoG = panCoG.sum(axis=0) # sums all columns
+        self.calc_total_weight()
+        self.CoG = (self.panTotals[1:] + self.stiffTotals[1:]) / self.weight
+        pass
 
-        try:
-            for i in range(0, self.Stiffener.__len__()):
-                self.Stiffener[i].calc_weight()
-                stiffCoG = (stiffCoG +
-                            [
-                             [self.Stiffener[i].weight * self.Stiffener[i].xPos] +
-                             [self.Stiffener[i].weight * self.Stiffener[i].yPos] +
-                             [self.Stiffener[i].weight * self.Stiffener[i].zPos]
-                             ]
-                            )
-            stiffCoG = numpy.array(stiffCoG) # convert to array in order to use numpy methods
-            stiffCoG = stiffCoG.sum(axis=0) # sums all columns
+    def calc_panel_weights(self, rows=None):
+        """ Calculates the weight of the panels as an array and assigns it to
+            the panels. NaN for panels without Plate or Material.
+        """
+        pan = self.panTable
+        if rows is None:
+            rows = numpy.arange(pan.size)
+        weight = (pan.num['area'][rows] * pan.lookup('Plate', 'tp', rows)*1e-3
+                  * pan.lookup('Material', 'density', rows)
+                  )
+        pan.num['weight'][rows] = weight
+        pan.assigned['weight'][rows] = ~numpy.isnan(weight)
+        return weight
+
+    def calc_stiffener_weights(self, rows=None):
+        """ Calculates the weight of the stiffeners as an array and assigns it
+            to the stiffeners. NaN for stiffeners without Profile or Material.
+        """
+        stiff = self.stiffTable
+        if rows is None:
+            rows = numpy.arange(stiff.size)
+        weight = (stiff.lookup('Profile', 'Atot', rows)*1e-6
+                  * stiff.num['lStiff'][rows]*1e-3
+                  * stiff.lookup('Material', 'density', rows)
+                  )
+        stiff.num['weight'][rows] = weight
+        stiff.assigned['weight'][rows] = ~numpy.isnan(weight)
+        return weight
 
-        except:
-            stiffCoG = 0
+    def _update_panel_totals(self, name, rows, before):
+        """ Updates self.panTotals when a weight related panel attribute
+            changes, is called by self.panTable.
+        """
+        if rows is None:
+            self.panTotals[:] = 0
+            return
+        if before:
+            weight = self.panTable.num['weight'][rows]
+        else:
+            weight = self.calc_panel_weights(rows)
+        self._add_moments(self.panTotals, self.panTable, rows, weight, before)
+        pass
+
+    def _update_stiffener_totals(self, name, rows, before):
+        """ Updates self.stiffTotals when a weight related stiffener attribute
+            changes, is called by self.stiffTable.
+        """
+        if rows is None:
+            self.stiffTotals[:] = 0
+            return
+        if before:
+            weight = self.stiffTable.num['weight'][rows]
+        else:
+            weight = self.calc_stiffener_weights(rows)
+        self._add_moments(self.stiffTotals, self.stiffTable, rows, weight, before)
+        pass
+
+    def _add_moments(self, totals, table, rows, weight, subtract):
+        """ Adds (or subtracts) the weight and first moments of rows to totals,
+            members with an incomplete weight or position (NaN) do not
+            contribute.
+        """
+        moments = numpy.array([numpy.nansum(weight),
+                               numpy.nansum(weight * table.num['xPos'][rows]),
+                               numpy.nansum(weight * table.num['yPos'][rows]),
+                               numpy.nansum(weight * table.num['zPos'][rows])])
+        if subtract:
+            totals -= moments
+        else:
+            totals += moments
+        pass
 
-        self.CoG = (panCoG + stiffCoG) / self.weight
+    def calc_totals(self):
+        """ Recalculates the weight and first moments of all members from
+            scratch.
+        """
+        panTotals = numpy.zeros(4)
+        stiffTotals = numpy.zeros(4)
+        rows = numpy.arange(self.panTable.size)
+        self._add_moments(panTotals, self.panTable, rows,
+                          self.calc_panel_weights(), False)
+        rows = numpy.arange(self.stiffTable.size)
+        self._add_moments(stiffTotals, self.stiffTable, rows,
+                          self.calc_stiffener_weights(), False)
+        return panTotals, stiffTotals
+
+    def check_totals(self):
+        """ Checks the running totals against a full recalculation. """
+        panTotals, stiffTotals = self.calc_totals()
+        if not (numpy.allclose(panTotals, self.panTotals, rtol=1e-9, atol=1e-9) and
+                numpy.allclose(stiffTotals, self.stiffTotals, rtol=1e-9, atol=1e-9)):
+            raise AssertionError('weight totals %s, %s do not match the '
+                                 'recalculated %s, %s'
+                                 % (self.panTotals, self.stiffTotals,
+                                    panTotals, stiffTotals))
         pass
 
 
-class Stiffener(Structure):
+class Stiffener(MemberRow, Structure):
     """ Defines stiffener data such as dimensions, location, material and
         profile, for e.g. longitudinals, frames and girders. Send the data to
         Rules calculator.
 
         Gets given a nomenclature as an identifier.
 
+        Once assigned to a Structure the stiffener is a view of one row in
+        objStruct.stiffTable, the attributes listed in numColumns and catColumns
+        are stored in the table.
+
         Attributes:
             ...__init__...
             Objective:
@@ -344,6 +1255,12 @@ class Stiffener(Structure):
                 self.weight: Weight fo the stiffener. (float, kg)
 
     """
+    numColumns = ('lStiff', 'xPos', 'yPos', 'zPos', 'sStiff',
+                  'kL', 'kAR_d', 'kAR_p', 'AD', 'kZ', 'pMax',
+                  'AwMin', 'SMMin', 'weight')
+    catColumns = ('location', 'stiffType', 'section', 'ruleType', 'stiffName',
+                  'Material', 'Profile')
+
     def __init__(self, lStiff, xPos, yPos, zPos, sStiff, location, stiffType, section=None):
         """ Inits the stiffener objects. """
         self.lStiff = lStiff
@@ -495,7 +1412,7 @@ class Strake(Structure):
     
     def assign_section(self, objSect):
         """ Assigns Section objects to Strake objects """
-        self.sections = self.sections + [objSect]
+        self.sections.append(objSect)
         pass
     
     # Input:
@@ -545,13 +1462,17 @@ class Section(Strake):
         self.location =  location
         pass
 
-class Panel(Strake):
+class Panel(MemberRow, Strake):
     """ Defines the panel data according to the choosen rules, such as dimensions,
         location, material and plating. Sends information to the Rules
         calculator.
 
         User assigns a nomenclature as an identifier.
 
+        Once assigned to a Structure the panel is a view of one row in
+        objStruct.panTable, the attributes listed in numColumns and catColumns
+        are stored in the table.
+
         Attributes:
             ...__init__...
             Objective:
@@ -644,6 +1565,12 @@ class Panel(Strake):
                 self.weight: Weight of the panel (float, kg)
 
     """
+    numColumns = ('b', 'lPan', 'xPos', 'yPos', 'zPos', 'area',
+                  'kL', 'kAR_d', 'kAR_p', 'AD', 'kZ', 'pMax',
+                  'k2', 'k3', 'FShear', 'MBend', 'tReq', 'tMin', 'weight')
+    catColumns = ('location', 'section', 'ruleType', 'panName',
+                  'Material', 'Plate')
+
     def __init__(self, b, lPan, xPos, yPos, zPos, location, section=None):
         """ Inits the panel objects. """
         self.b = b
@@ -790,35 +1717,126 @@ class PlatingLibrary:
             Output:
                 self.Plates
 
+            ...remove_plate...
+            Objective:
+                Removes a plate object from self.Plates.
+            Input:
+                objPlate: Plates object in the library
+            Output:
+                self.Plates
+
+            ...set_plate...
+            Objective:
+                Replaces the plate object at a position of self.Plates.
+            Input:
+                listID: Position in self.Plates (int)
+                objPlate: Plates object
+            Output:
+                self.Plates
+
+            ...clear_index...
+            Objective:
+                Drops the cached thickness index, for when self.Plates or
+                its plates were changed directly instead of with the
+                assign, remove and set methods.
+            Input:
+                -
+            Output:
+                -
+
             ...list_all_thicknesses...
             Objective:
                 List all of the available plate thicknesses with only numbers.
-                Is used for recommended plating assignement.
             Input:
                 -
             Output:
                 self.allTP: List of all available pate thicknesses (int, mm)
+
+            ...thickness_index...
+            Objective:
+                Cached index of the plates for recommended plating
+                assignement. Built on first use and rebuilt after
+                assign_plate, remove_plate, set_plate or clear_index.
+            Input:
+                -
+            Output:
+                [thicknesses, plateIndex]:
+                    thicknesses: Sorted unique thicknesses (float array, mm)
+                    plateIndex: Position in self.Plates of the first plate
+                                of each thickness (int array)
+
+            ...recommended_plates...
+            Objective:
+                Finds the closest available thickness rounded up for all
+                required thicknesses with one numpy.searchsorted. If there is
+                no plate thick enough the last plate of the library is used
+                and the panel is flagged in the outOfRange mask. A NaN
+                requirement gets the thinnest plate.
+            Input:
+                minTP: Required thicknesses (float array, mm)
+            Output:
+                [plates, outOfRange]:
+                    plates: Position in self.Plates of each plate (int array)
+                    outOfRange: True where no plate is thick enough (bool array)
     """
     def __init__(self):
         """ Inits the PlatingLibrary object. """
         self.Plates = []
+        self.thicknessCache = None
         pass
 
     def assign_plate(self, objPlate):
         """ Assigns plating objects as attributes to self (PlatingLibrary object)
             from the Plates class.
         """
-        self.Plates = self.Plates + [objPlate]
+        self.Plates.append(objPlate)
+        self.thicknessCache = None
+        pass
+
+    def remove_plate(self, objPlate):
+        """ Removes a plate object from the library. """
+        self.Plates.remove(objPlate)
+        self.thicknessCache = None
+        pass
+
+    def set_plate(self, listID, objPlate):
+        """ Replaces the plate object at listID. """
+        self.Plates[listID] = objPlate
+        self.thicknessCache = None
+        pass
+
+    def clear_index(self):
+        """ Drops the cached thickness index. """
+        self.thicknessCache = None
         pass
 
     def list_all_thicknesses(self):
         """ List all of the available plate thicknesses with only numbers. """
-        allTP = []
-        del allTP[:]
-        for i in range(0, self.Plates.__len__()):
-            allTP = allTP + [self.Plates[i].tp]
+        allTP = [objPlate.tp for objPlate in self.Plates]
         return allTP
 
+    def thickness_index(self):
+        """ Returns the sorted thicknesses and the plate of each thickness,
+            rebuilt when the plates have changed.
+        """
+        if self.thicknessCache is None:
+            allTP = numpy.array(self.list_all_thicknesses(), dtype=float)
+            self.thicknessCache = list(numpy.unique(allTP, return_index=True))
+        return self.thicknessCache
+
+    def recommended_plates(self, minTP):
+        """ Plates with the closest available thickness rounded up, and the
+            mask of the requirements that no plate meets.
+        """
+        [thicknesses, plateIndex] = self.thickness_index()
+        minTP = numpy.asarray(minTP, dtype=float)
+        pos = numpy.searchsorted(thicknesses, minTP, side='left')
+        pos = numpy.where(numpy.isnan(minTP), 0, pos)
+        outOfRange = pos == len(thicknesses)
+        plates = numpy.where(outOfRange, len(self.Plates) - 1,
+                             plateIndex[numpy.minimum(pos, len(thicknesses) - 1)])
+        return [plates, outOfRange]
+
 
 class Plates(PlatingLibrary):
     """ Defines plating objects with labels and thicknesses.
@@ -883,6 +1901,34 @@ class ProfileLibrary:
                 objProf: Machined object from the Machined class.
             Output:
                 self.Machined
+
+            ...remove_extrusion... / ...remove_machined...
+            Objective:
+                Removes a profile from self.Extrusions or self.Machined.
+            Input:
+                objProf: Extrusions or Machined object in the library
+            Output:
+                self.Extrusions / self.Machined
+
+            ...set_extrusion... / ...set_machined...
+            Objective:
+                Replaces the profile at a position of self.Extrusions or
+                self.Machined.
+            Input:
+                listID: Position in the list (int)
+                objProf: Extrusions or Machined object
+            Output:
+                self.Extrusions / self.Machined
+
+            ...clear_index...
+            Objective:
+                Drops the cached profile index of a list, for when the list
+                or its profiles were changed directly instead of with the
+                assign, remove and set methods.
+            Input:
+                kind: 'Extrusions', 'Machined' or None for both
+            Output:
+                -
                 
             ...list_all_machined...
             Objective:
@@ -894,38 +1940,226 @@ class ProfileLibrary:
             Output:
                 allMachined: list of all available Machined objects
 
-    """
+            ...profile_index...
+            Objective:
+                Sorted index of a list of profiles on SM, with the Aw and
+                Atot (mass per metre for a given material) in the same order.
+                It is built on first use and rebuilt after the list was
+                changed with the assign, remove or set methods, or after
+                clear_index.
+            Input:
+                kind: 'Extrusions' or 'Machined' (string)
+            Output:
+                index: dict with 'profiles' (the indexed list), 'order'
+                       (positions in the list sorted on SM) and the sorted
+                       'SM', 'Aw' and 'Atot' arrays
+
+            ...query_profiles...
+            Objective:
+                All profiles with SM >= SMMin and Aw >= AwMin ordered by
+                mass per metre. The SM bound is found with searchsorted in
+                O(log n), the Aw bound is a vectorised filter of the
+                profiles above it, after which the k results are sorted.
+            Input:
+                SMMin: Required section modulus (float, cm3)
+                AwMin: Required web area (float, cm2)
+                kind: 'Extrusions' or 'Machined' (string)
+            Output:
+                List of profile objects, lightest first
+
+            ...profile_frontier...
+            Objective:
+                prune_dominated of the Extrusions or Machined list, cached
+                with the profile index, so it is computed again only after
+                the list has changed.
+            Input:
+                kind: 'Extrusions' or 'Machined' (string)
+            Output:
+                [kept, removed], see prune_dominated
+
+            ...prune_dominated...
+            Objective:
+                Removes the dominated profiles of a list of profiles. A
+                profile is dominated by another profile of the same pType
+                with at least the same SM and Aw, no more Atot (mass per
+                metre) and proportions that pass section 11.7.2 whenever the
+                dominated profile passes: hw/tw <= 12 or no larger for flat
+                bars, hw/tw <= 40 and d/tf <= 12 or no larger for T- and
+                L-shaped profiles. A sweep minimising weight therefore finds
+                a design of the same weight with only the kept profiles.
+                Profiles of other types are always kept. The profiles of a
+                type are visited from light to heavy, which puts any
+                dominating profile first, and each profile is checked at
+                once against the profiles kept so far: O(n log n + n m) for
+                m kept profiles.
+            Input:
+                profiles: List of Extrusions or Machined objects
+            Output:
+                [kept, removed]:
+                    kept: The non-dominated profiles in list order
+                    removed: [profile, dominating profile] pairs, with the
+                             lightest dominating profile that is kept
+
+    """
 
     def __init__(self):
         """ Inits the ProfileLibrary object. """
         self.Extrusions = []
         self.Machined = []
+        self.indices = {}
         pass
 
     def assign_extrusion(self, objProf):
         """ Assigns Extrusions objects as attributes to self
             (ProfileLibrary object)
         """
-        self.Extrusions = self.Extrusions + [objProf]
+        self.Extrusions.append(objProf)
+        self.indices.pop('Extrusions', None)
         pass
 
     def assign_machined(self, objProf):
         """ Assigns Machined objects as attributes to self
             (ProfileLibrary object)
         """
-        self.Machined = self.Machined + [objProf]
+        self.Machined.append(objProf)
+        self.indices.pop('Machined', None)
+        pass
+
+    def remove_extrusion(self, objProf):
+        """ Removes an Extrusions object from the library. """
+        self.Extrusions.remove(objProf)
+        self.indices.pop('Extrusions', None)
+        pass
+
+    def remove_machined(self, objProf):
+        """ Removes a Machined object from the library. """
+        self.Machined.remove(objProf)
+        self.indices.pop('Machined', None)
+        pass
+
+    def set_extrusion(self, listID, objProf):
+        """ Replaces the Extrusions object at listID. """
+        self.Extrusions[listID] = objProf
+        self.indices.pop('Extrusions', None)
+        pass
+
+    def set_machined(self, listID, objProf):
+        """ Replaces the Machined object at listID. """
+        self.Machined[listID] = objProf
+        self.indices.pop('Machined', None)
+        pass
+
+    def clear_index(self, kind=None):
+        """ Drops the cached index of the profiles of kind, or of both. """
+        if kind is None:
+            self.indices.clear()
+        else:
+            self.indices.pop(kind, None)
         pass
 
     def list_all_machined(self):
         """ Returns a list of all machined profile objects. Used for the 
         sweep_method if the user wants to loop through all created machined
         profiles """
-        allMachined = []
-        del allMachined[:]
-        for i in range(0, self.Machined.__len__()):
-            allMachined = allMachined + [self.Machined[i]]
+        allMachined = list(self.Machined)
         return allMachined
 
+    def profile_index(self, kind='Extrusions'):
+        """ Returns the index of the profiles sorted on SM, rebuilt when
+            the list has changed.
+        """
+        profiles = getattr(self, kind)
+        index = self.indices.get(kind)
+        if index is None:
+            SM = numpy.array([objProf.SM for objProf in profiles], dtype=float)
+            order = numpy.argsort(SM, kind='stable')
+            index = {'profiles': list(profiles),
+                     'order': order,
+                     'SM': SM[order],
+                     'Aw': numpy.array([objProf.Aw for objProf in profiles],
+                                       dtype=float)[order],
+                     'Atot': numpy.array([objProf.Atot for objProf in profiles],
+                                         dtype=float)[order]}
+            self.indices[kind] = index
+        return index
+
+    def query_profiles(self, SMMin=0.0, AwMin=0.0, kind='Extrusions'):
+        """ Returns the profiles with SM >= SMMin and Aw >= AwMin, ordered by
+            mass per metre.
+        """
+        index = self.profile_index(kind)
+        start = numpy.searchsorted(index['SM'], SMMin, side='left')
+        found = start + numpy.flatnonzero(index['Aw'][start:] >= AwMin)
+        # Lightest first, equal masses in library order
+        found = found[numpy.lexsort((index['order'][found], index['Atot'][found]))]
+        return [index['profiles'][i] for i in index['order'][found]]
+
+    def profile_frontier(self, kind='Extrusions'):
+        """ Returns the non-dominated profiles of a list and the removed ones,
+            cached with the profile index.
+        """
+        index = self.profile_index(kind)
+        if 'frontier' not in index:
+            index['frontier'] = self.prune_dominated(index['profiles'])
+        return index['frontier']
+
+    @staticmethod
+    def prune_dominated(profiles):
+        """ Removes the profiles that another profile of the same type
+            dominates: at least the same SM and Aw, no more Atot and
+            proportions that pass whenever the removed ones do. The profiles
+            are visited from light to heavy and only checked against the
+            profiles kept so far.
+        """
+        SM = numpy.array([objProf.SM for objProf in profiles], dtype=float)
+        Aw = numpy.array([objProf.Aw for objProf in profiles], dtype=float)
+        Atot = numpy.array([objProf.Atot for objProf in profiles], dtype=float)
+        hw = numpy.array([objProf.hw for objProf in profiles], dtype=float)
+        tw = numpy.array([objProf.tw for objProf in profiles], dtype=float)
+        wf = numpy.array([objProf.wf for objProf in profiles], dtype=float)
+        tf = numpy.array([objProf.tf for objProf in profiles], dtype=float)
+        pType = numpy.array([objProf.pType for objProf in profiles], dtype=object)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            hwtw = hw/tw
+            dtf = numpy.where(pType == 'T-shaped', (wf-tw)/2, wf-tw) / tf
+        position = numpy.arange(len(profiles))
+
+        dominatedBy = numpy.full(len(profiles), -1)
+        for objType in set(pType.tolist()):
+            if objType not in ('Flat Bar', 'T-shaped', 'L-shaped'):
+                continue # proportions unknown, nothing is removed
+            group = numpy.flatnonzero(pType == objType)
+            # A dominating profile is never heavier, and of equal weights it
+            # has a higher SM or Aw or comes first in the list, so it is
+            # visited first. Dominance is transitive, so a profile that is
+            # dominated at all is dominated by one of the kept profiles.
+            group = group[numpy.lexsort((position[group], -Aw[group], -SM[group],
+                                         Atot[group]))]
+            front = numpy.empty(len(group), dtype=int)
+            nFront = 0
+            for p in group:
+                q = front[:nFront]
+                better = (SM[q] >= SM[p]) & (Aw[q] >= Aw[p])
+                # Section 11.7.2, a flanged profile with hw/tw <= 40 passes
+                # both stress cases since kAS >= 1 for a sufficient web area
+                if objType == 'Flat Bar':
+                    prop = (hwtw[q] <= 12) | (hwtw[q] <= hwtw[p])
+                else:
+                    prop = (hwtw[q] <= 40) & ((dtf[q] <= 12) | (dtf[q] <= dtf[p]))
+                candidates = q[better & prop]
+                if candidates.size:
+                    # The lightest, of equal weights the first in the list
+                    dominatedBy[p] = candidates[numpy.lexsort((candidates,
+                                                               Atot[candidates]))[0]]
+                else:
+                    front[nFront] = p
+                    nFront += 1
+
+        kept = [profiles[i] for i in numpy.flatnonzero(dominatedBy < 0)]
+        removed = [[profiles[i], profiles[dominatedBy[i]]]
+                   for i in numpy.flatnonzero(dominatedBy >= 0)]
+        return [kept, removed]
+
 class Extrusions(ProfileLibrary):
     """ Defines the available extruded profiles.
 
@@ -1011,7 +2245,9 @@ class Machined(ProfileLibrary):
             ...calc_SM...
             Objective:
                 Calculates the section modulus of different types of
-                cross-sections.
+                cross-sections. T- and L-shaped profiles have the flange
+                on top of the web and the same section modulus for the
+                same dimensions.
             Input:
                 -
             Output:
@@ -1065,12 +2301,9 @@ class Machined(ProfileLibrary):
             ycog = hw/2
             Ixx = (tw * hw**3) / 12
             SM = Ixx / ycog
-        elif self.pType == 'L-shaped':
-            Atot = tw * (wf + hw - tf)
-            ycog = (hw**2 + wf * tf - tw**2) / (2*(wf + hw - tw))
-            Ixx = (1/3)*(wf * hw**3 - (hw-tf) * (wf-tw)**3) - Atot * (hw - ycog)**2
-            SM = Ixx / ycog
-        elif self.pType == 'T-shaped':
+        elif self.pType in ('T-shaped', 'L-shaped'):
+            # The flange is on top of the web for both, its side offset
+            # does not change the bending about the horizontal axis
             ycog = (((hw + tf/2) * tf * wf + hw**2 *
                     tw/2) / Atot)
             Ixx = (tw * hw * (ycog - hw/2)**2 +
@@ -1094,6 +2327,179 @@ class Rules:
         # Variables common to all rules (tricky to know for this version)
 
 
+""" Vessel-only terms of the ISO rules, built once per vessel revision and
+    design category by ISO12215.get_rule_context. Immutable, so the same
+    context can be shared by all kernels.
+"""
+RuleContext = namedtuple('RuleContext',
+                         ['ruleType', 'designCategory', 'revision',
+                          'LWL', 'bC', 'mLDC', 'beta04', 'V', 'hT', 'tC', 'fB',
+                          'craftMode', 'kDC', 'nCG', 'nCG_kL',
+                          'mLDCPow015', 'mLDCPow033',
+                          'pBBase_d', 'pBBase_p', 'pDBase', 'pBMin', 'pSMin'])
+
+
+class RuleCache:
+    """ Evaluates array rule kernels once per class of members with the same
+        rule input, and keeps the results of the classes in a bounded least
+        recently used (LRU) cache, e.g. all panels of repeated sections.
+
+        Attributes:
+            ...__init__...
+            Objective:
+                Inits the rule cache.
+            Input:
+                maxsize: Maximum number of cached classes (int), 0 turns off
+                         the grouping and the kernels are called directly
+            Output:
+                self.entries: Cached results, (kernel name, key) -> result row
+                self.hits: Number of classes found in the cache (int)
+                self.misses: Number of classes evaluated by a kernel (int)
+                self.members: Number of members served by the cache (int)
+
+            ...clear...
+            Objective:
+                Empties the cache, the counters are kept.
+            Input:
+                -
+            Output:
+                -
+
+            ...group...
+            Objective:
+                Groups the members with bitwise equal keys. The rows are
+                hashed into one column for a fast numpy.unique, and grouped
+                on the whole rows if two different rows share a hash.
+            Input:
+                keys: N x K array of keys
+            Output:
+                bits: keys viewed as integers (N x K array)
+                first: First member of each class (array of length C)
+                inverse: Class of each member (array of length N)
+
+            ...hash_rows...
+            Objective:
+                Hashes each row of keys viewed as integers into one integer.
+                Different rows may share a hash, group handles that.
+            Input:
+                bits: N x K array of integers
+            Output:
+                N array of hashes
+
+            ...evaluate...
+            Objective:
+                Groups the members by their key columns, looks up each class
+                in the cache and calls the kernel once with the classes that
+                are missing. The results are shared back to all members. The
+                cache is emptied when objCtx changes, since the results also
+                depend on the vessel. If there are more classes than maxsize
+                each class is still evaluated once, but nothing is cached.
+            Input:
+                name: Name of the kernel, part of the cache key (string)
+                function: Array rule kernel, function(inputVec, objCtx)
+                          returning [ruleType, array, array, ...]
+                keyColumns: All inputs of the kernel (list of N arrays)
+                objCtx: RuleContext passed on to the kernel
+            Output:
+                [ruleType, array, array, ...] for all N members, as if the
+                kernel was called with keyColumns.
+    """
+    def __init__(self, maxsize=4096):
+        """ Inits the RuleCache object. """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.context = None
+        self.hits = 0
+        self.misses = 0
+        self.members = 0
+        pass
+
+    def clear(self):
+        """ Removes all cached results. """
+        self.entries.clear()
+        self.context = None
+        pass
+
+    def evaluate(self, name, function, keyColumns, objCtx):
+        """ Evaluates a kernel once per class of members with equal keys. """
+        if objCtx != self.context:
+            self.clear()
+            self.context = objCtx
+
+        if self.maxsize == 0:
+            return function(list(keyColumns), objCtx)
+        keys = numpy.column_stack([numpy.asarray(col, dtype=float) for col in keyColumns])
+        if keys.shape[0] == 0:
+            return function(list(keys.T), objCtx)
+        self.members += keys.shape[0]
+
+        [bits, first, inverse] = self.group(keys)
+        nClasses = len(first)
+
+        if nClasses > self.maxsize:
+            # Too many classes to keep, evaluate each class once without caching
+            self.misses += nClasses
+            out = function(list(keys[first].T), objCtx)
+            return [out[0]] + [numpy.broadcast_to(value, (nClasses,))[inverse]
+                               for value in out[1:]]
+
+        classKeys = [(name, bits[i].tobytes()) for i in first]
+        results = [None] * nClasses
+        missing = []
+        for c, classKey in enumerate(classKeys):
+            entry = self.entries.get(classKey)
+            if entry is None:
+                missing.append(c)
+            else:
+                self.entries.move_to_end(classKey)
+                ruleType, results[c] = entry
+        self.hits += nClasses - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            out = function(list(keys[first[missing]].T), objCtx)
+            ruleType = out[0]
+            values = numpy.column_stack([numpy.broadcast_to(value, (len(missing),))
+                                         for value in out[1:]])
+            for k, c in enumerate(missing):
+                results[c] = values[k].copy()
+                self.entries[classKeys[c]] = (ruleType, results[c])
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+        values = numpy.array(results)[inverse]
+        return [ruleType] + [values[:, k] for k in range(values.shape[1])]
+
+    def group(self, keys):
+        """ Groups the rows of keys that are bitwise equal (also NaN). """
+        bits = numpy.ascontiguousarray(keys).view(numpy.uint64)
+
+        # One numpy.unique on a single column is much faster than on rows.
+        hashes, inverse = numpy.unique(self.hash_rows(bits), return_inverse=True)
+        inverse = inverse.ravel()
+
+        # First member of each class
+        first = numpy.empty(len(hashes), dtype=numpy.intp)
+        first[inverse[::-1]] = numpy.arange(len(inverse))[::-1]
+
+        if not (bits == bits[first][inverse]).all():
+            # Hash collision, group on the whole rows instead
+            rowKeys = bits.view(numpy.dtype((numpy.void, bits.itemsize * bits.shape[1]))).ravel()
+            _, first, inverse = numpy.unique(rowKeys, return_index=True,
+                                             return_inverse=True)
+            inverse = inverse.ravel()
+        return [bits, first, inverse]
+
+    def hash_rows(self, bits):
+        """ FNV style hash of each row, with a shift to mix in the high bits. """
+        rowHash = numpy.zeros(bits.shape[0], dtype=numpy.uint64)
+        with numpy.errstate(over='ignore'):
+            for k in range(bits.shape[1]):
+                rowHash = (rowHash ^ bits[:, k]) * numpy.uint64(0x100000001b3)
+                rowHash ^= rowHash >> numpy.uint64(29)
+        return rowHash
+
+
 class ISO12215(Rules):
     """ Calculates structural requirements according to ISO 12215.
 
@@ -1113,6 +2519,12 @@ class ISO12215(Rules):
             Output:
                 self.name
                 self.designCategory
+                self.cache: RuleCache used by the Designer for the array
+                            kernels, see RuleCache. Off (maxsize 0) by
+                            default, since grouping the members costs more
+                            than it saves unless many members share their
+                            rule inputs, e.g. repeated sections. Assign a
+                            RuleCache(maxsize) to turn it on.
 
             ...get_vessel_data...
             Objective:
@@ -1123,6 +2535,38 @@ class ISO12215(Rules):
                 Vessel data = [LWL, bC, mLDC, beta04, V, hT, tC, fB, craftMode]
                 See Vessel class for more information.
 
+            ...get_rule_context...
+            Objective:
+                Returns the RuleContext of the vessel and design category,
+                with all terms that only depend on the vessel: the vessel
+                data, kDC, nCG, mLDC**0.15, mLDC**0.33 and the base pressures
+                of section 8.1. The context is cached and rebuilt when
+                objVess.revision or self.designCategory changes.
+            Input:
+                objVess: Vessel class object
+            Output:
+                objCtx: RuleContext (namedtuple)
+
+            ...build_rule_context...
+            Objective:
+                Builds a new RuleContext, see get_rule_context.
+            Input:
+                objVess: Vessel class object
+            Output:
+                objCtx: RuleContext (namedtuple)
+
+            ...reduce_positions...
+            Objective:
+                Reduces the positions to the part that matters for kL and kZ:
+                xPos beyond 0.6 LWL gives kL = 1 and zPos below the canoe
+                draft gives kZ = 1, so they are replaced by one value. Used as
+                keys for the RuleCache.
+            Input:
+                xPos, zPos: Positions of the members (arrays, mm)
+                objCtx: RuleContext from get_rule_context
+            Output:
+                [xKey, zKey]: Positions that give the same kL and kZ (arrays)
+
             ...calc_global_var...
             Objective:
                 Calculates rule variables that apply to the entire vessel.
@@ -1156,6 +2600,28 @@ class ISO12215(Rules):
                 AD: Design area under consideration (float, m2)
                 kZ: Vertical pressure distribution factor (0-1, -)
 
+            ...measure_panels...
+            Objective:
+                Collects the data of all panels in the structure as arrays, to
+                be used as input for the array versions of the rules.
+            Input:
+                objStruct: Structure object
+            Output:
+                Panel data = [b, lPan, xPos, zPos, location] (arrays), where
+                location is encoded as the position in self.locations,
+                0 = 'bottom', 1 = 'side'.
+
+            ...calc_panel_pressure_factors_array...
+            Objective:
+                Array version of calc_panel_pressure_factors, calculates the
+                PRESSURE ADJUSTING FACTORS from SECTION 7 for N panels at once.
+            Input:
+                [b, lPan , xPos, zPos, location] (arrays of length N)
+                objCtx: RuleContext from get_rule_context
+            Output:
+                ruleType: type of rule that has been used, put to default as 'ISO' (string)
+                kL, kAR_d, kAR_p, AD, kZ: see calc_panel_pressure_factors (arrays)
+
             ...measure_stiffener...
             Objective:
                 Collects data from Stiffener objects to be used as input for the rules.
@@ -1164,6 +2630,40 @@ class ISO12215(Rules):
             Output:
                 Stiffener data = [lStiff, xPos, zPos, sStiff, location, stiffType]
 
+            ...measure_stiffeners...
+            Objective:
+                Collects the data of all stiffeners in the structure as arrays,
+                to be used as input for the array versions of the rules.
+            Input:
+                objStruct: Structure object
+            Output:
+                Stiffener data = [lStiff, xPos, zPos, sStiff, location, stiffType]
+                (arrays), location encoded as in measure_panels and stiffType
+                as the codes of objStruct.stiffTable.
+
+            ...measure_profiles...
+            Objective:
+                Collects the data of a list of profiles as arrays, to be used
+                as input for the array versions of the rules.
+            Input:
+                objProfs: List of M Extrusions or Machined objects
+            Output:
+                Profile data = [Aw, SM, Atot, profType, hw, tw, wf, tf]
+                (arrays of length M), profType encoded as the position in
+                profTypes, -1 for other types.
+
+            ...calc_stiff_pressure_factors_array...
+            Objective:
+                Array version of calc_stiff_pressure_factors, calculates the
+                PRESSURE ADJUSTING FACTORS from SECTION 7 for N stiffeners at once.
+            Input:
+                [lStiff, xPos, zPos, sStiff, location, stiffType] (arrays of
+                length N)
+                objCtx: RuleContext from get_rule_context
+            Output:
+                ruleType: type of rule that has been used, put to default as 'ISO' (string)
+                kL, kAR_d, kAR_p, AD, kZ: see calc_stiff_pressure_factors (arrays)
+
             ...calc_stiff_pressure_factors...
             Objective:
                 Calculates the stiffener PRESSURE ADJUSTING FACTORS from SECTION 7
@@ -1206,6 +2706,31 @@ class ISO12215(Rules):
                 ruleType: type of rule that has been used, put to default as 'ISO' (string)
                 pMax: Maximum/Design pressure (float, kN/m2)
 
+            ...get_press_factors_array...
+            Objective:
+                Array version of get_press_factors, collects the pressure
+                factors of all members of a table.
+            Input:
+                objTable: objStruct.panTable or objStruct.stiffTable
+            Output:
+                Pressure factors = [kL, kAR_d, kAR_p, kZ] (arrays), kDC is
+                taken from the rule context.
+
+            ...calc_design_pressures_array...
+            Objective:
+                Calculates the DESIGN PRESSURES from SECTION 8.1 for arrays of
+                panels or stiffeners, which use the same equations. The base
+                pressures that only depend on the vessel are read from the
+                rule context.
+            Input:
+                [kL, kAR_d, kAR_p, kZ, location] (arrays), location encoded
+                as in measure_panels.
+                objCtx: RuleContext from get_rule_context
+            Output:
+                ruleType: type of rule that has been used, put to default as 'ISO' (string)
+                pMax: Maximum/Design pressure (float array, kN/m2), NaN for
+                      locations that are not covered.
+
             ...get_design_pressures...
             Objective:
                 Collects the design pressure for a Panel/Stiffener to be used as
@@ -1234,6 +2759,45 @@ class ISO12215(Rules):
                 tReq: Required thickness for metal plating (float, mm)
                 tMin: Single-skin plating minimum thickness for the hull (float, mm)
 
+            ...calc_panel_req_array...
+            Objective:
+                Array version of calc_panel_req, calculates the section 10
+                requirements of N panels in one pass. The aspect ratio regimes
+                are evaluated on masks of the panels that fall in them.
+            Input:
+                [pMax, b, lPan, location, sigmaUW, sigmaY, sigmaYW] (arrays),
+                location encoded as in measure_panels.
+                objCtx: RuleContext from get_rule_context, for V and mLDC
+            Output:
+                ruleType: The rules that have been used for calculations (string)
+                k2, k3, FShear, MBend, tReq, tMin: see calc_panel_req (arrays),
+                tMin is NaN for locations that are not covered.
+
+            ...evaluate_panels_array...
+            Objective:
+                Fused version of calc_panel_pressure_factors_array,
+                calc_design_pressures_array and calc_panel_req_array, the
+                panel inputs are only passed in once.
+            Input:
+                [b, lPan, xPos, zPos, location, sigmaUW, sigmaY, sigmaYW]
+                (arrays of length N)
+                objCtx: RuleContext from get_rule_context
+            Output:
+                [ruleType, kL, kAR_d, kAR_p, AD, kZ, pMax, k2, k3, FShear,
+                 MBend, tReq, tMin] (arrays of length N)
+
+            ...evaluate_stiffeners_array...
+            Objective:
+                Fused version of calc_stiff_pressure_factors_array,
+                calc_design_pressures_array and calc_stiff_req_array.
+            Input:
+                [lStiff, xPos, zPos, sStiff, location, stiffType, sigmaYW]
+                (arrays of length N)
+                objCtx: RuleContext from get_rule_context
+            Output:
+                [ruleType, kL, kAR_d, kAR_p, AD, kZ, pMax, AwMin, SMMin]
+                (arrays of length N)
+
             ...calc_stiff_req...
             Objective:
                 Calculates the STIFFENING MEMBERS REQUIREMENTS, SECTION 11.
@@ -1244,12 +2808,36 @@ class ISO12215(Rules):
                 AwMin: Minimum allowed shear web area (float, m2)
                 SMMin: Minimum allowed section modulus (float, m3)
                 
+            ...calc_stiff_req_array...
+            Objective:
+                Array version of calc_stiff_req for N stiffeners. If a list of
+                candidate profiles is given the ratios between offered and
+                required SM and Aw are added for every stiffener and profile,
+                see calc_profile_ratios.
+            Input:
+                [pMax, lStiff, sStiff, sigmaYW] (arrays of length N)
+                objProfs: List of M profile objects (optional)
+            Output:
+                ruleType: The rules that have been used for calculations (string)
+                AwMin, SMMin: see calc_stiff_req (arrays of length N)
+                ratAw, ratSM: N x M arrays, only if objProfs is given.
+
+            ...calc_profile_ratios...
+            Objective:
+                Offered vs required web area and section modulus for all
+                stiffeners and profiles in one broadcast operation.
+            Input:
+                [AwMin, SMMin, Aw, SM]
+                where AwMin and SMMin are arrays of N stiffeners and Aw and SM
+                arrays of M profiles.
+            Output:
+                ratAw, ratSM: N x M arrays of Aw/AwMin and SM/SMMin.
+
             ...check_stiff_prop...
             Objective:
                 Maximum proportions between dimensions within a stiffener,
                 section 11.7.2.
             Input:
-                i: Stiffener list ID nr, eg. objStruct.Stiffener[i] (int)
                 sigmaYW: Welded yield strength of stiffener (float, N/mm2)
                 Aw: Web area of chosen profile (float, cm2)
                 AwMin: Minimum required web area of stiffener (float, cm2)
@@ -1261,18 +2849,73 @@ class ISO12215(Rules):
                 wf: Profile flange width (float, mm)
                 tf: Profile flange thickness (float, mm)
             Output:
-                Error messages or pass if recommended proportion are exceeded.
+                passed: True if the recommended proportions are met (bool)
+                reason: Reason code, see propReasons, 0 if passed (int)
+
+            ...check_stiff_prop_array...
+            Objective:
+                Same checks as check_stiff_prop using array comparisons, for
+                all stiffeners and profiles at once.
+            Input:
+                [sigmaYW, Aw, AwMin, sigmaActStiff, profType, hw, tw, wf, tf]
+                where the stiffener values (sigmaYW, AwMin) and the profile
+                values (Aw, profType, hw, tw, wf, tf) broadcast against
+                sigmaActStiff, e.g. N x 1 and M for an N x M check. profType
+                is the position in profTypes.
+            Output:
+                passed: Boolean mask, True where the proportions are met
+                reason: Reason codes, see propReasons, 0 where passed
 
 
     """
+    locations = ('bottom', 'side')
+    profTypes = ('Flat Bar', 'T-shaped', 'L-shaped')
+    propReasons = ('OK', 'hw/tw > 12', 'd/tf > 12', 'hw/tw > 40',
+                   'hw/tw > 40 * sqrt(kAS)',
+                   'Profile type is not valid (Flat bar, T-shaped, L-shaped)')
+
     def __init__(self, designCategory):
         """ Inits the ISO rules object. """
         self.name = 'ISO'
         self.designCategory = GlobalVariableCheck.check_inputs(GlobalVariableCheck,
                                                                'ISOinit',
                                                                designCategory)
+        self.contextKey = None
+        self.context = None
+        self.cache = RuleCache(0)
         pass
 
+    def get_rule_context(self, objVess):
+        """ Returns the cached rule context, rebuilt if the vessel or the
+            design category has changed.
+        """
+        key = (objVess, objVess.revision, self.designCategory)
+        if key != self.contextKey:
+            self.context = self.build_rule_context(objVess)
+            self.contextKey = key
+        return self.context
+
+    def build_rule_context(self, objVess):
+        """ Calculates the rule terms that only depend on the vessel. """
+        VessData = self.get_vessel_data(objVess)
+        [LWL, bC, mLDC, beta04, V, hT, tC, fB, craftMode] = VessData
+        [ruleType, kDC, nCG] = self.calc_global_var(VessData[:5] + [craftMode])
+
+        mLDCPow033 = mLDC**0.33
+
+        """ Base pressures, section 8.1 """
+        pBBase_d = 2.4*mLDCPow033 + 20  # displacement mode, kN/m2
+        pBBase_p = (0.1*mLDC/(LWL * bC)) * (1 + kDC**0.5 * nCG)  # planing mode, kN/m2
+        pDBase = 0.35*LWL + 14.6  # kN/m2
+        pBMin = 0.45*mLDCPow033 + (0.9*LWL * kDC)  # kN/m2
+        pSMin = 0.9*LWL * kDC  # kN/m2
+
+        return RuleContext(ruleType, self.designCategory, objVess.revision,
+                           LWL, bC, mLDC, beta04, V, hT, tC, fB,
+                           craftMode, kDC, nCG, min(max(nCG, 3), 6),
+                           mLDC**0.15, mLDCPow033,
+                           pBBase_d, pBBase_p, pDBase, pBMin, pSMin)
+
     def get_vessel_data(self, objVess):
         """ Collects data from the Vessel object to be used as input for the rules. """
         LWL = objVess.LWL
@@ -1286,6 +2929,15 @@ class ISO12215(Rules):
         craftMode = objVess.calc_craft_mode()
         return [LWL, bC, mLDC, beta04, V, hT, tC, fB, craftMode]
 
+    def reduce_positions(self, xPos, zPos, objCtx):
+        """ Positions reduced to what matters for kL and kZ, so that members
+            that only differ in position can share their rule evaluation.
+        """
+        # kL = 1 forward of 0.6 LWL and kZ = 1 below the canoe draft
+        xKey = numpy.where(xPos/objCtx.LWL > 0.6, objCtx.LWL, xPos)
+        zKey = numpy.where(zPos > objCtx.tC, zPos, objCtx.tC)
+        return [xKey, zKey]
+
     def calc_global_var(self, inputVec):
         """ Calculates rule variables that apply to the entire vessel. """
 
@@ -1340,6 +2992,48 @@ class ISO12215(Rules):
         return [b, lPan, xPos, zPos, location]
 
 
+    def measure_panels(self, objStruct):
+        """ Collects the data of all panels as arrays to be used as input for
+            the array versions of the rules.
+        """
+        pan = objStruct.panTable
+        b = pan.column('b')
+        lPan = pan.column('lPan')
+        xPos = pan.column('xPos')
+        zPos = pan.column('zPos')
+        location = pan.recode('location', self.locations)
+        return [b, lPan, xPos, zPos, location]
+
+    def calc_panel_pressure_factors_array(self, inputVec, objCtx):
+        """ Calculates the panel PRESSURE ADJUSTING FACTORS from SECTION 7 for
+            arrays of panels.
+        """
+        [b, lPan , xPos, zPos, location] = inputVec
+        LWL, tC, fB, nCG_kL = objCtx.LWL, objCtx.tC, objCtx.fB, objCtx.nCG_kL
+
+        """ LONGITUDINAL PRESSURE DISTRIBUTION FACTOR 'kL', SECTION 7.4 """
+        kL = numpy.where((xPos/LWL) > 0.6, 1.0,
+                         numpy.minimum((1 - 0.167 * nCG_kL) / 0.6 * (xPos/LWL)
+                                       + 0.167 * nCG_kL, 1.0))
+
+        """ AREA PRESSURE REDUCTION FACTOR kAR, SECTION 7.5 """
+        kR_p = 1
+        kR_d = 1.5 - 3e-4 * b
+
+        """ AD is the design area in m2, maximum value from section 7.5.1. """
+        AD = numpy.minimum((lPan * b) * 1e-6, 2.5e-6 * b**2)
+
+        """ Calculate kAR, limited according to section 7.5.2-3. """
+        kAR_p = numpy.clip((kR_p * 0.1 * objCtx.mLDCPow015) / AD**0.3, 0.25, 1)
+        kAR_d = numpy.clip((kR_d * 0.1 * objCtx.mLDCPow015) / AD**0.3, 0.25, 1)
+
+        """ HULL SIDE PRESSURE REDUCTION FACTOR kZ, SECTION 7.6. """
+        kZ = numpy.where(zPos > tC, (fB - (zPos - tC)) / fB, 1.0)
+
+        PressFact = ['ISO', kL, kAR_d, kAR_p, AD, kZ]
+
+        return PressFact
+
     def calc_panel_pressure_factors(self, inputVec):
         """ Calculates the panel PRESSURE ADJUSTING FACTORS from SECTION 7 """
         [b, lPan , xPos, zPos, location, mLDC, nCG, LWL, hT, tC, fB] = inputVec
@@ -1434,6 +3128,65 @@ class ISO12215(Rules):
         stiffType = objStiff.stiffType
         return [lStiff, xPos, zPos, sStiff, location, stiffType]
 
+    def measure_stiffeners(self, objStruct):
+        """ Collects the data of all stiffeners as arrays to be used as input
+            for the array versions of the rules.
+        """
+        stiff = objStruct.stiffTable
+        lStiff = stiff.column('lStiff')
+        xPos = stiff.column('xPos')
+        zPos = stiff.column('zPos')
+        sStiff = stiff.column('sStiff')
+        location = stiff.recode('location', self.locations)
+        stiffType = stiff.column('stiffType')
+        return [lStiff, xPos, zPos, sStiff, location, stiffType]
+
+    def measure_profiles(self, objProfs):
+        """ Collects the data of a list of profiles as arrays to be used as
+            input for the array versions of the rules.
+        """
+        Aw = numpy.array([objProf.Aw for objProf in objProfs], dtype=float)
+        SM = numpy.array([objProf.SM for objProf in objProfs], dtype=float)
+        Atot = numpy.array([objProf.Atot for objProf in objProfs], dtype=float)
+        profType = numpy.array([self.profTypes.index(objProf.pType)
+                                if objProf.pType in self.profTypes else -1
+                                for objProf in objProfs], dtype=int)
+        hw = numpy.array([objProf.hw for objProf in objProfs], dtype=float)
+        tw = numpy.array([objProf.tw for objProf in objProfs], dtype=float)
+        wf = numpy.array([objProf.wf for objProf in objProfs], dtype=float)
+        tf = numpy.array([objProf.tf for objProf in objProfs], dtype=float)
+        return [Aw, SM, Atot, profType, hw, tw, wf, tf]
+
+    def calc_stiff_pressure_factors_array(self, inputVec, objCtx):
+        """ Calculates the stiffener PRESSURE ADJUSTING FACTORS from SECTION 7
+            for arrays of stiffeners.
+        """
+        [lStiff, xPos, zPos, sStiff, location, stiffType] = inputVec
+        LWL, tC, fB, nCG_kL = objCtx.LWL, objCtx.tC, objCtx.fB, objCtx.nCG_kL
+
+        """ LONGITUDINAL PRESSURE DISTRIBUTION FACTOR 'kL', SECTION 7.4 """
+        kL = numpy.where((xPos/LWL) > 0.6, 1.0,
+                         numpy.minimum((1 - 0.167 * nCG_kL) / 0.6 * (xPos/LWL)
+                                       + 0.167 * nCG_kL, 1.0))
+
+        """ AREA PRESSURE REDUCTION FACTOR kAR, SECTION 7.5 """
+        kR_p = 1
+        kR_d = 1 - 2e-4 * lStiff
+
+        """ AD is the design area in m2, minimum value from section 7.5.1. """
+        AD = numpy.maximum((lStiff * sStiff)*1e-6, 0.33e-6 * lStiff**2)
+
+        """ Calculate kAR, limited according to section 7.5.2-3. """
+        kAR_p = numpy.clip((kR_p * 0.1 * objCtx.mLDCPow015) / AD**0.3, 0.25, 1)
+        kAR_d = numpy.clip((kR_d * 0.1 * objCtx.mLDCPow015) / AD**0.3, 0.25, 1)
+
+        """ HULL SIDE PRESSURE REDUCTION FACTOR kZ, SECTION 7.6. """
+        kZ = numpy.where(zPos > tC, (fB - (zPos - tC)) / fB, 1.0)
+
+        PressFact = ['ISO', kL, kAR_d, kAR_p, AD, kZ]
+
+        return PressFact
+
     def calc_stiff_pressure_factors(self, inputVec):
         """ Calculates the stiffener PRESSURE ADJUSTING FACTORS from SECTION 7 """
         [lStiff, xPos, zPos, sStiff, location, stiffType, mLDC, nCG, LWL, hT, tC, fB] = inputVec
@@ -1528,6 +3281,44 @@ class ISO12215(Rules):
         kZ = objComp.kZ
         return [kDC, kL, kAR_d, kAR_p, kZ]
 
+    def get_press_factors_array(self, objTable):
+        """ Collects the pressure factors of all members of a table as arrays. """
+        kL = objTable.column('kL')
+        kAR_d = objTable.column('kAR_d')
+        kAR_p = objTable.column('kAR_p')
+        kZ = objTable.column('kZ')
+        return [kL, kAR_d, kAR_p, kZ]
+
+    def calc_design_pressures_array(self, inputVec, objCtx):
+        """ Calculates the panel and stiffener DESIGN PRESSURES from SECTION
+            8.1 for arrays of members.
+        """
+        [kL, kAR_d, kAR_p, kZ, location] = inputVec
+
+        """ Base pressures from the rule context """
+        kDC = objCtx.kDC
+        pBBase_d = objCtx.pBBase_d
+        pBBase_p = objCtx.pBBase_p
+        pDBase = objCtx.pDBase
+        pBMin = objCtx.pBMin
+        pSMin = objCtx.pSMin
+
+        """ BOTTOM DESIGN PRESSURE, the greater of 8.1.2 and 8.1.3. """
+        pB_d = pBBase_d * kAR_d * kDC * kL
+        pB_p = pBBase_p * kAR_p * kL
+        pB = numpy.maximum(numpy.maximum(pB_d, pB_p), pBMin)
+
+        """ SIDE DESIGN PRESSURE, the greater of 8.1.4 and 8.1.5. """
+        pS_d = (pDBase + kZ * (pBBase_d - pDBase)) * kAR_d * kDC * kL
+        pS_p = (pDBase + kZ * (0.25*pBBase_p - pDBase)) * kAR_p * kDC * kL
+        pS = numpy.maximum(numpy.maximum(pS_d, pS_p), pSMin)
+
+        pMax = numpy.where(location == 0, pB,
+                           numpy.where(location == 1, pS, numpy.nan))
+
+        DesPress = ['ISO', pMax]
+        return DesPress
+
     def calc_panel_pressures(self, inputVec):
         """" Calculates the panel DESIGN PRESSURES from SECTION 8. """
 
@@ -1728,6 +3519,101 @@ class ISO12215(Rules):
         return PanReq
 
 
+    def calc_panel_req_array(self, inputVec, objCtx):
+        """ Calculates the required thickness for arrays of panels. """
+        [pMax, b, lPan, location, sigmaUW, sigmaY, sigmaYW] = inputVec
+        V = objCtx.V
+
+        aspRat = numpy.asarray(lPan/b, dtype=float)
+        short = aspRat < 2
+        long = aspRat > 4
+        middle = ~short & ~long
+
+        """ Panel aspect ratio factor, section 10.1.2. """
+        """ ----- for strength k2 ----- """
+        k2 = numpy.full(aspRat.shape, 0.5)
+        r = aspRat[short]
+        k2[short] = ((0.271*r**2 + 0.910*r - 0.554) /
+                     (r**2 - 0.313*r + 1.351)
+                     )
+        k2 = numpy.clip(k2, 0.308, 0.5)
+
+        """ ----- for stiffness k3 (for sandwich) ----- """
+        k3 = numpy.clip((0.027*aspRat**2 - 0.029*aspRat + 0.011) /
+                        (aspRat**2 - 1.463*aspRat + 1.108),
+                        0.014, 0.028)
+
+        """ Curvature correction factor kC for curved plates,
+            section 10.1.3.
+        """
+        kC = 1  # TODO: this is for non-curvature, add the proper rules later!
+
+        """ Shear force and bending moment of panel, section 10.1.5. """
+        kSHC = numpy.full(aspRat.shape, 0.5)
+        r = aspRat[short]
+        kSHC[short] = 0.035 + 0.394*r - 0.09*r**2
+        m = (2-4/0.463-0.500)
+        kSHC[middle] = 0.463 + m*(aspRat[middle] - 2)
+
+        """ ---- Shear force ---- """
+        FShear = (math.sqrt(kC) * kSHC * pMax * b)*1e-3
+
+        """ ---- Bending moment ---- """
+        MBend = (83.33 * kC**2 * 2*k2 * pMax * b**2)*1e-6
+
+        """ Design stress for metal plating, section 10.3.1. """
+        sigmaD = numpy.minimum(0.6*sigmaUW, 0.9*sigmaYW)
+
+        """ Variables for calculation of minimum thickness for the hull,
+            section 10.6.2.
+        """
+        A = 1
+        k5 = numpy.sqrt(125/sigmaY)
+        k7B = 0.02
+        k7S = 0
+        k8 = 0.1
+
+        """ Required thickness for metal plating, section 10.3.2. """
+        tReq = b * kC * numpy.sqrt((pMax*k2) / (1000*sigmaD))
+
+        """ Minimum thickness for the hull, section 10.6.2. """
+        tMin = numpy.where(location == 0, k5 * (A + k7B * V + k8 * objCtx.mLDCPow033),
+                           numpy.where(location == 1, k5 * (A + k7S * V + k8 * objCtx.mLDCPow033),
+                                       numpy.nan))
+
+        PanReq = ['ISO', k2, k3, FShear, MBend, tReq, tMin]
+        return PanReq
+
+    def evaluate_panels_array(self, inputVec, objCtx):
+        """ Pressure factors, design pressures and requirements of arrays of
+            panels in one pass.
+        """
+        [b, lPan, xPos, zPos, location, sigmaUW, sigmaY, sigmaYW] = inputVec
+
+        PressFact = self.calc_panel_pressure_factors_array([b, lPan, xPos, zPos, location],
+                                                           objCtx)
+        [ruleType, kL, kAR_d, kAR_p, AD, kZ] = PressFact
+        [ruleType, pMax] = self.calc_design_pressures_array([kL, kAR_d, kAR_p, kZ, location],
+                                                            objCtx)
+        PanReq = self.calc_panel_req_array([pMax, b, lPan, location, sigmaUW, sigmaY, sigmaYW],
+                                           objCtx)
+        return PressFact + [pMax] + PanReq[1:]
+
+    def evaluate_stiffeners_array(self, inputVec, objCtx):
+        """ Pressure factors, design pressures and requirements of arrays of
+            stiffeners in one pass.
+        """
+        [lStiff, xPos, zPos, sStiff, location, stiffType, sigmaYW] = inputVec
+
+        PressFact = self.calc_stiff_pressure_factors_array([lStiff, xPos, zPos, sStiff,
+                                                            location, stiffType],
+                                                           objCtx)
+        [ruleType, kL, kAR_d, kAR_p, AD, kZ] = PressFact
+        [ruleType, pMax] = self.calc_design_pressures_array([kL, kAR_d, kAR_p, kZ, location],
+                                                            objCtx)
+        StiffReq = self.calc_stiff_req_array([pMax, lStiff, sStiff, sigmaYW])
+        return PressFact + [pMax] + StiffReq[1:]
+
     def calc_stiff_req(self, inputVec):
         """ Calculates the STIFFENING MEMBERS REQUIREMENTS, SECTION 11. """
         [pMax, lStiff, sStiff, sigmaYW] = inputVec
@@ -1756,66 +3642,118 @@ class ISO12215(Rules):
         StiffReq = ['ISO', AwMin, SMMin]
         return StiffReq
 
+    def calc_stiff_req_array(self, inputVec, objProfs=None):
+        """ Calculates the STIFFENING MEMBERS REQUIREMENTS, SECTION 11, for
+            arrays of stiffeners and optionally the profile ratios.
+        """
+        [pMax, lStiff, sStiff, sigmaYW] = inputVec
+
+        kCS = 1 # TODO: This is for non-curvature, add rules later!
+        kSA = 5 # This is for attached to plating
+
+        """ Design stresses, section 11.3. """
+        sigmaDStiff = 0.7*sigmaYW
+        tauDStiff = 0.4*sigmaYW
+
+        """ Minimum section modulus and shear/web area, section 11.4.1. """
+        AwMin = (kSA * pMax * sStiff * lStiff / tauDStiff)*1e-6  # cm2
+        SMMin = (83.33 * kCS * pMax * sStiff * lStiff**2 / sigmaDStiff)*1e-9  # cm3
+
+        StiffReq = ['ISO', AwMin, SMMin]
+        if objProfs is not None:
+            [Aw, SM] = self.measure_profiles(objProfs)[:2]
+            StiffReq = StiffReq + self.calc_profile_ratios([AwMin, SMMin, Aw, SM])
+        return StiffReq
+
+    def calc_profile_ratios(self, inputVec):
+        """ Offered vs required Aw and SM for all stiffeners x profiles. """
+        [AwMin, SMMin, Aw, SM] = inputVec
+        ratAw = numpy.asarray(Aw)[numpy.newaxis, :] / numpy.asarray(AwMin)[:, numpy.newaxis]
+        ratSM = numpy.asarray(SM)[numpy.newaxis, :] / numpy.asarray(SMMin)[:, numpy.newaxis]
+        return [ratAw, ratSM]
+
     def check_stiff_prop(self, inputVec):
         """ Maximum proportions between dimensions within a stiffener,
             section 11.7.2
         """
-        [i, sigmaYW, Aw, AwMin, sigmaActStiff, profType, hw, tw, wf, tf] = inputVec
+        [sigmaYW, Aw, AwMin, sigmaActStiff, profType, hw, tw, wf, tf] = inputVec
         
         sigmaDStiff = 0.7*sigmaYW
         kAS = Aw / AwMin
 
+        reason = 0
         if sigmaActStiff > 0.8*sigmaDStiff:
             if profType == 'Flat Bar':
                 if (hw/tw) > 12:
-                    print ("Error: The stiffener", i, "proportion are bad, hw/tw > 12.")
-                else:
-                    pass
+                    reason = 1
             elif profType == 'T-shaped':
                 d = (wf-tw)/2
                 if (d/tf) > 12:
-                    print ("Error: The stiffener", i, "proportions are bad, d/tf > 12.")
+                    reason = 2
                 elif (hw/tw) > 40:
-                    print ("Error: The stiffener", i, "proportions are bad, hw/tw > 40.")
-                else:
-                    pass
+                    reason = 3
             elif profType == 'L-shaped':
                 d = wf-tw
                 if (d/tf) > 12:
-                    print ("Error: The stiffener", i, "proportions are bad, d/tf > 12.")
+                    reason = 2
                 elif (hw/tw) > 40:
-                    print ("Error: The stiffener", i, "proportions are bad, hw/tw > 40.")
-                else:
-                    pass
+                    reason = 3
             else:
-                print ("Error: Profile type is not valid (Flat bar, T-shaped, L-shaped)")
+                reason = 5
 
         elif sigmaActStiff < 0.8*sigmaDStiff:
             if profType == 'Flat Bar':
                 if (hw/tw) > 12:
-                    print ("Error: The stiffener", i, "proportions are bad, hw/tw > 12.")
-                else:
-                    pass
+                    reason = 1
             elif profType == 'T-shaped':
                 d = (wf-tw)/2
                 if (d/tf) > 12:
-                    print ("Error: The stiffener", i, "proportions are bad, d/tf > 12.")
+                    reason = 2
                 elif (hw/tw) > 40 * math.sqrt(kAS):
-                    print ("Error: The stiffener", i, "proportions are bad, hw/tw > 40 * sqrt(kAS).")
-                else:
-                    pass
+                    reason = 4
             elif profType == 'L-shaped':
                 d = wf-tw
                 if (d/tf) > 12:
-                    print ("Error: The stiffener", i, "proportions are bad, d/tf > 12.")
+                    reason = 2
                 elif (hw/tw) > 40 * math.sqrt(kAS):
-                    print ("Error: The stiffener", i, "proportions are bad, hw/tw > 40 * sqrt(kAS).")
-                else:
-                    pass
+                    reason = 4
             else:
-                print ("Error: Profile type is not valid (Flat bar, T-shaped, L-shaped)")
-        else:
-            pass
+                reason = 5
+
+        return [reason == 0, reason]
+
+    def check_stiff_prop_array(self, inputVec):
+        """ Maximum proportions between dimensions within a stiffener,
+            section 11.7.2, for arrays of stiffeners and profiles.
+        """
+        [sigmaYW, Aw, AwMin, sigmaActStiff, profType, hw, tw, wf, tf] = inputVec
+
+        sigmaDStiff = 0.7*sigmaYW
+        kAS = Aw / AwMin
+
+        high = sigmaActStiff > 0.8*sigmaDStiff
+        low = sigmaActStiff < 0.8*sigmaDStiff
+        flat = profType == 0
+        flanged = (profType == 1) | (profType == 2)
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            d = numpy.where(profType == 1, (wf-tw)/2, wf-tw)
+            dtf = d/tf # flat bars have no flange, tf = 0
+            hwtw = hw/tw
+            hwtwLow = 40 * numpy.sqrt(kAS)
+
+        # The first matching condition gives the reason, in the same order
+        # as check_stiff_prop.
+        reason = numpy.select([~(high | low),
+                               flat & (hwtw > 12),
+                               flat,
+                               flanged & (dtf > 12),
+                               flanged & high & (hwtw > 40),
+                               flanged & low & (hwtw > hwtwLow),
+                               flanged],
+                              [0, 1, 0, 2, 3, 4, 0],
+                              default=5)
+        return [reason == 0, reason]
 
 
 class Report:
@@ -2702,10 +4640,12 @@ class Report:
         worksheet1.set_column('L:L', 7.0)
         worksheet1.set_column('M:M', 6.0)
         worksheet1.set_column('N:N', 6.0)
+        worksheet1.set_column('O:O', 12.0)
+        worksheet1.set_column('P:P', 9.0)
 
         """ Extrusions """
         # Write some data headers for optimization data
-        worksheet1.merge_range('A1:N1', 'Extruded Profiles', tabletitle)
+        worksheet1.merge_range('A1:P1', 'Extruded Profiles', tabletitle)
         worksheet1.merge_range('A2:E2', 'Input Data', tabletitle)
         worksheet1.write('A3', 'Number of Stiffeners', bold)
         worksheet1.write('B3', 'Plating Material', bold)
@@ -2718,12 +4658,14 @@ class Report:
         worksheet1.merge_range('H2:I2', 'Required', tabletitle)
         worksheet1.write('H3', 'SM Min (cm3)', bold)
         worksheet1.write('I3', 'Aw Min (cm2)', bold)
-        worksheet1.merge_range('J2:N2', 'Results', tabletitle)
+        worksheet1.merge_range('J2:P2', 'Results', tabletitle)
         worksheet1.write('J3', 'SM ratio', bold)
         worksheet1.write('K3', 'Aw Ratio', bold)
         worksheet1.write('L3', 'Stiffener Weight (kg)', bold)
         worksheet1.write('M3', 'Plating Weight (kg)', bold)
         worksheet1.write('N3', 'Total Weight (kg)', bold)
+        worksheet1.write('O3', 'Proportions', bold)
+        worksheet1.write('P3', 'Plating', bold)
 
         # optimization data we want to write to the worksheet.
         inputList = objOpt.sweep[0]
@@ -2735,7 +4677,8 @@ class Report:
 
         # Iterate over the data and write it out row by row.
         for (nStiff, panMat, stiffMat, tp, profile, SM, Aw, SMMin, AwMin, SMRat,
-             AwRat, platWeight, stiffWeight, totWeight) in (inputList):
+             AwRat, platWeight, stiffWeight, totWeight, propCheck,
+             plateCheck) in (inputList):
             worksheet1.write(row, col,     nStiff)
             worksheet1.write(row, col + 1, panMat)
             worksheet1.write(row, col + 2, stiffMat)
@@ -2750,6 +4693,8 @@ class Report:
             worksheet1.write(row, col + 11, platWeight, twoDec)
             worksheet1.write(row, col + 12, stiffWeight, twoDec)
             worksheet1.write(row, col + 13, totWeight, twoDec)
+            worksheet1.write(row, col + 14, propCheck)
+            worksheet1.write(row, col + 15, plateCheck)
             row += 1
 
         row_e = row + 4 # used in formatting for machined
@@ -2766,7 +4711,7 @@ class Report:
         for i in range(0, objOpt.sweep[0].__len__()):
             # Gather all SMs ratios that are > 1
             if objOpt.sweep[0][i][9] > 1:
-                secMs = secMs + [[i] + [objOpt.sweep[0][i][9]] + [objOpt.sweep[0][i][-1]]]
+                secMs = secMs + [[i] + [objOpt.sweep[0][i][9]] + [objOpt.sweep[0][i][13]]]
             else:
                 pass
 
@@ -2812,7 +4757,7 @@ class Report:
 
         """ Machined """
         # Write some data headers for optimization data
-        TT = 'A%d:N%d' % (row+2, row+2)
+        TT = 'A%d:P%d' % (row+2, row+2)
         T1 = 'A%d:E%d' % (row+3, row+3)
         H1 = 'A%d' % (row + 4)
         H2 = 'B%d' % (row + 4)
@@ -2825,12 +4770,14 @@ class Report:
         T3 = 'H%d:I%d' % (row+3, row+3)
         H8 = 'H%d' % (row + 4)
         H9 = 'I%d' % (row + 4)
-        T4 = 'J%d:N%d' % (row+3, row+3)
+        T4 = 'J%d:P%d' % (row+3, row+3)
         H10 = 'J%d' % (row + 4)
         H11 = 'K%d' % (row + 4)
         H12 = 'L%d' % (row + 4)
         H13 = 'M%d' % (row + 4)
         H14 = 'N%d' % (row + 4)
+        H15 = 'O%d' % (row + 4)
+        H16 = 'P%d' % (row + 4)
 
 
         worksheet1.merge_range(TT, 'Machined Profiles', tabletitle)
@@ -2852,6 +4799,8 @@ class Report:
         worksheet1.write(H12, 'Stiffener Weight (kg)', bold)
         worksheet1.write(H13, 'Plating Weight (kg)', bold)
         worksheet1.write(H14, 'Total Weight (kg)', bold)
+        worksheet1.write(H15, 'Proportions', bold)
+        worksheet1.write(H16, 'Plating', bold)
 
         # optimization data we want to write to the worksheet.
         inputList = objOpt.sweep[1]
@@ -2862,7 +4811,8 @@ class Report:
 
         # Iterate over the data and write it out row by row.
         for (nStiff, panMat, stiffMat, tp, profile, SM, Aw, SMMin, AwMin, SMRat,
-             AwRat, platWeight, stiffWeight, totWeight) in (inputList):
+             AwRat, platWeight, stiffWeight, totWeight, propCheck,
+             plateCheck) in (inputList):
             worksheet1.write(row, col,     nStiff)
             worksheet1.write(row, col + 1, panMat)
             worksheet1.write(row, col + 2, stiffMat)
@@ -2877,6 +4827,8 @@ class Report:
             worksheet1.write(row, col + 11, platWeight, twoDec)
             worksheet1.write(row, col + 12, stiffWeight, twoDec)
             worksheet1.write(row, col + 13, totWeight, twoDec)
+            worksheet1.write(row, col + 14, propCheck)
+            worksheet1.write(row, col + 15, plateCheck)
             row += 1
 
 
@@ -2886,7 +4838,7 @@ class Report:
         for i in range(0, objOpt.sweep[1].__len__()):
             # Gather all SMs ratios that are > 1
             if objOpt.sweep[1][i][9] > 1:
-                secMs2 = secMs2 + [[i] + [objOpt.sweep[1][i][9]] + [objOpt.sweep[1][i][-1]]]
+                secMs2 = secMs2 + [[i] + [objOpt.sweep[1][i][9]] + [objOpt.sweep[1][i][13]]]
             else:
                 pass
 
@@ -3005,8 +4957,8 @@ class Designer:
 
             ...calc_pressure_factors...
             Objective:
-                Loops through all structural members and calculates the pressure
-                factors.
+                Calculates the pressure factors of all panels and of all
+                stiffeners, with one call to the array rules for each.
             Input:
                 objRule: Rules child object. The rules that will be used for requirements.
                 objStruct: Structure object from the Structure class.
@@ -3018,8 +4970,8 @@ class Designer:
 
             ...calc_design_pressures...
             Objective:
-                Loops through all structural members and calculates the design
-                pressures.
+                Calculates the design pressures of all panels and of all
+                stiffeners, with one call to the array rules for each.
             Input:
                 [objRule, objStruct, objVess]
             Output:
@@ -3029,8 +4981,8 @@ class Designer:
 
             ...calc_scantling_req...
             Objective:
-                Loops through all structural members and calculates the scantling
-                requirements.
+                Calculates the scantling requirements of all panels and of all
+                stiffeners, with one call to the array rules for each.
             Input:
                 [objRule, objStruct, objVess]
             Output:
@@ -3038,16 +4990,54 @@ class Designer:
                 [ruleType, k2, k3, FShear, MBend, tReq, tMin]
                 objStruct.Stiffener[i].'scantling requirements'
                 [ruleType, AwMin, SMMin]
-                
+
+            ...calc_panel_scantling_req...
+            Objective:
+                The panel half of calc_scantling_req, the requirements only
+                depend on the design pressures and the panel material.
+            Input:
+                [objRule, objStruct, objVess]
+            Output:
+                objStruct.Panel[i].'scantling requirements'
+
+            ...calc_stiff_scantling_req...
+            Objective:
+                The stiffener half of calc_scantling_req, the requirements
+                only depend on the design pressures and the stiffener material.
+            Input:
+                [objRule, objStruct, objVess]
+            Output:
+                objStruct.Stiffener[i].'scantling requirements'
+
+            ...evaluate...
+            Objective:
+                Fused version of calc_pressure_factors, calc_design_pressures
+                and calc_scantling_req. The members are measured and grouped
+                once and each class of equal members goes through all rule
+                kernels in one call, see ISO12215.evaluate_panels_array and
+                evaluate_stiffeners_array. The stage by stage methods give
+                the same results and are kept for debugging.
+            Input:
+                [objRule, objStruct, objVess]
+            Output:
+                objStruct.Panel[i] and objStruct.Stiffener[i] pressure
+                factors, design pressures and scantling requirements.
+
             ...calc_stiff_max_prop...
             Objective:
                 Calculates and checks so that the stiffener profile does not exceed
                 the recommended dimensional proportion, in order to reduce risk
-                of buckling.
+                of buckling. All stiffeners are checked with array operations,
+                either with their assigned profiles or against every profile
+                in objProfs.
             Input:
                 objStress: StreesCalculator object
                 objStruct: Structure object
                 objRule: Rule object
+                objProfs: List of M profile objects (optional)
+            Output:
+                [passed, reason]: see ISO12215.check_stiff_prop_array, arrays
+                of length N, or N x M if objProfs is given.
 
             ...assign_material_to_all_panels...
             Objective:
@@ -3077,14 +5067,39 @@ class Designer:
                 required thickness rounded up. It will then find the plating
                 object that has the same thickness as the one found in the list and
                 assign it to the panel. If there is there is not plate with the
-                required thickness an error will occur and the largest/thickest
-                plate will be assigned.
+                required thickness the largest/thickest plate will be assigned.
+                All panels are looked up at once with
+                PlatingLibrary.recommended_plates.
             Input:
                 objStruct
                 objPlaLib: Plating library from the PlatingLibrary class
             Output:
                 objStruct.Panel[i].Plate
+                outOfRange: True for the panels where no plate was thick
+                            enough (bool array)
                 See more information in the Plates and PlatingLibrary class.
+
+            ...assign_recommended_profiles...
+            Objective:
+                Assigns to each stiffener the lightest profile (least Atot)
+                that meets its own SMMin and AwMin, and optionally the
+                proportion check of calc_stiff_max_prop. The stiffeners are
+                grouped on equal requirements and each group is looked up
+                once against the sorted profile index of the library: the
+                SM bound is a searchsorted, the Aw bound and the proportion
+                check are masks, and the lightest remaining profile is taken.
+                Stiffeners without a feasible profile keep their profile.
+            Input:
+                objStruct: Structure with calculated stiffener requirements
+                objProfLib: ProfileLibrary object
+                allowed: List of profiles to choose from, None for all of
+                         the kind, e.g. ProfileLibrary.profile_frontier
+                kind: 'Extrusions' or 'Machined' (string)
+                objRule, objStress: If both are given, the profiles must also
+                                    pass the proportion check, which needs
+                                    the plates and materials to be assigned
+            Output:
+                found: True for the stiffeners that got a profile (bool array)
     """
     def __init__(self):
         """ Inits the Designer objects. """
@@ -3119,14 +5134,16 @@ class Designer:
         panWidth = []
         panYPos = []
         panZPos = []
+        panels = []
+        stiffeners = []
         """ Create equally spaced stiffener coordinates using a horizontal plane. """
         if location in ('bottom', 'deck', 'superstructure top'):
             # create local coordinates
             stiffYPos = numpy.linspace(0, sGird, nStiff+2)
             for i in range(0, nStiff+1):
                 sStiff = stiffYPos[i+1] - stiffYPos[i]
-                panWidth = panWidth + [stiffYPos[i+1] - stiffYPos[i]]
-                panYPos = panYPos + [stiffYPos[i+1] - panWidth[i]/2]
+                panWidth.append(stiffYPos[i+1] - stiffYPos[i])
+                panYPos.append(stiffYPos[i+1] - panWidth[i]/2)
             # create panel objects
             for i in range(0, panYPos.__len__()):
                 Pan = (Panel(panWidth[i], 
@@ -3137,7 +5154,7 @@ class Designer:
                              location,
                              secName)
                        )
-                objStruct.assign_panel(Pan)
+                panels.append(Pan)
             # create stiffener objects
             for i in range(0, stiffYPos.__len__()-2):
                 Stiff = (Stiffener(sFram, 
@@ -3149,7 +5166,7 @@ class Designer:
                                    'longitudinal',
                                    secName)
                          )
-                objStruct.assign_stiffener(Stiff)
+                stiffeners.append(Stiff)
                 
             """ Create equally spaced stiffener coordinates using a vertical plane. """
         elif location in ('side', 'bottom&side', 'superstructure'):
@@ -3157,8 +5174,8 @@ class Designer:
             stiffZPos = numpy.linspace(0, sGird, nStiff+2)
             for i in range(0, nStiff+1):
                 sStiff = stiffZPos[i+1] - stiffZPos[i]
-                panWidth = panWidth + [stiffZPos[i+1] - stiffZPos[i]]
-                panZPos = panZPos + [stiffZPos[i+1] - panWidth[i]/2]
+                panWidth.append(stiffZPos[i+1] - stiffZPos[i])
+                panZPos.append(stiffZPos[i+1] - panWidth[i]/2)
             # create panel objects
             for i in range(0, panZPos.__len__()):
                 Pan = (Panel(panWidth[i], 
@@ -3169,7 +5186,7 @@ class Designer:
                              location,
                              secName)
                        )
-                objStruct.assign_panel(Pan)
+                panels.append(Pan)
             # create stiffener objects
             for i in range(0, stiffZPos.__len__()-2):
                 Stiff = (Stiffener(sFram, 
@@ -3181,8 +5198,11 @@ class Designer:
                                    'longitudinal',
                                    secName)
                          )
-                objStruct.assign_stiffener(Stiff)
-                
+                stiffeners.append(Stiff)
+
+        objStruct.assign_panels(panels)
+        objStruct.assign_stiffeners(stiffeners)
+
         nrpan = objStruct.Panel.__len__()
         nrstiff = objStruct.Stiffener.__len__()
         print('%d panels and %d stiffeners have been created' % (nrpan, nrstiff))
@@ -3190,183 +5210,236 @@ class Designer:
 
 
     def calc_pressure_factors(self, objRule, objStruct, objVess):
-        """ Loops through all structural members and calculates the pressure
-            factors.
-        """
-        VessData = objRule.get_vessel_data(objVess)
-        inVessData = VessData[:5]+[VessData[-1]]
+        """ Calculates the pressure factors of all structural members. """
+        objCtx = objRule.get_rule_context(objVess)
 
-        GlobVar = objRule.calc_global_var(inVessData)
+        GlobVar = [objCtx.ruleType, objCtx.kDC, objCtx.nCG]
 
         objStruct.assign_global_var(GlobVar)
 
-        for i in range(0, objStruct.Panel.__len__()):
-            """ Panel pressure factors """
-            PanData = objRule.measure_panel(objStruct.Panel[i])
-
-            InData = (PanData + [objStruct.mLDC] + [objStruct.nCG] + [VessData[0]]
-                      + VessData[5:8]
-                      )
-
-            PressFac = objRule.calc_panel_pressure_factors(InData)
+        """ Panel pressure factors, all panels at once """
+        [b, lPan, xPos, zPos, location] = objRule.measure_panels(objStruct)
+        [xKey, zKey] = objRule.reduce_positions(xPos, zPos, objCtx)
 
-            objStruct.Panel[i].assign_press_factors(PressFac)
-            print("Panel %d pressure factors calculated" % i)
+        PressFac = objRule.cache.evaluate('panel_pressure_factors',
+                                          objRule.calc_panel_pressure_factors_array,
+                                          [b, lPan, xKey, zKey, location], objCtx)
 
-        for i in range(0,objStruct.Stiffener.__len__()):
-            """ Stiffener pressure factors """
-            StiffData = objRule.measure_stiffener(objStruct.Stiffener[i])
+        objStruct.assign_member_press_factors(objStruct.panTable, PressFac)
 
-            InData = (StiffData + [objStruct.mLDC] + [objStruct.nCG] + [VessData[0]]
-                      + VessData[5:8]
-                      )
+        """ Stiffener pressure factors, all stiffeners at once """
+        [lStiff, xPos, zPos, sStiff, location, stiffType] = objRule.measure_stiffeners(objStruct)
+        [xKey, zKey] = objRule.reduce_positions(xPos, zPos, objCtx)
 
-            PressFac = objRule.calc_stiff_pressure_factors(InData)
+        PressFac = objRule.cache.evaluate('stiff_pressure_factors',
+                                          objRule.calc_stiff_pressure_factors_array,
+                                          [lStiff, xKey, zKey, sStiff, location, stiffType],
+                                          objCtx)
 
-            objStruct.Stiffener[i].assign_press_factors(PressFac)
-            print("Stiffener %d pressure factors calculated" % i)
+        objStruct.assign_member_press_factors(objStruct.stiffTable, PressFac)
         pass
 
 
 
     def calc_design_pressures(self, objRule, objStruct, objVess):
-        """ Loops through all structural members and calculates the design
-            pressures.
-        """
-        VessData = objRule.get_vessel_data(objVess)
-
-        for i in range(0, objStruct.Panel.__len__()):
-            """ Panel design pressures """
-            PressFact = objRule.get_press_factors(objStruct, objStruct.Panel[i])
-
-            PanData = objRule.measure_panel(objStruct.Panel[i])
-
-            InData = (PressFact + [PanData[4]] + [objStruct.nCG] + VessData[:2]
-                      + [objStruct.mLDC]
-                      )
+        """ Calculates the design pressures of all structural members. """
+        objCtx = objRule.get_rule_context(objVess)
 
-            DesPress = objRule.calc_panel_pressures(InData)
+        for objTable, MembData in ((objStruct.panTable, objRule.measure_panels(objStruct)),
+                                   (objStruct.stiffTable, objRule.measure_stiffeners(objStruct))):
+            """ Panel and stiffener design pressures """
+            PressFact = objRule.get_press_factors_array(objTable)
 
-            objStruct.Panel[i].assign_design_pressure(DesPress)
-            print("Panel %d design pressure calculated" % i)
+            InData = PressFact + [MembData[4]]
 
-        for i in range(0, objStruct.Stiffener.__len__()):
-            """ Stiffener design pressures """
-            PressFact = objRule.get_press_factors(objStruct, objStruct.Stiffener[i])
-
-            StiffData = objRule.measure_stiffener(objStruct.Stiffener[i])
-
-            InData = (PressFact + [StiffData[4]] + [objStruct.nCG] + VessData[:2]
-                      + [objStruct.mLDC]
-                      )
+            DesPress = objRule.cache.evaluate('design_pressures',
+                                              objRule.calc_design_pressures_array,
+                                              InData, objCtx)
 
-            DesPress = objRule.calc_stiffener_pressures(InData)
-
-            objStruct.Stiffener[i].assign_design_pressure(DesPress)
-            print("Stiffener %d design pressure calculated" % i)
+            objStruct.assign_member_design_pressure(objTable, DesPress)
         pass
 
     def calc_scantling_req(self, objRule, objStruct, objVess):
-        """ Loops through all structural members and calculates the scantling
-            requirements.
-        """
-        VessData = objRule.get_vessel_data(objVess)
+        """ Calculates the scantling requirements of all structural members. """
+        self.calc_panel_scantling_req(objRule, objStruct, objVess)
+        self.calc_stiff_scantling_req(objRule, objStruct, objVess)
+        pass
 
-        for i in range(0, objStruct.Panel.__len__()):
-            """ Panel requirements """
-            DesPress = objRule.get_design_pressures(objStruct.Panel[i])
+    def calc_panel_scantling_req(self, objRule, objStruct, objVess):
+        """ Calculates the scantling requirements of all panels. """
+        objCtx = objRule.get_rule_context(objVess)
 
-            PanData = objRule.measure_panel(objStruct.Panel[i])
+        """ Panel requirements, all panels at once """
+        pan = objStruct.panTable
+        PanData = objRule.measure_panels(objStruct)
 
-            InData = (DesPress + PanData[:2] + [PanData[4]] + [objStruct.mLDC] +
-                      [VessData[4]] +
-                      [objStruct.Panel[i].Material.tensileStrength] +
-                      [objStruct.Panel[i].Material.yieldStrength] +
-                      [objStruct.Panel[i].Material.yieldStrength] ###
-                      )
-            ### TODO: welded and non-welded should be used but that data does not exist yet.
+        InData = ([pan.column('pMax')] + PanData[:2] + [PanData[4]] +
+                  [pan.lookup('Material', 'tensileStrength')] +
+                  [pan.lookup('Material', 'yieldStrength')] +
+                  [pan.lookup('Material', 'yieldStrength')] ###
+                  )
+        ### TODO: welded and non-welded should be used but that data does not exist yet.
 
+        PanReq = objRule.cache.evaluate('panel_req', objRule.calc_panel_req_array,
+                                        InData, objCtx)
 
-            PanReq = objRule.calc_panel_req(InData)
+        objStruct.assign_member_scantling_req(pan, PanReq)
+        pass
 
-            objStruct.Panel[i].assign_scantling_req(PanReq)
-            print("Panel %d requirements calculated" % i)
+    def calc_stiff_scantling_req(self, objRule, objStruct, objVess):
+        """ Calculates the scantling requirements of all stiffeners. """
+        objCtx = objRule.get_rule_context(objVess)
 
-        for i in range(0, objStruct.Stiffener.__len__()):
-            """ Stiffener requirements """
-            DesPress = objRule.get_design_pressures(objStruct.Stiffener[i])
+        """ Stiffener requirements, all stiffeners at once """
+        stiff = objStruct.stiffTable
+        StiffData = objRule.measure_stiffeners(objStruct)
 
-            StiffData = objRule.measure_stiffener(objStruct.Stiffener[i])
+        InData = ([stiff.column('pMax')] + [StiffData[0]] + [StiffData[3]] +
+                  [stiff.lookup('Material', 'yieldStrength')]
+                  )
 
-            InData = (DesPress + [StiffData[0]] + [StiffData[3]] +
-                      [objStruct.Stiffener[i].Material.yieldStrength]
-                      )
+        StiffReq = objRule.cache.evaluate('stiff_req',
+                                          lambda inputVec, objCtx: objRule.calc_stiff_req_array(inputVec),
+                                          InData, objCtx)
 
-            StiffReq = objRule.calc_stiff_req(InData)
+        objStruct.assign_member_scantling_req(stiff, StiffReq)
+        pass
 
-            objStruct.Stiffener[i].assign_scantling_req(StiffReq)
-            print("Stiffener %d requirements calculated" % i)
+    def evaluate(self, objRule, objStruct, objVess):
+        """ Calculates the pressure factors, design pressures and scantling
+            requirements of all structural members in one fused pass.
+        """
+        objCtx = objRule.get_rule_context(objVess)
+        objStruct.assign_global_var([objCtx.ruleType, objCtx.kDC, objCtx.nCG])
+
+        """ All panels at once """
+        pan = objStruct.panTable
+        [b, lPan, xPos, zPos, location] = objRule.measure_panels(objStruct)
+        [xKey, zKey] = objRule.reduce_positions(xPos, zPos, objCtx)
+        yieldStrength = pan.lookup('Material', 'yieldStrength')
+        ### TODO: welded and non-welded should be used but that data does not exist yet.
+
+        PanRes = objRule.cache.evaluate('panels', objRule.evaluate_panels_array,
+                                        [b, lPan, xKey, zKey, location,
+                                         pan.lookup('Material', 'tensileStrength'),
+                                         yieldStrength, yieldStrength],
+                                        objCtx)
+
+        objStruct.assign_member_press_factors(pan, PanRes[:6])
+        objStruct.assign_member_design_pressure(pan, PanRes[:1] + PanRes[6:7])
+        objStruct.assign_member_scantling_req(pan, PanRes[:1] + PanRes[7:])
+
+        """ All stiffeners at once """
+        stiff = objStruct.stiffTable
+        [lStiff, xPos, zPos, sStiff, location, stiffType] = objRule.measure_stiffeners(objStruct)
+        [xKey, zKey] = objRule.reduce_positions(xPos, zPos, objCtx)
+
+        StiffRes = objRule.cache.evaluate('stiffeners', objRule.evaluate_stiffeners_array,
+                                          [lStiff, xKey, zKey, sStiff, location, stiffType,
+                                           stiff.lookup('Material', 'yieldStrength')],
+                                          objCtx)
+
+        objStruct.assign_member_press_factors(stiff, StiffRes[:6])
+        objStruct.assign_member_design_pressure(stiff, StiffRes[:1] + StiffRes[6:7])
+        objStruct.assign_member_scantling_req(stiff, StiffRes[:1] + StiffRes[7:])
         pass
-    
-    def calc_stiff_max_prop(self, objStress, objStruct, objRule):
+
+    def calc_stiff_max_prop(self, objStress, objStruct, objRule, objProfs=None):
         """ Calculates and checks so that the stiffener profiles do not exceed
             the recommended dimensional proportions, in order to reduce risk
-            of buckling. 
+            of buckling. Returns the pass mask and the reason codes.
         """
-        for i in range(0, objStruct.Stiffener.__len__()):
-            stress = objStress.calc_stiff_stress(objStruct.Stiffener[i], objStruct)
-            
-            inData = ([i] 
-                      + [objStruct.Stiffener[i].Material.yieldStrength]
-                      + [objStruct.Stiffener[i].Profile.Aw]
-                      + [objStruct.Stiffener[i].AwMin]
-                      + [stress]
-                      + [objStruct.Stiffener[i].Profile.pType]
-                      + [objStruct.Stiffener[i].Profile.hw]
-                      + [objStruct.Stiffener[i].Profile.tw]
-                      + [objStruct.Stiffener[i].Profile.wf]
-                      + [objStruct.Stiffener[i].Profile.tf]
-                      )
-            
-            objRule.check_stiff_prop(inData)
-        pass
+        stiff = objStruct.stiffTable
+        stress = objStress.calc_stiff_stress_array(objStruct, objProfs)
+        sigmaYW = stiff.lookup('Material', 'yieldStrength')
+        AwMin = stiff.column('AwMin')
+
+        if objProfs is None:
+            objProfs = stiff.values('Profile')
+        else:
+            sigmaYW = sigmaYW[:, numpy.newaxis]
+            AwMin = AwMin[:, numpy.newaxis]
+        [Aw, SM, Atot, profType, hw, tw, wf, tf] = objRule.measure_profiles(objProfs)
+
+        inData = [sigmaYW, Aw, AwMin, stress, profType, hw, tw, wf, tf]
+
+        return objRule.check_stiff_prop_array(inData)
 
     def assign_material_to_all_panels(self, objStruct, objMat):
         """ Assigns the same material object to all panels. """
-        for i in range(0, objStruct.Panel.__len__()):
-            objStruct.Panel[i].assign_material(objMat)
+        objStruct.panTable.set_column('Material', objMat)
         pass
 
     def assign_material_to_all_stiffeners(self, objStruct, objMat):
         """ Assigns the same material object to all stiffeners. """
-        for i in range(0, objStruct.Stiffener.__len__()):
-            objStruct.Stiffener[i].assign_material(objMat)
+        objStruct.stiffTable.set_column('Material', objMat)
         pass
 
+    def assign_recommended_profiles(self, objStruct, objProfLib, allowed=None,
+                                    kind='Extrusions', objRule=None, objStress=None):
+        """ Assigns the lightest profile that meets its own requirements to
+            each stiffener, returns the mask of the stiffeners that got one.
+        """
+        stiff = objStruct.stiffTable
+        index = objProfLib.profile_index(kind)
+        profiles = [index['profiles'][i] for i in index['order']] # SM order
+        usable = numpy.ones(len(profiles), dtype=bool)
+        if allowed is not None:
+            allowedIDs = set(id(objProf) for objProf in allowed)
+            usable = numpy.array([id(objProf) in allowedIDs for objProf in profiles],
+                                 dtype=bool)
+
+        # Rank of each profile by mass, equal masses in library order
+        rank = numpy.empty(len(profiles), dtype=float)
+        rank[numpy.lexsort((index['order'], index['Atot']))] = numpy.arange(len(profiles))
+
+        SMMin = stiff.column('SMMin')
+        AwMin = stiff.column('AwMin')
+        if len(profiles) == 0 or len(SMMin) == 0:
+            return numpy.zeros(len(SMMin), dtype=bool)
+        if objRule is not None and objStress is not None:
+            # Stiffeners x profiles, the stress depends on the profile
+            [passed, reason] = self.calc_stiff_max_prop(objStress, objStruct, objRule,
+                                                        profiles)
+            inverse = numpy.arange(len(SMMin))
+            keys = numpy.column_stack([SMMin, AwMin])
+        else:
+            # One lookup per group of stiffeners with equal requirements
+            passed = None
+            [keys, inverse] = numpy.unique(numpy.column_stack([SMMin, AwMin]), axis=0,
+                                           return_inverse=True)
+            inverse = inverse.reshape(-1)
+
+        start = numpy.searchsorted(index['SM'], keys[:, 0], side='left')
+        feasible = ((numpy.arange(len(profiles)) >= start[:, numpy.newaxis])
+                    & (index['Aw'] >= keys[:, 1:2]) & usable)
+        if passed is not None:
+            feasible &= passed
+        choice = numpy.argmin(numpy.where(feasible, rank, numpy.inf), axis=1)
+        found = feasible[numpy.arange(len(keys)), choice][inverse]
+
+        rows = numpy.flatnonzero(found)
+        stiff.set_column('Profile', [profiles[i] for i in choice[inverse][rows]], rows)
+        return found
+
     def assign_recommended_plates(self, objStruct, objPlaLib):
         """ Assigns the recommended Plating object to all Panel objects.
-            It collects all the available thicknesses and put them in a list.
-            For each panel it will find the position in the list of the closest
-            required thickness rounded up. It will then find the plating
-            object that has the same thickness as the one found in the list and
-            assign it to the panel. If there is there is not plate with the
-            required thickness an error will occur and the largest/thickest
-            plate will be assigned.
+            The required thickness of all panels is looked up at once in the
+            sorted thicknesses of the plating library, rounded up. If there is
+            no plate with the required thickness the largest/thickest plate is
+            assigned and the panel is flagged in the returned mask.
         """
-        for i in range(0, objStruct.Panel.__len__()):
-            minTP = max(objStruct.Panel[i].tReq, objStruct.Panel[i].tMin)
-            allTP = objPlaLib.list_all_thicknesses()
-            pos = bisect_left(allTP, minTP)
-
-            try:
-                InData = next((x for x in objPlaLib.Plates if x.tp == allTP[pos]), None)
-            except:
-                print("""ERROR: There is no plate with the required thickness,
-       largest availaible has been assigned""")
-                InData = objPlaLib.Plates[-1]
-
-            objStruct.Panel[i].assign_plate(InData)
-        pass
+        pan = objStruct.panTable
+        tReq = pan.column('tReq')
+        tMin = pan.column('tMin')
+        # As max(tReq, tMin) for each panel
+        minTP = numpy.where(tMin > tReq, tMin, tReq)
+        [plates, outOfRange] = objPlaLib.recommended_plates(minTP)
+
+        # One write per plate in use
+        for plate in numpy.unique(plates):
+            pan.set_column('Plate', objPlaLib.Plates[plate], numpy.flatnonzero(plates == plate))
+        return outOfRange
 
     # Methods:
         # Designer.CreateStructReport(Structure,ISO12215,Report)
@@ -3436,6 +5509,132 @@ class GlobalVariableCheck:
         pass
 
 
+class SharedArrays:
+    """ Publishes a set of numpy arrays in one block of shared memory, so that
+        other processes can attach to them without copying or pickling the
+        data. The owner creates and unlinks the block, the other processes
+        attach and close it. Also works as a context manager, which closes
+        the block and unlinks it if it is the owner.
+
+        Attributes:
+            ...__init__...
+            Objective:
+                Inits the object on an existing block, use create or attach.
+            Input:
+                shm: multiprocessing.shared_memory.SharedMemory object
+                layout: name -> (offset, shape, dtype) of the arrays (dict)
+                owner: True if this process created the block (bool)
+            Output:
+                self.arrays: name -> numpy array, views of the block (dict)
+
+            ...create...
+            Objective:
+                Creates a block large enough for all arrays (each aligned to
+                8 bytes) and copies the arrays into it.
+            Input:
+                arrays: name -> numpy array (dict)
+            Output:
+                SharedArrays object, owner of the block
+
+            ...attach...
+            Objective:
+                Attaches to a block created by another process.
+            Input:
+                descriptor: From descriptor()
+            Output:
+                SharedArrays object
+
+            ...descriptor...
+            Objective:
+                Small picklable description of the block for other processes.
+            Input:
+                -
+            Output:
+                [name, layout]
+
+            ...close...
+            Objective:
+                Drops the array views and closes the block in this process.
+                Arrays taken from self.arrays must not be used afterwards.
+            Input:
+                -
+            Output:
+                -
+
+            ...unlink...
+            Objective:
+                Frees the block, only done by the owner after all processes
+                are done with it.
+            Input:
+                -
+            Output:
+                -
+    """
+    alignment = 8
+
+    def __init__(self, shm, layout, owner=False):
+        """ Inits the views of the arrays in the block. """
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.arrays = {name: numpy.ndarray(shape, dtype=numpy.dtype(dtype),
+                                           buffer=shm.buf, offset=offset)
+                       for name, (offset, shape, dtype) in layout.items()}
+
+    @classmethod
+    def create(cls, arrays):
+        """ Creates the block and copies the arrays into it. """
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            array = numpy.asarray(array)
+            size = -(-size // cls.alignment) * cls.alignment
+            layout[name] = (size, array.shape, array.dtype.str)
+            size += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        objShared = cls(shm, layout, owner=True)
+        for name, array in arrays.items():
+            objShared.arrays[name][...] = array
+        return objShared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """ Attaches to a block created by another process. """
+        [name, layout] = descriptor
+        return cls(shared_memory.SharedMemory(name=name), layout)
+
+    def descriptor(self):
+        """ Returns the name and layout of the block. """
+        return [self.shm.name, self.layout]
+
+    def close(self):
+        """ Drops the views and closes the block in this process. """
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self):
+        """ Frees the block, by the owner only. """
+        if self.owner:
+            self.shm.unlink()
+            self.owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        self.unlink()
+
+
+""" Result row of a sweep, see Optimizer.sweep_method. A tuple, so it can
+    be indexed and unpacked as the rows were before.
+"""
+SweepRow = namedtuple('SweepRow',
+                      ['nStiff', 'panMat', 'stiffMat', 'tp', 'profile', 'SM', 'Aw',
+                       'SMMin', 'AwMin', 'SMRat', 'AwRat', 'stiffWeight', 'panWeight',
+                       'totalWeight', 'propCheck', 'plateCheck'])
+
+
 class Optimizer:
     """ User chooses between different optimization methods depending on what
         type of structural member needs to be optimized.
@@ -3453,7 +5652,8 @@ class Optimizer:
             ...objective_function...
             Objective:
                 Calculates the objective function of the optimization.
-                Currently only covers the total weight.
+                Currently only covers the total weight, which is read from
+                the running totals of the structure in constant time.
             Input:
                 objStruct: Structure object
             Output:
@@ -3465,7 +5665,8 @@ class Optimizer:
                 topology for a chosen section and structure child objects and
                 calculates the rules. It then assigns the recommended plating 
                 and loops through a list of user-specified profiles from 
-                extrusions and machined.
+                extrusions and machined. Each number of stiffeners is one
+                iter_sweep_unit. Collects the rows of iter_sweep in lists.
             Input:
                 objVess: Vessel object for calculating requirements
                 objStruct: Structure object for panel and stiffener objects
@@ -3482,6 +5683,18 @@ class Optimizer:
                           stiffeners
                 strakeID: Strake object ID nr e.g. Strake[0] (int)
                 sectionID: Section object ID nr e.g. Section[0] (int)
+                workers: Number of processes (int), 1 runs in this process
+                         and other values use sweep_parallel, None for one
+                         per CPU
+                keepBest: If given, only keeps the keepBest lightest feasible
+                          rows, see select_best (int)
+                keepGroups: With keepBest, keeps the best rows of each number
+                            of stiffeners and material pair instead of
+                            the best of each list (bool)
+                frontierOnly: Only sweeps the profiles that are not
+                              dominated, see ProfileLibrary.prune_dominated.
+                              The removed profiles are kept in self.pruned
+                              as (removed extrusions, removed machined) (bool)
             Output:
                 self[0]
                     extrWeights[0:n]:
@@ -3499,6 +5712,11 @@ class Optimizer:
                        [11]: Total weight for stiffeners (float, kg)
                        [12]: Total weight for panels (float, kg) ,
                        [13]: Total weight for entire section (float, kg)
+                       [14]: Proportion check, 'OK' or the reason it fails
+                             for the governing stiffener (string)
+                       [15]: Plate check, 'OK' or 'Out of range' when no
+                             plate of the library is thick enough for one
+                             of the panels (string)
                 self[1]:
                     machWeights[0:n]:
                        [0]: Number of stiffeners (int)
@@ -3515,6 +5733,338 @@ class Optimizer:
                        [11]: Total weight for stiffeners (float, kg)
                        [12]: Total weight for panels (float, kg) ,
                        [13]: Total weight for entire section (float, kg)
+                       [14]: Proportion check, 'OK' or the reason it fails
+                             for the governing stiffener (string)
+                       [15]: Plate check, 'OK' or 'Out of range' when no
+                             plate of the library is thick enough for one
+                             of the panels (string)
+                objStruct: Holds the last design of the sweep, see
+                           assign_last_design
+
+            ...iter_sweep...
+            Objective:
+                Generator version of sweep_method, which yields the rows as
+                they are produced. Only the results of one work unit are kept
+                at a time, so consumers like a report writer, a top-k
+                selection or a file can process any number of rows in
+                constant memory. Stopping the iteration early is allowed.
+            Input:
+                As sweep_method
+            Output:
+                Generator of (listIndex, row):
+                    listIndex: 0 for extrusions, 1 for machined (int)
+                    row: SweepRow, the fields of sweep_method self[0] by name
+                When all rows have been read, objStruct holds the last design
+                of the sweep, see assign_last_design. When the iteration is
+                stopped early it holds the topology of the last number of
+                stiffeners swept, or is unchanged for a parallel sweep.
+
+            ...collect_sweep...
+            Objective:
+                Collects the rows of iter_sweep in the lists of sweep_method.
+            Input:
+                rows: Iterable of (listIndex, row)
+            Output:
+                (extrWeights, machWeights)
+
+            ...is_feasible...
+            Objective:
+                Feasibility of a sweep row: a plate thick enough for every
+                panel, SM and Aw ratios of at least 1 and a passed
+                proportion check. Rows without stiffeners only need the
+                plates to be thick enough.
+            Input:
+                row: SweepRow
+            Output:
+                True or False
+
+            ...select_best...
+            Objective:
+                Bounded top-k selection of the rows of iter_sweep. Keeps a
+                heap of at most keepBest feasible rows per list, or per list
+                and group (number of stiffeners, panel material, stiffener
+                material), keyed on total weight. The heaviest kept row is at
+                the root and is replaced when a lighter row comes, so the
+                memory and the report size only depend on keepBest and the
+                number of groups. Rows of equal weight are kept and ordered
+                in sweep order.
+            Input:
+                rows: Iterable of (listIndex, row) from iter_sweep
+                keepBest: Number of rows to keep (int)
+                keepGroups: Per group instead of per list (bool)
+            Output:
+                (extrWeights, machWeights): The kept rows sorted by total
+                weight, per group in the order the groups first appear
+
+            ...iter_sweep_parallel...
+            Objective:
+                Generator version of sweep_parallel. All units are submitted
+                at once, the rows of a unit are yielded when it is its turn.
+                Stopping the iteration early cancels the units that have not
+                started yet.
+            Input:
+                As sweep_parallel
+            Output:
+                Generator of (listIndex, row), as iter_sweep
+
+            ...sweep_parallel...
+            Objective:
+                Splits the sweep into independent work units, one per number
+                of stiffeners and panel material, and runs them with
+                sweep_unit_shared on a concurrent.futures.ProcessPoolExecutor.
+                The work is done by the generator iter_sweep_parallel.
+                The topologies (built on a scratch Structure, so objStruct is
+                not changed), materials, profiles and plate thicknesses are
+                published once as SharedArrays, so a task only carries the
+                shared memory descriptor, the rule context and two indices.
+                The rows are merged in the same order as the serial
+                sweep_method and the shared memory is unlinked at the end.
+            Input:
+                As sweep_method, workers: Number of processes (int, None for
+                one per CPU)
+            Output:
+                (extrWeights, machWeights), see sweep_method
+
+            ...sweep_unit_shared...
+            Objective:
+                Work unit of sweep_parallel in a worker process. Attaches to
+                the shared arrays, runs sweep_unit_arrays on views of them and
+                closes the shared memory again. A staticmethod, so a task
+                only pickles a reference to it and not the Optimizer with its
+                sweep results.
+            Input:
+                descriptor: SharedArrays.descriptor() of the published arrays
+                objCtx: RuleContext of the vessel
+                designCategory: Design category of the rules (string)
+                unit: Index of the topology (int)
+                panIndex: Index of the panel material (int)
+            Output:
+                Results of sweep_unit_arrays for one panel material
+
+            ...shared_unit_inputs...
+            Objective:
+                Slices the topology of one unit and the library data out of
+                the shared arrays.
+            Input:
+                arrays: SharedArrays.arrays, unit, panIndex
+            Output:
+                [panTopo, stiffTopo, libData] for sweep_unit_arrays
+
+            ...iter_sweep_unit...
+            Objective:
+                Sweeps all materials and profiles for one number of
+                stiffeners. Creates the topology in objStruct, measures it and
+                runs sweep_unit_arrays and iter_sweep_rows.
+            Input:
+                As sweep_method, with nStiff: Number of stiffeners (int)
+                instead of minNrStiff and maxNrStiff,
+                profLists: [extrusions, machined] and
+                libData: From sweep_library_arrays, built once per sweep
+            Output:
+                Generator of the rows for nStiff, as iter_sweep
+
+            ...assign_last_design...
+            Objective:
+                Assigns the last design of the sweep to objStruct: the
+                topology of nStiff stiffeners, the last panel and stiffener
+                materials, the rule results, the recommended plates and the
+                last machined profile, or the last extrusion when there are
+                no machined profiles. This is what objStruct held after the
+                sweep when every design was assigned to it, and callers such
+                as MarcusPrototype read it afterwards.
+            Input:
+                As sweep_method, with nStiff: Number of stiffeners (int)
+                instead of minNrStiff and maxNrStiff.
+            Output:
+                objStruct
+
+            ...sweep_library_arrays...
+            Objective:
+                Collects the numeric data of the materials, profiles and
+                plates of a sweep.
+            Input:
+                objRule, panMat, stiffMat
+                profLists: [extrusions, machined]
+                objPlaLib: PlatingLibrary object
+            Output:
+                [panMats, stiffMats, profSets, thicknesses, lastTP]:
+                    panMats: 3 x K [tensileStrength, yieldStrength, density]
+                    stiffMats: 2 x L [yieldStrength, density]
+                    profSets: 8 x M ISO12215.measure_profiles per list
+                    thicknesses: Available plate thicknesses (mm)
+                    lastTP: [tp] of the last plate, used when no plate is
+                            thick enough
+
+            ...select_plate_thickness...
+            Objective:
+                Closest available thickness rounded up for arrays of panels,
+                as Designer.assign_recommended_plates.
+            Input:
+                minTP: max(tReq, tMin) of the panels (mm)
+                thicknesses, lastTP: From sweep_library_arrays
+            Output:
+                [tp, outOfRange]:
+                    tp: Plate thickness of the panels (mm), lastTP where no
+                        plate is thick enough
+                    outOfRange: True where no plate is thick enough (bool array)
+
+            ...sweep_unit_arrays...
+            Objective:
+                Numeric part of a sweep unit, as a staged evaluation where
+                every rule stage is evaluated once for the inputs it depends on:
+                    design pressures: once
+                    stiffener requirements, ratios and weights: once per
+                        stiffener material
+                    panel requirements and plates: once per panel material
+                    proportion check: once per material pair
+                and only the profile fitting is done per profile. Only uses
+                arrays, so it runs on views of shared memory as well.
+            Input:
+                objRule, objStress, objCtx: RuleContext
+                panTopo: [b, lPan, xPos, zPos, location, area] of the panels
+                stiffTopo: ISO12215.measure_stiffeners of the stiffeners
+                libData: From sweep_library_arrays
+            Output:
+                results[k] per panel material:
+                    [tp, panWeight, stiffResults[l], outOfRange] where
+                    stiffResults holds per stiffener material [SMMin, AwMin,
+                    profResults] of the governing stiffener, profResults per
+                    profile list [ratSM, ratAw, stiffWeight, reasons] for each
+                    profile and outOfRange is True when no plate is thick
+                    enough for one of the panels.
+
+            ...iter_sweep_rows...
+            Objective:
+                Assembles the rows of sweep_method from sweep_unit_arrays and
+                yields them one by one.
+            Input:
+                nStiff, panMat, stiffMat, profLists, results, objRule
+            Output:
+                Generator of (listIndex, SweepRow), as iter_sweep
+
+            ...governing_reasons...
+            Objective:
+                Reason code of the proportion check of each profile.
+            Input:
+                propCheck: [passed, reason] from check_stiff_prop_array for
+                           stiffeners x profiles
+            Output:
+                Code in ISO12215.propReasons of the first stiffener that
+                fails, 0 ('OK') when all pass (int array)
+
+            ...pareto_method...
+            Objective:
+                Multi-objective mode of the optimizer on the output of
+                sweep_method, without re-running it. Keeps the rows that are
+                not dominated in (total weight, lowest section modulus ratio,
+                lowest web area ratio, number of stiffeners): no other row is
+                lighter or as light, with higher or equal ratios and as many
+                or fewer stiffeners, and strictly better in one of them.
+            Input:
+                objSweep: (extrWeights, machWeights) from sweep_method
+            Output:
+                (extrFront, machFront): The non-dominated rows of each list,
+                                        sorted by total weight
+
+            ...pareto_front...
+            Objective:
+                Non-dominated rows of one list of sweep rows.
+            Input:
+                rows: extrWeights or machWeights of sweep_method
+            Output:
+                front: The non-dominated rows, sorted by total weight
+
+            ...pareto_objectives...
+            Objective:
+                Collects the objectives of the rows as minimised values:
+                [13] total weight, -[9] SM ratio, -[10] Aw ratio and [0]
+                number of stiffeners. NaN is replaced by inf.
+            Input:
+                rows: Sweep rows
+            Output:
+                objectives: N x 4 array (float)
+
+            ...pareto_indices...
+            Objective:
+                Non-dominated sort of the objectives. The rows are sorted on
+                the first objective, after which a row can only be dominated
+                by an earlier row. The front so far is kept in a Fenwick tree
+                over the ranks of the last objective, where each node holds a
+                Fenwick tree of the prefix minima of the third objective over
+                the sorted values of the second objective of its rows. A row
+                is dominated if one of the O(log k) nodes of lower or equal
+                last objective has a minimum <= its third objective at its
+                second objective, k being the number of distinct values of
+                the last objective. A query and an update take
+                O(log k log n), so the front is found in O(n log n log k)
+                with O(n log k) memory. The number of stiffeners takes few
+                values, for general objectives this is O(n log^2 n).
+            Input:
+                objectives: N x 4 array, all minimised
+            Output:
+                indices: Rows on the front in their original order (int array)
+
+            ...machined_method...
+            Objective:
+                Continuous optimization of the dimensions of a machined
+                profile for one section, instead of sweeping hand-made
+                Machined candidates. Minimises the stiffener mass of the
+                section (the profile area, since the length and material
+                are fixed) with scipy's SLSQP subject to:
+                    SM >= SMMin and Aw >= AwMin of the governing stiffener
+                    section 11.7.2: hw/tw <= 12 for flat bars, hw/tw <= 40
+                        and d/tf <= 12 for T- and L-shaped profiles
+                The limit hw/tw <= 40 is conservative, it passes both stress
+                cases of check_stiff_prop since 40*sqrt(kAS) >= 40 when
+                Aw >= AwMin, so the plating is not needed. The solution is
+                rounded up to the manufacturing increment by snap_machined.
+                Requires scipy, raises ImportError if it is missing.
+            Input:
+                objVess, objStruct, objRule, objDes: As sweep_method
+                nStiff: Number of stiffeners, > 0 (int)
+                objMat: Stiffener material object
+                pType: 'Flat Bar', 'T-shaped' or 'L-shaped' (string)
+                strakeID, sectionID: As sweep_method
+                bounds: name -> (lower, upper) of hw, tw, wf and tf (dict, mm),
+                        None for Optimizer.machinedBounds
+                increment: Manufacturing increment of the dimensions (float, mm)
+            Output:
+                [objProf, stiffWeight, SMMin, AwMin, feasible]:
+                    objProf: Machined object of the snapped dimensions
+                    stiffWeight: Total weight of the stiffeners (float, kg)
+                    SMMin, AwMin: Governing requirements (float, cm3 / cm2)
+                    feasible: True if the snapped profile meets all
+                              constraints within the bounds (bool)
+
+            ...machined_requirements...
+            Objective:
+                Creates the topology of the section on a scratch Structure
+                and calculates the stiffener requirements.
+            Input:
+                As machined_method
+            Output:
+                [AwMin, SMMin, lTot]: Largest requirements of the stiffeners
+                                      and their total length (mm)
+
+            ...machined_dims / machined_constraints / create_machined...
+            Objective:
+                Maps the design variables to [hw, tw, wf, tf] (flat bars
+                only have hw and tw) / constraint values, feasible when all
+                are >= 0 / Machined object with a label of its dimensions.
+            Input:
+                x or dims, pType, AwMin, SMMin
+            Output:
+                dims / constraints (array) / Machined object
+
+            ...snap_machined...
+            Objective:
+                Rounds the dimensions up to the increment and, if the rounding
+                breaks a constraint, increases tw, tf, wf or hw one increment
+                at a time until all constraints hold or a bound is reached.
+            Input:
+                dims, pType, AwMin, SMMin, bounds, increment
+            Output:
+                dims: [hw, tw, wf, tf] (mm)
 
             ...assign_sweep...
             Objective:
@@ -3525,12 +6075,16 @@ class Optimizer:
                 self.input
 
     """
+    # Default bounds of the machined profile dimensions (mm)
+    machinedBounds = {'hw': (10.0, 300.0), 'tw': (2.0, 30.0),
+                      'wf': (10.0, 200.0), 'tf': (2.0, 30.0)}
+
     def __init__(self):
         """ Inits the Optimizer object """
         pass
 
     def objective_function(self, objStruct):
-        """ Calls a weight calculator and returns the value """
+        """ Reads the running weight total of the structure and returns it """
         objStruct.calc_total_weight()
         weight = objStruct.weight
         return weight
@@ -3538,124 +6092,969 @@ class Optimizer:
     def constraints(self, objStruct):
         pass
 
+    def governing_reasons(self, propCheck):
+        """ Reason code of the proportion check of each profile, of the first
+            stiffener that fails or 0 when all stiffeners pass.
+        """
+        [passed, reason] = propCheck
+        first = numpy.argmin(passed, axis=0)
+        codes = reason[first, numpy.arange(reason.shape[1])]
+        return numpy.where(passed.all(axis=0), 0, codes)
+
     def sweep_method(self, objVess, objStruct, objRule, objDes, objPlaLib,
                      objStress, minNrStiff, maxNrStiff, panMat, stiffMat, 
-                     extrusions, machined, strakeListID, secListID):
+                     extrusions, machined, strakeListID, secListID, workers=1,
+                     keepBest=None, keepGroups=False, frontierOnly=False):
         """ Loops through choosen set of number of stiffeners, creates the
             topology, structure child objects and calculates the rules. It then
             assigns the recommended plating and loops through a list of
             user-specified profiles from either extrusions or machined or both.
         """
-        
+        if frontierOnly:
+            [extrusions, removedExtr] = ProfileLibrary.prune_dominated(extrusions)
+            [machined, removedMach] = ProfileLibrary.prune_dominated(machined)
+            self.pruned = (removedExtr, removedMach)
+        rows = self.iter_sweep(objVess, objStruct, objRule, objDes, objPlaLib,
+                               objStress, minNrStiff, maxNrStiff, panMat, stiffMat,
+                               extrusions, machined, strakeListID, secListID, workers)
+        if keepBest is not None:
+            return self.select_best(rows, keepBest, keepGroups)
+        return self.collect_sweep(rows)
+
+    def iter_sweep(self, objVess, objStruct, objRule, objDes, objPlaLib,
+                   objStress, minNrStiff, maxNrStiff, panMat, stiffMat,
+                   extrusions, machined, strakeListID, secListID, workers=1):
+        """ Generator version of sweep_method, yields the rows one by one as
+            (0 for extrusions or 1 for machined, SweepRow).
+        """
+        if workers != 1:
+            yield from self.iter_sweep_parallel(objVess, objStruct, objRule, objDes,
+                                                objPlaLib, objStress, minNrStiff,
+                                                maxNrStiff, panMat, stiffMat,
+                                                extrusions, machined, strakeListID,
+                                                secListID, workers)
+        else:
+            # The library data is the same for all numbers of stiffeners
+            profLists = [extrusions, machined]
+            libData = self.sweep_library_arrays(objRule, panMat, stiffMat, profLists,
+                                                objPlaLib)
+            for i in range(minNrStiff, maxNrStiff+1):
+                yield from self.iter_sweep_unit(objVess, objStruct, objRule, objDes,
+                                                objStress, i, panMat, stiffMat, profLists,
+                                                libData, strakeListID, secListID)
+
+        self.assign_last_design(objVess, objStruct, objRule, objDes, objPlaLib,
+                                maxNrStiff, panMat, stiffMat, extrusions, machined,
+                                strakeListID, secListID)
+
+    def assign_last_design(self, objVess, objStruct, objRule, objDes, objPlaLib,
+                           nStiff, panMat, stiffMat, extrusions, machined,
+                           strakeListID, secListID):
+        """ Leaves objStruct with the last design of the sweep, as the sweep
+            did when it assigned every design to objStruct.
+        """
+        objStruct.Panel = []
+        objStruct.Stiffener = []
+        objDes.create_section_topology(objStruct.Strake[strakeListID].sections[secListID],
+                                       objStruct,
+                                       nStiff
+                                       )
+        if not panMat or not stiffMat:
+            return
+        objDes.assign_material_to_all_panels(objStruct, panMat[-1])
+        objDes.assign_material_to_all_stiffeners(objStruct, stiffMat[-1])
+        objDes.evaluate(objRule, objStruct, objVess)
+        objDes.assign_recommended_plates(objStruct, objPlaLib)
+        objProfs = machined or extrusions
+        if objProfs:
+            objStruct.stiffTable.set_column('Profile', objProfs[-1])
+        pass
+
+    def collect_sweep(self, rows):
+        """ Collects the rows of iter_sweep in the two lists of sweep_method. """
         extrWeights = [] # total weight using extrusions
         machWeights = [] # total weight using machined profiles
-        for i in range(minNrStiff, maxNrStiff+1):
-            objStruct.Panel = []
-            objStruct.Stiffener = []
-            objDes.create_section_topology(objStruct.Strake[strakeListID].sections[secListID],
-                                           objStruct, 
-                                           i
-                                           )
-
-            for pm in panMat:
-                objDes.assign_material_to_all_panels(objStruct, pm)
-                for sm in stiffMat:
-                    objDes.assign_material_to_all_stiffeners(objStruct, sm)
-
-                    objDes.calc_pressure_factors(objRule, objStruct, objVess)
-                    objDes.calc_design_pressures(objRule, objStruct, objVess)
-                    objDes.calc_scantling_req(objRule, objStruct, objVess)
-                    objDes.assign_recommended_plates(objStruct, objPlaLib)
-
-                    # TODO: give user option to assign a specific plate to all panels.
-                        # objStruct.Panel[i].assign_plate(LB.mAL5)
-
-                    panWeight = []
-                    for p in range(0, objStruct.Panel.__len__()):
-                        objStruct.Panel[p].calc_weight()
-                        panWeight = panWeight + [objStruct.Panel[p].weight]
-                    panWeight = sum(panWeight)
-
-                    if i != 0: # if the numbers of stiffeners is not zero.
-                        
-                        for profiles in extrusions:
-
-                            stiffWeight = []
-                            for j in range(0, objStruct.Stiffener.__len__()):
-                                objStruct.Stiffener[j].assign_profile(profiles)
-                                objStruct.Stiffener[j].calc_weight()
-                                stiffWeight = stiffWeight + [objStruct.Stiffener[j].weight]
-                            stiffWeight = sum(stiffWeight)
-                            
-                            objDes.calc_stiff_max_prop(objStress, objStruct, objRule)
-                            # TODO: add pass and fail to report
-                            
-                            ratSM = []
-                            ratAw = []
-                            for a in range(0, objStruct.Stiffener.__len__()):
-                                ratSM = [profiles.SM/objStruct.Stiffener[a].SMMin]
-                                ratAw = [profiles.Aw/objStruct.Stiffener[a].AwMin]
-                            ratSM = min(ratSM)
-                            ratAw = min(ratAw)
-
-                            weightEProf = [i,
-                                           objStruct.Panel[0].Material.matLabel,
-                                           objStruct.Stiffener[0].Material.matLabel,
-                                           objStruct.Panel[0].Plate.tp,
-                                           profiles.profLabel, profiles.SM, profiles.Aw,
-                                           objStruct.Stiffener[0].SMMin,
-                                           objStruct.Stiffener[0].AwMin,
-                                           ratSM, ratAw,
-                                           stiffWeight, panWeight,
-                                           self.objective_function(objStruct)]
-
-                            extrWeights = extrWeights + [weightEProf]
-
-                        for profiles in machined:
-
-                            stiffWeight = []
-                            for k in range(0, objStruct.Stiffener.__len__()):
-                                objStruct.Stiffener[k].assign_profile(profiles)
-                                objStruct.Stiffener[k].calc_weight()
-                                stiffWeight = stiffWeight + [objStruct.Stiffener[k].weight]
-                            stiffWeight = sum(stiffWeight)
-                            
-                            objDes.calc_stiff_max_prop(objStress, objStruct, objRule)
-                            # TODO: add pass and fail to report
-
-                            ratSM = profiles.SM/objStruct.Stiffener[0].SMMin
-                            ratAw = profiles.Aw/objStruct.Stiffener[0].AwMin
-
-                            weightMProf = [i,
-                                           objStruct.Panel[0].Material.matLabel,
-                                           objStruct.Stiffener[0].Material.matLabel,
-                                           objStruct.Panel[0].Plate.tp,
-                                           profiles.profLabel, profiles.SM, profiles.Aw,
-                                           objStruct.Stiffener[0].SMMin,
-                                           objStruct.Stiffener[0].AwMin,
-                                           ratSM, ratAw,
-                                           stiffWeight, panWeight,
-                                           self.objective_function(objStruct)]
-                            machWeights = machWeights + [weightMProf]
-                            
-                    else: # if there are no stiffeners
-                        weightPan = [i, objStruct.Panel[0].Material.matLabel,
-                                     '-',
-                                     objStruct.Panel[0].Plate.tp,
-                                     'None',0,0,0,0,0,0,0,
-                                     panWeight,
-                                     self.objective_function(objStruct)]
-                        extrWeights = extrWeights + [weightPan]
-                        machWeights= machWeights + [weightPan]
+        for listIndex, row in rows:
+            (extrWeights, machWeights)[listIndex].append(row)
+        return (extrWeights, machWeights)
 
+    def is_feasible(self, row):
+        """ True if the row meets the plate, SM, Aw and proportion
+            requirements.
+        """
+        if row.plateCheck != 'OK':
+            return False
+        if row.nStiff == 0:
+            return True
+        return row.SMRat >= 1 and row.AwRat >= 1 and row.propCheck == 'OK'
+
+    def select_best(self, rows, keepBest, keepGroups=False):
+        """ Keeps the keepBest lightest feasible rows of each list, or of each
+            group of number of stiffeners and materials, in bounded heaps.
+        """
+        heaps = OrderedDict()
+        for order, (listIndex, row) in enumerate(rows):
+            if not self.is_feasible(row):
+                continue
+            key = (listIndex,)
+            if keepGroups:
+                key = (listIndex, row.nStiff, row.panMat, row.stiffMat)
+            heap = heaps.setdefault(key, [])
+            # The root is the worst kept row: the heaviest, and of equal
+            # weights the latest, so ties keep the first rows of the sweep.
+            entry = (-row.totalWeight, -order, row)
+            if len(heap) < keepBest:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        extrWeights = []
+        machWeights = []
+        for key, heap in heaps.items():
+            best = [row for weight, order, row in sorted(heap, reverse=True)]
+            (extrWeights, machWeights)[key[0]].extend(best)
         return (extrWeights, machWeights)
 
+    def sweep_parallel(self, objVess, objStruct, objRule, objDes, objPlaLib,
+                       objStress, minNrStiff, maxNrStiff, panMat, stiffMat,
+                       extrusions, machined, strakeListID, secListID, workers=None):
+        """ Parallel version of sweep_method, one work unit per number of
+            stiffeners and panel material on a pool of processes.
+        """
+        return self.collect_sweep(self.iter_sweep_parallel(objVess, objStruct, objRule,
+                                                           objDes, objPlaLib, objStress,
+                                                           minNrStiff, maxNrStiff, panMat,
+                                                           stiffMat, extrusions, machined,
+                                                           strakeListID, secListID,
+                                                           workers))
+
+    def iter_sweep_parallel(self, objVess, objStruct, objRule, objDes, objPlaLib,
+                            objStress, minNrStiff, maxNrStiff, panMat, stiffMat,
+                            extrusions, machined, strakeListID, secListID, workers=None):
+        """ Generator version of sweep_parallel. The numeric data is published
+            once in shared memory, the tasks only carry its descriptor and the
+            indices of the unit.
+        """
+        objCtx = objRule.get_rule_context(objVess)
+        profLists = [extrusions, machined]
+        [panMats, stiffMats, profSets, thicknesses, lastTP] = self.sweep_library_arrays(
+            objRule, panMat, stiffMat, profLists, objPlaLib)
+
+        # The topologies are built on a scratch structure, objStruct is not changed
+        objTopo = Structure(objVess)
+        objSect = objStruct.Strake[strakeListID].sections[secListID]
+        panTopo = []
+        stiffTopo = []
+        for i in range(minNrStiff, maxNrStiff+1):
+            objTopo.Panel = []
+            objTopo.Stiffener = []
+            objDes.create_section_topology(objSect, objTopo, i)
+            panTopo.append(numpy.array(objRule.measure_panels(objTopo)
+                                       + [objTopo.panTable.column('area')], dtype=float))
+            stiffTopo.append(numpy.array(objRule.measure_stiffeners(objTopo),
+                                         dtype=float).reshape(6, -1))
+
+        arrays = {'panTopo': numpy.hstack(panTopo),
+                  'panOffsets': numpy.cumsum([0] + [t.shape[1] for t in panTopo]),
+                  'stiffTopo': numpy.hstack(stiffTopo),
+                  'stiffOffsets': numpy.cumsum([0] + [t.shape[1] for t in stiffTopo]),
+                  'panMats': panMats,
+                  'stiffMats': stiffMats,
+                  'extrusions': profSets[0],
+                  'machined': profSets[1],
+                  'thicknesses': thicknesses,
+                  'lastTP': lastTP}
+
+        with SharedArrays.create(arrays) as objShared:
+            descriptor = objShared.descriptor()
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            futures = []
+            try:
+                units = [(unit, nStiff, k)
+                         for unit, nStiff in enumerate(range(minNrStiff, maxNrStiff+1))
+                         for k in range(0, len(panMat))]
+                for unit, nStiff, k in units:
+                    # A staticmethod, so the task does not carry the Optimizer
+                    futures.append(executor.submit(Optimizer.sweep_unit_shared, descriptor,
+                                                   objCtx, objRule.designCategory, unit, k))
+
+                # Yielded in submission order, which is the order of sweep_method
+                for (unit, nStiff, k), future in zip(units, futures):
+                    yield from self.iter_sweep_rows(nStiff, [panMat[k]], stiffMat,
+                                                    profLists, future.result(), objRule)
+            finally:
+                # When the iteration is stopped early the units that have not
+                # started are cancelled, only the running ones are waited for
+                # before the shared memory is unlinked. Cancelled one by one,
+                # shutdown(cancel_futures=True) needs Python 3.9.
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
+    @staticmethod
+    def sweep_unit_shared(descriptor, objCtx, designCategory, unit, panIndex):
+        """ Work unit of sweep_parallel, runs in a worker process on the
+            arrays published in shared memory.
+        """
+        objShared = SharedArrays.attach(descriptor)
+        try:
+            # The results are new arrays, no views of the shared block
+            return Optimizer().sweep_unit_arrays(
+                ISO12215(designCategory), StressCalculator(), objCtx,
+                *Optimizer.shared_unit_inputs(objShared.arrays, unit, panIndex))
+        finally:
+            objShared.close()
+
+    @staticmethod
+    def shared_unit_inputs(arrays, unit, panIndex):
+        """ Topology and library data of a work unit, as views of the shared
+            arrays.
+        """
+        [panStart, panEnd] = arrays['panOffsets'][unit:unit+2]
+        [stiffStart, stiffEnd] = arrays['stiffOffsets'][unit:unit+2]
+        panTopo = list(arrays['panTopo'][:, panStart:panEnd])
+        stiffTopo = list(arrays['stiffTopo'][:, stiffStart:stiffEnd])
+        libData = [arrays['panMats'][:, [panIndex]], arrays['stiffMats'],
+                   [arrays['extrusions'], arrays['machined']],
+                   arrays['thicknesses'], arrays['lastTP']]
+        return [panTopo, stiffTopo, libData]
+
+    def iter_sweep_unit(self, objVess, objStruct, objRule, objDes, objStress, nStiff,
+                        panMat, stiffMat, profLists, libData, strakeListID, secListID):
+        """ Sweeps all materials and profiles for one number of stiffeners and
+            yields the rows. Every rule stage is evaluated once for the inputs
+            it depends on.
+        """
+        objStruct.Panel = []
+        objStruct.Stiffener = []
+        objDes.create_section_topology(objStruct.Strake[strakeListID].sections[secListID],
+                                       objStruct,
+                                       nStiff
+                                       )
+
+        panTopo = objRule.measure_panels(objStruct) + [objStruct.panTable.column('area')]
+        stiffTopo = objRule.measure_stiffeners(objStruct)
+        results = self.sweep_unit_arrays(objRule, objStress,
+                                         objRule.get_rule_context(objVess),
+                                         panTopo, stiffTopo, libData)
+        yield from self.iter_sweep_rows(nStiff, panMat, stiffMat, profLists, results, objRule)
+
+    def sweep_library_arrays(self, objRule, panMat, stiffMat, profLists, objPlaLib):
+        """ Numeric data of the materials, profiles and plates of a sweep. """
+        panMats = numpy.array([[m.tensileStrength for m in panMat],
+                               [m.yieldStrength for m in panMat],
+                               [m.density for m in panMat]], dtype=float).reshape(3, -1)
+        stiffMats = numpy.array([[m.yieldStrength for m in stiffMat],
+                                 [m.density for m in stiffMat]], dtype=float).reshape(2, -1)
+        profSets = [numpy.array(objRule.measure_profiles(objProfs), dtype=float).reshape(8, -1)
+                    for objProfs in profLists]
+        thicknesses = objPlaLib.thickness_index()[0]
+        lastTP = numpy.array([objPlaLib.Plates[-1].tp], dtype=float)
+        return [panMats, stiffMats, profSets, thicknesses, lastTP]
+
+    def select_plate_thickness(self, minTP, thicknesses, lastTP):
+        """ Closest available thickness rounded up, as
+            Designer.assign_recommended_plates, for arrays of panels.
+        """
+        pos = numpy.searchsorted(thicknesses, minTP, side='left')
+        pos = numpy.where(numpy.isnan(minTP), 0, pos)
+        found = thicknesses[numpy.minimum(pos, len(thicknesses) - 1)]
+        outOfRange = pos == len(thicknesses)
+        return [numpy.where(outOfRange, lastTP[0], found), outOfRange]
+
+    def sweep_unit_arrays(self, objRule, objStress, objCtx, panTopo, stiffTopo, libData):
+        """ Numeric part of a sweep unit: rule stages, plates, weights, ratios
+            and proportion checks of one topology for all materials and profiles.
+        """
+        [b, lPan, xPos, zPos, location, area] = panTopo
+        [panMats, stiffMats, profSets, thicknesses, lastTP] = libData
+        [tensile, yieldPan, densityPan] = panMats
+        [yieldStiff, densityStiff] = stiffMats
+
+        """ Pressures only depend on the topology and the vessel """
+        PressFact = objRule.calc_panel_pressure_factors_array([b, lPan, xPos, zPos, location],
+                                                              objCtx)
+        [ruleType, kL, kAR_d, kAR_p, AD, kZ] = PressFact
+        [ruleType, pMax] = objRule.calc_design_pressures_array([kL, kAR_d, kAR_p, kZ, location],
+                                                               objCtx)
+
+        """ Stiffener requirements only depend on the stiffener material """
+        stiffStages = []
+        if len(stiffTopo[0]) != 0:
+            [lStiff, xPosStiff, zPosStiff, sStiff, locStiff, stiffType] = stiffTopo
+            PressFact = objRule.calc_stiff_pressure_factors_array(stiffTopo, objCtx)
+            [ruleType, kL, kAR_d, kAR_p, AD, kZ] = PressFact
+            [ruleType, pMaxStiff] = objRule.calc_design_pressures_array(
+                [kL, kAR_d, kAR_p, kZ, locStiff], objCtx)
+            for l in range(0, len(yieldStiff)):
+                [ruleType, AwMin, SMMin] = objRule.calc_stiff_req_array(
+                    [pMaxStiff, lStiff, sStiff, yieldStiff[l]])
+                fits = []
+                for [Aw, SM, Atot, profType, hw, tw, wf, tf] in profSets:
+                    [ratAw, ratSM] = objRule.calc_profile_ratios([AwMin, SMMin, Aw, SM])
+                    # Weight of all stiffeners for each profile, as calc_stiffener_weights
+                    stiffWeight = numpy.nansum(lStiff[:, numpy.newaxis]*1e-3 * Atot*1e-6
+                                               * densityStiff[l], axis=0)
+                    fits.append([ratAw, ratSM, stiffWeight])
+                stiffStages.append([AwMin, SMMin, fits])
+
+        results = []
+        for k in range(0, len(yieldPan)):
+            """ Panel requirements and plates only depend on the panel material """
+            PanReq = objRule.calc_panel_req_array([pMax, b, lPan, location, tensile[k],
+                                                   yieldPan[k], yieldPan[k]], objCtx)
+            [tp, outOfRange] = self.select_plate_thickness(
+                numpy.maximum(PanReq[5], PanReq[6]), thicknesses, lastTP)
+            panWeight = numpy.nansum(area * tp*1e-3 * densityPan[k])
+
+            stiffResults = []
+            if stiffStages:
+                # The stiffener stresses depend on the plates, not on the material
+                tpGov = numpy.nanmin(tp)
+                stress = [objStress.calc_stiff_stress_kernel(
+                              [tpGov, sStiff[:, numpy.newaxis], lStiff[:, numpy.newaxis],
+                               pMaxStiff[:, numpy.newaxis], profType, hw, tw, wf, tf])
+                          for [Aw, SM, Atot, profType, hw, tw, wf, tf] in profSets]
+
+                for l, [AwMin, SMMin, fits] in enumerate(stiffStages):
+                    profResults = []
+                    for profData, sigma, [ratAw, ratSM, stiffWeight] in zip(profSets, stress, fits):
+                        [Aw, SM, Atot, profType, hw, tw, wf, tf] = profData
+                        # Proportion check of stiffeners x profiles
+                        propCheck = objRule.check_stiff_prop_array(
+                            [yieldStiff[l], Aw, AwMin[:, numpy.newaxis],
+                             sigma, profType, hw, tw, wf, tf])
+                        # The governing stiffener has the lowest ratio
+                        profResults.append([ratSM.min(axis=0), ratAw.min(axis=0),
+                                            stiffWeight, self.governing_reasons(propCheck)])
+                    stiffResults.append([SMMin.max(), AwMin.max(), profResults])
+
+            results.append([tp[0], panWeight, stiffResults, outOfRange.any()])
+        return results
+
+    def iter_sweep_rows(self, nStiff, panMat, stiffMat, profLists, results, objRule):
+        """ Yields the rows of sweep_method from the results of
+            sweep_unit_arrays.
+        """
+        for pm, [tp, panWeight, stiffResults, outOfRange] in zip(panMat, results):
+            plateCheck = 'Out of range' if outOfRange else 'OK'
+            if nStiff == 0: # if there are no stiffeners
+                for sm in stiffMat:
+                    weightPan = SweepRow(nStiff, pm.matLabel, '-', tp,
+                                         'None',0,0,0,0,0,0,0,
+                                         panWeight,
+                                         panWeight,
+                                         '-', plateCheck)
+                    yield (0, weightPan)
+                    yield (1, weightPan)
+                continue
+
+            for sm, [SMMinGov, AwMinGov, profResults] in zip(stiffMat, stiffResults):
+                for listIndex, objProfs, [ratSM, ratAw, stiffWeight, reasons] in zip(
+                        (0, 1), profLists, profResults):
+                    for j, profiles in enumerate(objProfs):
+                        yield (listIndex, SweepRow(nStiff, pm.matLabel, sm.matLabel, tp,
+                                                   profiles.profLabel, profiles.SM,
+                                                   profiles.Aw, SMMinGov, AwMinGov,
+                                                   ratSM[j], ratAw[j], stiffWeight[j],
+                                                   panWeight, stiffWeight[j] + panWeight,
+                                                   objRule.propReasons[reasons[j]],
+                                                   plateCheck))
+
+    def pareto_method(self, objSweep):
+        """ Non-dominated fronts of the extrusion and machined rows of a sweep
+            over weight, section modulus ratio, web area ratio and number of
+            stiffeners.
+        """
+        return tuple(self.pareto_front(rows) for rows in objSweep)
+
+    def pareto_front(self, rows):
+        """ Non-dominated rows of a sweep, sorted by total weight. """
+        objectives = self.pareto_objectives(rows)
+        indices = self.pareto_indices(objectives)
+        order = numpy.argsort(objectives[indices, 0], kind='stable')
+        return [rows[i] for i in indices[order]]
+
+    def pareto_objectives(self, rows):
+        """ Objectives of the sweep rows as an N x 4 array, all minimised. """
+        objectives = numpy.array([[row[13], -row[9], -row[10], row[0]] for row in rows],
+                                 dtype=float).reshape(-1, 4)
+        # Rows without a result are never better than the others
+        objectives[numpy.isnan(objectives)] = numpy.inf
+        return objectives
+
+    def pareto_indices(self, objectives):
+        """ Indices of the non-dominated rows of N x 4 objectives, from a sort
+            on the first objective and a Fenwick tree sweep over the others.
+            O(n log n log k), k distinct values of the last objective.
+        """
+        onFront = numpy.zeros(len(objectives), dtype=bool)
+        if len(objectives) == 0:
+            return numpy.flatnonzero(onFront)
+
+        # Equal rows do not dominate each other, so the front is found on the
+        # unique rows, which numpy.unique also sorts on the first objective.
+        unique, inverse = numpy.unique(objectives, axis=0, return_inverse=True)
+        levels, rank4 = numpy.unique(unique[:, 3], return_inverse=True)
+        rank4 = rank4.reshape(-1)
+        nLevels = len(levels)
+
+        # Outer Fenwick tree over the ranks of the last objective, node t
+        # covers the ranks t - (t & -t) to t - 1. Each node has an inner
+        # Fenwick tree of prefix minima of the 3rd objective over the sorted
+        # values of the 2nd objective of the rows it covers.
+        order = numpy.argsort(rank4, kind='stable')
+        bounds = numpy.searchsorted(rank4[order], numpy.arange(nLevels + 1))
+        coords = [None]
+        trees = [None]
+        for t in range(1, nLevels + 1):
+            rows = order[bounds[t - (t & -t)]:bounds[t]]
+            coords.append(numpy.unique(unique[rows, 1]).tolist())
+            trees.append([math.inf] * (len(coords[t]) + 1))
+
+        uniqueFront = numpy.zeros(len(unique), dtype=bool)
+        for i, (f1, f2, f3, f4), r4 in zip(range(len(unique)), unique.tolist(),
+                                           rank4.tolist()):
+            # All rows before this one have a lower or equal first objective,
+            # it is dominated if one of them on the front has lower or equal
+            # other objectives.
+            dominated = False
+            t = r4 + 1
+            while t > 0 and not dominated:
+                tree = trees[t]
+                pos = bisect_right(coords[t], f2)
+                while pos > 0:
+                    if tree[pos] <= f3:
+                        dominated = True
+                        break
+                    pos -= pos & -pos
+                t -= t & -t
+            if dominated:
+                continue
+
+            uniqueFront[i] = True
+            t = r4 + 1
+            while t <= nLevels:
+                tree = trees[t]
+                size = len(tree)
+                pos = bisect_left(coords[t], f2) + 1
+                while pos < size:
+                    if f3 < tree[pos]:
+                        tree[pos] = f3
+                    pos += pos & -pos
+                t += t & -t
+
+        return numpy.flatnonzero(uniqueFront[inverse.reshape(-1)])
+
+    def machined_method(self, objVess, objStruct, objRule, objDes, nStiff, objMat,
+                        pType, strakeListID, secListID, bounds=None, increment=0.5):
+        """ Dimensions of the lightest machined profile of a section, solved
+            with SLSQP and snapped up to the manufacturing increment.
+        """
+        if scipyOptimize is None:
+            raise ImportError('Optimizer.machined_method requires scipy')
+        if pType not in ('Flat Bar', 'T-shaped', 'L-shaped'):
+            raise ValueError("pType must be 'Flat Bar', 'T-shaped' or 'L-shaped'")
+        if bounds is None:
+            bounds = self.machinedBounds
+        names = ['hw', 'tw'] if pType == 'Flat Bar' else ['hw', 'tw', 'wf', 'tf']
+        bounds = [bounds[name] for name in names]
+
+        [AwMin, SMMin, lTot] = self.machined_requirements(objVess, objStruct, objRule,
+                                                          objDes, nStiff, objMat,
+                                                          strakeListID, secListID)
+
+        def constraints(x):
+            return self.machined_constraints(self.machined_dims(x, pType), pType,
+                                             AwMin, SMMin)
+
+        def area(x):
+            [hw, tw, wf, tf] = self.machined_dims(x, pType)
+            return tw*hw + tf*wf
+
+        # Start from the largest profile, which is feasible in most cases
+        x0 = numpy.array([upper for lower, upper in bounds], dtype=float)
+        result = scipyOptimize.minimize(area, x0, method='SLSQP', bounds=bounds,
+                                        constraints=[{'type': 'ineq', 'fun': constraints}])
+
+        [hw, tw, wf, tf] = self.snap_machined(self.machined_dims(result.x, pType), pType,
+                                              AwMin, SMMin, bounds, increment)
+        objProf = self.create_machined(hw, tw, wf, tf, pType)
+        stiffWeight = lTot*1e-3 * objProf.Atot*1e-6 * objMat.density
+        feasible = bool((self.machined_constraints([hw, tw, wf, tf], pType,
+                                                   AwMin, SMMin) >= 0).all())
+        return [objProf, stiffWeight, SMMin, AwMin, feasible]
+
+    def machined_requirements(self, objVess, objStruct, objRule, objDes, nStiff,
+                              objMat, strakeListID, secListID):
+        """ Governing requirements and total stiffener length of a section. """
+        objTopo = Structure(objVess)
+        objDes.create_section_topology(objStruct.Strake[strakeListID].sections[secListID],
+                                       objTopo, nStiff)
+        objCtx = objRule.get_rule_context(objVess)
+        stiffTopo = objRule.measure_stiffeners(objTopo)
+        [lStiff, xPos, zPos, sStiff, location, stiffType] = stiffTopo
+        if len(lStiff) == 0:
+            raise ValueError('the section has no stiffeners, nStiff must be > 0')
+        [ruleType, kL, kAR_d, kAR_p, AD, kZ] = objRule.calc_stiff_pressure_factors_array(
+            stiffTopo, objCtx)
+        [ruleType, pMax] = objRule.calc_design_pressures_array([kL, kAR_d, kAR_p, kZ, location],
+                                                               objCtx)
+        [ruleType, AwMin, SMMin] = objRule.calc_stiff_req_array([pMax, lStiff, sStiff,
+                                                                 objMat.yieldStrength])
+        # All stiffeners get the same profile, the largest requirement governs
+        return [AwMin.max(), SMMin.max(), lStiff.sum()]
+
+    def machined_dims(self, x, pType):
+        """ [hw, tw, wf, tf] of the design variables. """
+        if pType == 'Flat Bar':
+            return [x[0], x[1], 0.0, 0.0]
+        return list(x)
+
+    def machined_constraints(self, dims, pType, AwMin, SMMin):
+        """ Constraints of a machined profile, feasible when all >= 0. """
+        [hw, tw, wf, tf] = dims
+        objProf = self.create_machined(hw, tw, wf, tf, pType)
+        cons = [objProf.SM / SMMin - 1, objProf.Aw / AwMin - 1]
+        if pType == 'Flat Bar':
+            cons.append(12*tw - hw)
+        else:
+            d = (wf - tw)/2 if pType == 'T-shaped' else wf - tw
+            # hw/tw <= 40 passes both stress cases, since kAS >= 1
+            cons += [40*tw - hw, 12*tf - d, d]
+        return numpy.array(cons)
+
+    def snap_machined(self, dims, pType, AwMin, SMMin, bounds, increment):
+        """ Rounds the dimensions up to the increment and repairs the
+            constraints that the rounding breaks.
+        """
+        dims = [math.ceil(round(dim / increment, 6)) * increment for dim in dims]
+        upper = [b[1] for b in bounds] + [0.0]*(4 - len(bounds))
+        for i in range(0, 1000):
+            cons = self.machined_constraints(dims, pType, AwMin, SMMin)
+            if (cons >= 0).all():
+                break
+            # Index in [hw, tw, wf, tf] of the dimension to increase
+            if cons[2] < 0:
+                step = 1    # web too slender, tw
+            elif pType != 'Flat Bar' and cons[3] < 0:
+                step = 3    # flange too slender, tf
+            elif pType != 'Flat Bar' and cons[4] < 0:
+                step = 2    # flange narrower than the web, wf
+            else:
+                step = 0    # section modulus or web area too small, hw
+            if dims[step] + increment > upper[step]:
+                break
+            dims[step] += increment
+        return dims
+
+    def create_machined(self, hw, tw, wf, tf, pType):
+        """ Machined profile object of the dimensions. """
+        if pType == 'Flat Bar':
+            label = '%s %g x %g' % (pType, hw, tw)
+        else:
+            label = '%s %g x %g / %g x %g' % (pType, hw, tw, wf, tf)
+        return Machined(label, tw, hw, tf, wf, pType)
 
     def assign_sweep(self, objSweep):
         """ Assigns a optimization object as attribute to self (opti object). """
         self.sweep = objSweep
         pass
 
+class EvolutionaryOptimizer:
+    """ Optimization of several sections at once. Each section is encoded
+        as five integer genes [nStiff, panel material, stiffener material,
+        plate, profile], where plate is one of the distinct thicknesses of
+        the plating library, used for all panels of the section.
+
+        Every generation the population is evaluated with the array rule
+        kernels. The designs of a section with the same number of stiffeners
+        are evaluated together as designs x members arrays. The design
+        pressures only depend on the topology, so setup evaluates them once
+        per section and number of stiffeners. The SM, Aw, proportion and
+        plate thickness constraints are handled with a penalty on the
+        weight. Runs with the same seed give the same result.
+
+        With exhaustive=True every combination of gene values is evaluated
+        with the same kernels instead, and the exact best design is taken.
+        That grows with the product of the gene ranges, as a sweep of every
+        section over all plates, so it is meant for small problems and to
+        check the evolution.
+
+        Attributes:
+            ...__init__...
+            Objective:
+                Inits the optimizer with its settings.
+            Input:
+                popSize: Number of designs in the population (int)
+                generations: Generation budget (int)
+                mutationRate: Chance that a gene is redrawn (float, None for
+                              one gene per design on average)
+                eliteSize: Number of best designs kept unchanged (int)
+                penalty: Weight added per unit of constraint violation (float, kg)
+                shareMaterials: If True all sections use the panel and
+                                stiffener material of the first section (bool)
+                exhaustive: If True evaluates all gene values instead of
+                            evolving a population (bool)
+                seed: Seed of the random number generator (int or None)
+            Output:
+                self
+
+            ...setup...
+            Objective:
+                Builds the topology of every section for each number of
+                stiffeners and collects the library data of the genes.
+            Input:
+                objVess, objStruct, objRule, objDes, objPlaLib, objStress:
+                    As Optimizer.sweep_method
+                sections: List of (strakeID, sectionID) (tuples of int)
+                minNrStiff, maxNrStiff: Range of number of stiffeners (int)
+                panMat, stiffMat: Lists of material objects
+                profiles: List of profile objects (extrusions and/or machined)
+            Output:
+                self.topologies: Per section and number of stiffeners, see
+                                 measure_topology
+                self.upper: Number of values of each gene (S x 5 int array)
+
+            ...measure_topology...
+            Objective:
+                Measures the members of a topology and evaluates their design
+                pressures.
+            Input:
+                objRule, objCtx: RuleContext
+                objTopo: Structure with the topology of one section
+            Output:
+                [panTopo, stiffTopo]:
+                    panTopo: [pMax, b, lPan, location, area] of the panels
+                    stiffTopo: [pMax, lStiff, sStiff] of the stiffeners,
+                               None without stiffeners
+
+            ...evaluate_section...
+            Objective:
+                Evaluates designs of one section with the array kernels.
+                The violation is the sum of max(0, 1 - ratSM),
+                max(0, 1 - ratAw), 1 for a failing proportion check and
+                max(0, 1 - tp / tpMin), where tpMin is the largest
+                max(tReq, tMin) of the panels.
+            Input:
+                s: Section index (int)
+                genes: D x 5 array of genes (int)
+            Output:
+                [weight, violation, tp, ratSM, ratAw, reason, thin] (arrays
+                of length D), thin is True when the plate is thinner than
+                tpMin
+
+            ...shared_genes...
+            Objective:
+                With shareMaterials, copies the material genes of the first
+                section to the other sections.
+            Input:
+                population: ... x S x 5 array of genes (int)
+            Output:
+                population
+
+            ...evaluate...
+            Objective:
+                Evaluates a population, each distinct design of a section
+                only once.
+            Input:
+                population: P x S x 5 array of genes (int)
+            Output:
+                [fitness, weight, violation] (arrays of length P), where
+                fitness = weight + penalty * violation summed over all
+                sections.
+                self.evaluations: Number of section designs evaluated (int)
+
+            ...evolve...
+            Objective:
+                Runs the generations: tournament selection, uniform
+                crossover, random reset mutation and elitism.
+            Input:
+                -
+            Output:
+                [best, fitness]: genes of the best design and its fitness
+                self.history: Best fitness of each generation
+
+            ...exhaustive_search...
+            Objective:
+                Evaluates all gene values of every section and takes the
+                exact best design. With shareMaterials the material pair
+                with the lowest sum of the best fitness of each section.
+            Input:
+                -
+            Output:
+                [best, fitness]: genes of the best design and its fitness
+                self.history: [fitness]
+
+            ...optimize...
+            Objective:
+                setup and evolve, or exhaustive_search, in one call.
+            Input:
+                As setup
+            Output:
+                Rows of the best design, see decode
+
+            ...decode...
+            Objective:
+                Rows of a design, one per section.
+            Input:
+                genes: S x 5 array of genes (int)
+            Output:
+                rows[0:S]:
+                    [0]: Number of stiffeners (int)
+                    [1]: Panel material (string)
+                    [2]: Stiffener material (string)
+                    [3]: Plating thickness (float, mm)
+                    [4]: Profile (string)
+                    [5]: Lowest section modulus ratio (float, -)
+                    [6]: Lowest web area ratio (float, -)
+                    [7]: Total weight for section (float, kg)
+                    [8]: Proportion check, 'OK' or the reason it fails (string)
+                    [9]: Plate check, 'OK' or 'Too thin' (string)
+    """
+    def __init__(self, popSize=60, generations=100, mutationRate=None, eliteSize=2,
+                 penalty=1e3, shareMaterials=False, exhaustive=False, seed=None):
+        """ Inits the EvolutionaryOptimizer object """
+        self.popSize = popSize
+        self.generations = generations
+        self.mutationRate = mutationRate
+        self.eliteSize = eliteSize
+        self.penalty = penalty
+        self.shareMaterials = shareMaterials
+        self.exhaustive = exhaustive
+        self.seed = seed
+        self.topologies = []
+        self.history = []
+        self.evaluations = 0
+
+    def setup(self, objVess, objStruct, objRule, objDes, objPlaLib, objStress,
+              sections, minNrStiff, maxNrStiff, panMat, stiffMat, profiles):
+        """ Builds the topologies and the library data of the genes. """
+        self.objRule = objRule
+        self.objStress = objStress
+        self.objCtx = objRule.get_rule_context(objVess)
+        self.nStiffs = list(range(minNrStiff, maxNrStiff+1))
+        self.panMat = panMat
+        self.stiffMat = stiffMat
+        self.profiles = profiles
+        [self.panMats, self.stiffMats, [self.profData], self.thicknesses,
+         lastTP] = Optimizer().sweep_library_arrays(objRule, panMat, stiffMat, [profiles],
+                                                    objPlaLib)
+
+        objTopo = Structure(objVess)
+        self.topologies = []
+        for strakeListID, secListID in sections:
+            objSect = objStruct.Strake[strakeListID].sections[secListID]
+            topologies = []
+            for nStiff in self.nStiffs:
+                objTopo.Panel = []
+                objTopo.Stiffener = []
+                objDes.create_section_topology(objSect, objTopo, nStiff)
+                topologies.append(self.measure_topology(objRule, self.objCtx, objTopo))
+            self.topologies.append(topologies)
+
+        shape = [len(self.nStiffs), len(panMat), len(stiffMat), len(self.thicknesses),
+                 len(profiles)]
+        self.upper = numpy.tile(numpy.array(shape), (len(sections), 1))
+        self.evaluations = 0
+        pass
+
+    def measure_topology(self, objRule, objCtx, objTopo):
+        """ Member data and design pressures of a topology. """
+        # Copies, the columns of objTopo are reused for the next topology
+        panData = [numpy.array(value, dtype=float) for value in objRule.measure_panels(objTopo)]
+        [b, lPan, xPos, zPos, location] = panData
+        [ruleType, kL, kAR_d, kAR_p, AD, kZ] = objRule.calc_panel_pressure_factors_array(
+            panData, objCtx)
+        [ruleType, pMax] = objRule.calc_design_pressures_array([kL, kAR_d, kAR_p, kZ, location],
+                                                               objCtx)
+        panTopo = [pMax, b, lPan, location, numpy.array(objTopo.panTable.column('area'))]
+
+        stiffTopo = None
+        if len(objTopo.Stiffener) != 0:
+            stiffData = [numpy.array(value, dtype=float)
+                         for value in objRule.measure_stiffeners(objTopo)]
+            [lStiff, xPos, zPos, sStiff, location, stiffType] = stiffData
+            [ruleType, kL, kAR_d, kAR_p, AD, kZ] = objRule.calc_stiff_pressure_factors_array(
+                stiffData, objCtx)
+            [ruleType, pMax] = objRule.calc_design_pressures_array(
+                [kL, kAR_d, kAR_p, kZ, location], objCtx)
+            stiffTopo = [pMax, lStiff, sStiff]
+        return [panTopo, stiffTopo]
+
+    def evaluate_section(self, s, genes):
+        """ Weight, constraint violation and results of designs of a section. """
+        objRule = self.objRule
+        [tensile, yieldPan, densityPan] = self.panMats
+        [yieldStiff, densityStiff] = self.stiffMats
+        [Aw, SM, Atot, profType, hw, tw, wf, tf] = self.profData
+        genes = numpy.asarray(genes).reshape(-1, 5)
+        self.evaluations += len(genes)
+
+        tp = self.thicknesses[genes[:, 3]]
+        weight = numpy.zeros(len(genes))
+        violation = numpy.zeros(len(genes))
+        # Without stiffeners there are no stiffener constraints
+        ratSM = numpy.full(len(genes), numpy.inf)
+        ratAw = numpy.full(len(genes), numpy.inf)
+        reason = numpy.zeros(len(genes), dtype=int)
+        thin = numpy.zeros(len(genes), dtype=bool)
+        for n in numpy.unique(genes[:, 0]):
+            rows = numpy.flatnonzero(genes[:, 0] == n)
+            [panTopo, stiffTopo] = self.topologies[s][n]
+            [pMax, b, lPan, location, area] = panTopo
+
+            """ Panel requirements of designs x panels """
+            k = genes[rows, 1]
+            kCol = k[:, numpy.newaxis]
+            PanReq = objRule.calc_panel_req_array([pMax, b, lPan, location, tensile[kCol],
+                                                   yieldPan[kCol], yieldPan[kCol]], self.objCtx)
+            tpMin = numpy.fmax(PanReq[5], PanReq[6]).max(axis=1)
+            thin[rows] = tp[rows] < tpMin
+            violation[rows] += numpy.maximum(0.0, 1.0 - tp[rows] / tpMin)
+            # As calc_panel_weights with the same plate on all panels
+            weight[rows] += numpy.nansum(area) * tp[rows]*1e-3 * densityPan[k]
+
+            if stiffTopo is None:
+                continue
+
+            """ Stiffener requirements, ratios and proportions of designs x stiffeners """
+            [pMaxStiff, lStiff, sStiff] = stiffTopo
+            l = genes[rows, 2]
+            m = genes[rows, 4]
+            lCol = l[:, numpy.newaxis]
+            mCol = m[:, numpy.newaxis]
+            [ruleType, AwMin, SMMin] = objRule.calc_stiff_req_array(
+                [pMaxStiff, lStiff, sStiff, yieldStiff[lCol]])
+            ratSM[rows] = (SM[mCol] / SMMin).min(axis=1)
+            ratAw[rows] = (Aw[mCol] / AwMin).min(axis=1)
+            weight[rows] += numpy.nansum(lStiff)*1e-3 * Atot[m]*1e-6 * densityStiff[l]
+
+            sigma = self.objStress.calc_stiff_stress_kernel(
+                [tp[rows][:, numpy.newaxis], sStiff, lStiff, pMaxStiff, profType[mCol],
+                 hw[mCol], tw[mCol], wf[mCol], tf[mCol]])
+            [passed, reasons] = objRule.check_stiff_prop_array(
+                [yieldStiff[lCol], Aw[mCol], AwMin, sigma, profType[mCol], hw[mCol],
+                 tw[mCol], wf[mCol], tf[mCol]])
+            # Reason of the first stiffener that fails, stiffeners on axis 0
+            reason[rows] = Optimizer().governing_reasons([passed.T, reasons.T])
+
+        for ratio in (ratSM, ratAw):
+            violation += numpy.where(numpy.isnan(ratio), 1.0,
+                                     numpy.maximum(0.0, 1.0 - ratio))
+        violation += reason != 0
+        return [weight, violation, tp, ratSM, ratAw, reason, thin]
+
+    def shared_genes(self, population):
+        """ Copies the material genes of the first section to the others. """
+        if self.shareMaterials:
+            population = population.copy()
+            population[..., 1:3] = population[..., :1, 1:3]
+        return population
+
+    def evaluate(self, population):
+        """ Fitness, weight and constraint violation of a population. """
+        population = self.shared_genes(population)
+        weight = numpy.zeros(len(population))
+        violation = numpy.zeros(len(population))
+        for s in range(0, population.shape[1]):
+            # Elites and converged designs are only evaluated once
+            [designs, inverse] = numpy.unique(population[:, s, :], axis=0,
+                                              return_inverse=True)
+            inverse = inverse.reshape(-1)
+            [designWeight, designViolation] = self.evaluate_section(s, designs)[:2]
+            weight += designWeight[inverse]
+            violation += designViolation[inverse]
+        return [weight + self.penalty * violation, weight, violation]
+
+    def evolve(self):
+        """ Runs the generation budget and returns the best design. """
+        rng = numpy.random.default_rng(self.seed)
+        upper = self.upper
+        nChildren = self.popSize - self.eliteSize
+        mutationRate = self.mutationRate
+        if mutationRate is None:
+            mutationRate = 1.0 / upper.size
+
+        population = rng.integers(0, upper, size=(self.popSize,) + upper.shape)
+        fitness = self.evaluate(population)[0]
+        self.history = [fitness.min()]
+        for generation in range(0, self.generations):
+            elite = population[numpy.argsort(fitness, kind='stable')[:self.eliteSize]]
+
+            # Binary tournaments for both parents
+            [a, b] = rng.integers(0, self.popSize, size=(2, 2, nChildren))
+            parents = numpy.where(fitness[a] <= fitness[b], a, b)
+            cross = rng.random((nChildren,) + upper.shape) < 0.5
+            children = numpy.where(cross, population[parents[0]], population[parents[1]])
+
+            mutate = rng.random(children.shape) < mutationRate
+            children = numpy.where(mutate, rng.integers(0, upper, size=children.shape),
+                                   children)
+
+            population = numpy.concatenate([elite, children])
+            fitness = self.evaluate(population)[0]
+            self.history.append(fitness.min())
+
+        best = numpy.argmin(fitness)
+        return [self.shared_genes(population[best]), fitness[best]]
+
+    def exhaustive_search(self):
+        """ Exact best design from all gene values of every section. """
+        shape = tuple(self.upper[0])
+        genes = numpy.indices(shape).reshape(len(shape), -1).T
+        tables = []
+        for s in range(0, len(self.topologies)):
+            [weight, violation] = self.evaluate_section(s, genes)[:2]
+            tables.append((weight + self.penalty * violation).reshape(shape))
+
+        materials = (slice(None), slice(None))
+        if self.shareMaterials:
+            # Only the material genes couple the sections
+            perMaterial = sum(table.min(axis=(0, 3, 4)) for table in tables)
+            [k, l] = numpy.unravel_index(numpy.argmin(perMaterial), perMaterial.shape)
+            materials = (slice(k, k+1), slice(l, l+1))
+
+        best = []
+        for table in tables:
+            table = table[(slice(None),) + materials]
+            best.append(numpy.unravel_index(numpy.argmin(table), table.shape))
+        best = numpy.array(best, dtype=int).reshape(-1, len(shape))
+        if self.shareMaterials:
+            best[:, 1:3] = [k, l]
+        fitness = self.evaluate(best[numpy.newaxis])[0][0]
+        self.history = [fitness]
+        return [best, fitness]
+
+    def optimize(self, objVess, objStruct, objRule, objDes, objPlaLib, objStress,
+                 sections, minNrStiff, maxNrStiff, panMat, stiffMat, profiles):
+        """ Sets up the genes, finds the best design and returns its rows. """
+        self.setup(objVess, objStruct, objRule, objDes, objPlaLib, objStress,
+                   sections, minNrStiff, maxNrStiff, panMat, stiffMat, profiles)
+        if self.exhaustive:
+            [best, fitness] = self.exhaustive_search()
+        else:
+            [best, fitness] = self.evolve()
+        return self.decode(best)
+
+    def decode(self, genes):
+        """ Rows of a design, one per section. """
+        rows = []
+        for s, [n, k, l, p, m] in enumerate(genes):
+            [weight, violation, tp, ratSM, ratAw, reason, thin] = [
+                value[0] for value in self.evaluate_section(s, [n, k, l, p, m])]
+            nStiff = self.nStiffs[n]
+            plateCheck = 'Too thin' if thin else 'OK'
+            if nStiff == 0:
+                rows.append([nStiff, self.panMat[k].matLabel, '-', tp, 'None',
+                             0, 0, weight, '-', plateCheck])
+                continue
+            rows.append([nStiff, self.panMat[k].matLabel, self.stiffMat[l].matLabel,
+                         tp, self.profiles[m].profLabel, ratSM, ratAw, weight,
+                         self.objRule.propReasons[reason], plateCheck])
+        return rows
+
+
 class StressCalculator:
     """ Calculates the stress of different components, currently only for
         stiffeners using regular beam theory.
@@ -3675,15 +7074,37 @@ class StressCalculator:
                 Calculates the maximum stress of a stiffener assuming it is 
                 simply supported and subjected to bending around the x-axis
                 with a distributed load from the design pressure. The plating 
-                attached to the stiffener is also taken into consideration, 
-                assuming that the plate thickness is the same for all plates
-                within a section (which is not true at the moment when using
-                                  assign_recommended_plates.)
+                attached to the stiffener is also taken into consideration,
+                using the governing (thinnest) plate thickness of the section
+                from objStruct.section_plate_thickness.
             Input:
                 objStiff: Stiffener object
                 objStruct: Structure object
             Output:
                 sigmaActStiff: Maximum stress of stiffener (float, N/mm2)
+
+            ...calc_stiff_stress_array...
+            Objective:
+                Same as calc_stiff_stress for all stiffeners at once, either
+                with their assigned profiles or with every profile in objProfs.
+            Input:
+                objStruct: Structure object
+                objProfs: List of M profile objects (optional)
+            Output:
+                sigmaActStiff: Maximum stress of the stiffeners (array of
+                               length N, or N x M if objProfs is given, N/mm2)
+
+            ...calc_stiff_stress_kernel...
+            Objective:
+                The array calculation of calc_stiff_stress_array, without
+                any objects.
+            Input:
+                [tp, sStiff, lStiff, pMax, profType, hw, tw, wf, tf]
+                where the stiffener values (tp, sStiff, lStiff, pMax) and
+                profile values broadcast against each other, and profType is
+                the position in ISO12215.profTypes.
+            Output:
+                sigmaActStiff: Maximum stress (array, N/mm2)
     
     """
     def __init__(self):
@@ -3698,13 +7119,9 @@ class StressCalculator:
         wf = objStiff.Profile.wf
         Atot = objStiff.Profile.Atot
         
-        # Get thickness from attached plate assuming the same thickness for all
-        # plates within a section.
-        for i in range(0, objStruct.Panel.__len__()):
-            if objStiff.section == objStruct.Panel[i].section:
-                tp = objStruct.Panel[i].Plate.tp
-            else:
-                pass
+        # Get thickness from attached plate, using the thinnest plate within
+        # the section.
+        tp = objStruct.section_plate_thickness(objStiff.section)
         
         # Effective plating b_e, section 11.6.
         be = 60*tp
@@ -3783,3 +7200,75 @@ class StressCalculator:
         
         return sigmaActStiff
 
+    def calc_stiff_stress_array(self, objStruct, objProfs=None):
+        """ Calculates the maximum stress of all stiffeners from bending
+            around the x-axis, N x M if a list of profiles is given.
+        """
+        stiff = objStruct.stiffTable
+        tp = objStruct.stiffener_plate_thickness()
+        sStiff = stiff.column('sStiff')
+        lStiff = stiff.column('lStiff')
+        pMax = stiff.column('pMax')
+
+        if objProfs is None:
+            objProfs = stiff.values('Profile')
+        else:
+            # Stiffeners along the rows and profiles along the columns
+            tp = tp[:, numpy.newaxis]
+            sStiff = sStiff[:, numpy.newaxis]
+            lStiff = lStiff[:, numpy.newaxis]
+            pMax = pMax[:, numpy.newaxis]
+        tw = numpy.array([objProf.tw for objProf in objProfs], dtype=float)
+        hw = numpy.array([objProf.hw for objProf in objProfs], dtype=float)
+        tf = numpy.array([objProf.tf for objProf in objProfs], dtype=float)
+        wf = numpy.array([objProf.wf for objProf in objProfs], dtype=float)
+        profType = numpy.array([ISO12215.profTypes.index(objProf.pType)
+                                if objProf.pType in ISO12215.profTypes else -1
+                                for objProf in objProfs], dtype=int)
+
+        return self.calc_stiff_stress_kernel([tp, sStiff, lStiff, pMax,
+                                              profType, hw, tw, wf, tf])
+
+    def calc_stiff_stress_kernel(self, inputVec):
+        """ Maximum stress from bending around the x-axis for arrays of
+            stiffener and profile data.
+        """
+        [tp, sStiff, lStiff, pMax, profType, hw, tw, wf, tf] = inputVec
+
+        # Effective plating b_e, section 11.6.
+        be = numpy.minimum(60*tp, sStiff)
+
+        # plate
+        A1 = be*tp
+        y1 = tp/2
+        I1 = (be*tp**3)/12
+        # web
+        A2 = tw*hw
+        y2 = tp + hw/2
+        I2 = (tw*hw**3)/12
+        # flange, not for flat bars
+        flanged = (profType == 1) | (profType == 2)
+        A3 = numpy.where(flanged, wf*tf, 0.0)
+        y3 = tp+hw+tf/2
+        I3 = numpy.where(flanged, (wf*tf**3)/12, 0.0)
+        # centroid
+        Atot = A1 + A2 + A3
+        ycog = (A1*y1 + A2*y2 + A3*y3) / Atot
+        # inertia, NaN for unknown profile types
+        Ixx = (I1+A1*(ycog-y1)**2 + I2+A2*(y2-ycog)**2 + I3+A3*(y3-ycog)**2)
+        Ixx = numpy.where(flanged | (profType == 0), Ixx, numpy.nan)
+
+        # Distributed load converted from area to line
+        q = pMax*1e-6 * sStiff # N/mm
+
+        # Maximum bending moment assuming simply supported beams
+        MMax = (q * lStiff**2) / 8 # Nmm
+
+        # Maximum distance from CoG (mm)
+        zMax = hw + numpy.maximum(tp, tf)
+
+        # Actual stress
+        sigmaActStiff = MMax * zMax / Ixx # N/mm2
+
+        return sigmaActStiff
+
@@ -10,3 +10,10 @@
 from __future__ import print_function, absolute_import, division
 
 import pytest
+
+import os
+import sys
+
+# The modules of schprog import each other as top level modules
+# (import schprog as SP), as when they are run from inside schprog/.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'schprog'))
@@ -0,0 +1,845 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import itertools
+
+import numpy
+import pytest
+
+import schprog as SP
+import Libraries as LB
+
+__author__ = "Marcus Naslund"
+__copyright__ = "Marcus Naslund"
+__license__ = "none"
+
+
+def create_vessel():
+    return SP.Vessel(6.851, 2.008, 4500, 30.0, 12.0, 3.0, 0.875, 1.0)
+
+
+def create_weighted_structure(objVess, nPanels=3):
+    """ Structure with panels that have a plate, a material and a weight. """
+    objStruct = SP.Structure(objVess, debug=True)
+    objStruct.assign_panels([SP.Panel(240.0, 845, 3.022, 0.12 + i*1e-3, 0,
+                                      'bottom', 'section')
+                             for i in range(nPanels)])
+    SP.Designer().assign_material_to_all_panels(objStruct, LB.mAL_5083_O)
+    for objPan in objStruct.Panel:
+        objPan.assign_plate(LB.mAL5)
+        objPan.calc_weight()
+    return objStruct
+
+
+def create_section_structure(objVess, objDes):
+    """ Structure with the bottom section of MarcusPrototype. """
+    objStruct = SP.Structure(objVess)
+    objVess.assign_structure(objStruct)
+    objStrak = SP.Strake('Strake B1', 2, 480, 3, 0.240, 0)
+    objStruct.assign_strake(objStrak)
+    objDes.create_section(objStrak, 'B1 section1', 480, 845, 3.022, 0.240, 0, 'bottom')
+    return objStruct
+
+
+def create_prototype_structure(objVess, objDes, nStiff=3):
+    """ Structure with the bottom and side sections of MarcusPrototype and a
+        forward bottom and a high side section, with their topology created.
+    """
+    objStruct = create_section_structure(objVess, objDes)
+    objStrak = SP.Strake('Strake S1', 2, 670, 3, 1.004, 1.320)
+    objStruct.assign_strake(objStrak)
+    objDes.create_section(objStrak, 'S1 section1', 670, 936, 5.673, 1.004, 1.320, 'side')
+    objDes.create_section(objStrak, 'S1 section2', 560, 700, 1.500, 1.004, 1.900, 'side')
+    objDes.create_section(objStruct.Strake[0], 'B1 section2', 400, 600, 6.200, 0.240, 0,
+                          'bottom')
+    for objStrak in objStruct.Strake:
+        for objSect in objStrak.sections:
+            objDes.create_section_topology(objSect, objStruct, nStiff)
+    return objStruct
+
+
+def create_designed_structure(objVess, objDes, objRule):
+    """ Prototype structure with materials, the rule results of the existing
+        staged calls and recommended plates.
+    """
+    objStruct = create_prototype_structure(objVess, objDes)
+    objDes.assign_material_to_all_panels(objStruct, LB.mAL_5083_O)
+    objDes.assign_material_to_all_stiffeners(objStruct, LB.mAL_6082_T6_5)
+    objDes.calc_pressure_factors(objRule, objStruct, objVess)
+    objDes.calc_design_pressures(objRule, objStruct, objVess)
+    objDes.calc_scantling_req(objRule, objStruct, objVess)
+    objDes.assign_recommended_plates(objStruct, LB.mPlaLib)
+    return objStruct
+
+
+def create_machined():
+    """ Machined profiles of all types, some of them fail the proportion
+        check.
+    """
+    objProfs = [SP.Machined('Flat Bar %g x %g' % (hw, tw), tw, hw, 0, 0, 'Flat Bar')
+                for hw, tw in ((20, 3), (36, 3), (48, 4), (60, 3), (80, 4), (30, 5),
+                               (100, 8))]
+    objProfs.append(SP.Machined('T-shaped 50 x 3 / 60 x 2', 3.0, 50.0, 2.0, 60.0,
+                                'T-shaped'))
+    objProfs.append(SP.Machined('T-shaped 70 x 4 / 40 x 4', 4.0, 70.0, 4.0, 40.0,
+                                'T-shaped'))
+    objProfs.append(SP.Machined('L-shaped 40 x 3 / 20 x 3', 3.0, 40.0, 3.0, 20.0,
+                                'L-shaped'))
+    return objProfs
+
+
+def create_repeated_structure(objVess, objDes):
+    """ Prototype structure with a copy of the side section, so that there
+        are members with the same rule input in different sections.
+    """
+    objStruct = create_prototype_structure(objVess, objDes)
+    objStrak = objStruct.Strake[1]
+    objDes.create_section(objStrak, 'S1 section3', 670, 936, 5.673, 1.004, 1.320, 'side')
+    objDes.create_section_topology(objStrak.sections[-1], objStruct, 3)
+    objDes.assign_material_to_all_panels(objStruct, LB.mAL_5083_O)
+    objDes.assign_material_to_all_stiffeners(objStruct, LB.mAL_6082_T6_5)
+    return objStruct
+
+
+class CollidingRuleCache(SP.RuleCache):
+    """ RuleCache where all rows share one hash. """
+    def hash_rows(self, bits):
+        return numpy.zeros(bits.shape[0], dtype=numpy.uint64)
+
+
+def reference_sweep(objVess, objStruct, objRule, objDes, objPlaLib, objStress,
+                    minNrStiff, maxNrStiff, panMat, stiffMat, profLists,
+                    strakeListID, secListID):
+    """ Rows of Optimizer.sweep_method built with the member objects, one
+        material and profile at a time, as the sweep was done before the
+        staged evaluation.
+    """
+    objSect = objStruct.Strake[strakeListID].sections[secListID]
+    sweep = ([], [])
+    for nStiff in range(minNrStiff, maxNrStiff+1):
+        objStruct.Panel = []
+        objStruct.Stiffener = []
+        objDes.create_section_topology(objSect, objStruct, nStiff)
+        for pm in panMat:
+            objDes.assign_material_to_all_panels(objStruct, pm)
+            for sm in stiffMat:
+                objDes.assign_material_to_all_stiffeners(objStruct, sm)
+                objDes.calc_pressure_factors(objRule, objStruct, objVess)
+                objDes.calc_design_pressures(objRule, objStruct, objVess)
+                objDes.calc_scantling_req(objRule, objStruct, objVess)
+                outOfRange = objDes.assign_recommended_plates(objStruct, objPlaLib)
+                plateCheck = 'Out of range' if outOfRange.any() else 'OK'
+                for objPan in objStruct.Panel:
+                    objPan.calc_weight()
+                panWeight = sum(objPan.weight for objPan in objStruct.Panel)
+                tp = objStruct.Panel[0].Plate.tp
+                if nStiff == 0:
+                    # One row per stiffener material, in both lists
+                    row = (nStiff, pm.matLabel, '-', tp, 'None', 0, 0, 0, 0, 0, 0, 0,
+                           panWeight, panWeight, '-', plateCheck)
+                    sweep[0].append(row)
+                    sweep[1].append(row)
+                    continue
+
+                for listIndex, objProfs in enumerate(profLists):
+                    for objProf in objProfs:
+                        for objStiff in objStruct.Stiffener:
+                            objStiff.assign_profile(objProf)
+                            objStiff.calc_weight()
+                        stiffWeight = sum(objStiff.weight for objStiff in objStruct.Stiffener)
+                        SMMin = max(objStiff.SMMin for objStiff in objStruct.Stiffener)
+                        AwMin = max(objStiff.AwMin for objStiff in objStruct.Stiffener)
+                        [passed, reason] = objDes.calc_stiff_max_prop(objStress, objStruct,
+                                                                      objRule)
+                        failed = numpy.flatnonzero(~passed)
+                        propCheck = objRule.propReasons[reason[failed[0]] if len(failed) else 0]
+                        sweep[listIndex].append(
+                            (nStiff, pm.matLabel, sm.matLabel, tp, objProf.profLabel,
+                             objProf.SM, objProf.Aw, SMMin, AwMin, objProf.SM / SMMin,
+                             objProf.Aw / AwMin, stiffWeight, panWeight,
+                             stiffWeight + panWeight, propCheck, plateCheck))
+    return sweep
+
+
+def assert_rows_equal(rows, expected):
+    assert len(rows) == len(expected)
+    for row, expectedRow in zip(rows, expected):
+        for value, expectedValue in zip(row, expectedRow):
+            if isinstance(expectedValue, str):
+                assert value == expectedValue
+            else:
+                assert value == pytest.approx(expectedValue, rel=1e-9)
+
+
+def test_reassign_panels_to_other_structure():
+    objVess = create_vessel()
+    A = create_weighted_structure(objVess)
+    B = SP.Structure(objVess, debug=True)
+    B.assign_panels(A.Panel)
+    B.calc_total_weight()
+    assert B.panWeight == pytest.approx(A.calc_totals()[0][0])
+
+
+def test_reassign_one_panel_to_other_structure():
+    objVess = create_vessel()
+    A = create_weighted_structure(objVess)
+    C = SP.Structure(objVess, debug=True)
+    C.assign_panel(A.Panel[0])
+    C.calc_total_weight()
+    assert C.panWeight == pytest.approx(A.calc_totals()[0][0] / 3)
+
+
+def test_replace_panels_with_setter():
+    objVess = create_vessel()
+    A = create_weighted_structure(objVess)
+    A.Panel = A.Panel[:1]
+    A.calc_total_weight()
+    assert len(A.Panel) == 1
+    assert A.panWeight > 0
+
+
+def test_removed_panels_keep_their_values():
+    objVess = create_vessel()
+    A = create_weighted_structure(objVess, 1)
+    p = A.Panel[0]
+    weight = p.weight
+    A.Panel = []
+    q = SP.Panel(100.0, 500, 1.0, 0.2, 0, 'side', 'other')
+    A.assign_panel(q)
+    assert (p.b, p.location, p.weight) == (240.0, 'bottom', weight)
+    p.b = 999.0
+    assert q.b == 100.0
+    with pytest.raises(IndexError):
+        SP.Panel.view(A.panTable, 1).b
+
+
+def test_assigned_nan_can_be_read():
+    objVess = create_vessel()
+    A = create_weighted_structure(objVess, 1)
+    objPan = A.Panel[0]
+    with pytest.raises(AttributeError):
+        objPan.pMax
+    objPan.pMax = float('nan')
+    assert numpy.isnan(objPan.pMax)
+
+
+def test_sweep_rejects_too_thin_plates():
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objStruct = create_section_structure(objVess, objDes)
+    objPlaLib = SP.PlatingLibrary()
+    objPlaLib.assign_plate(SP.Plates('AL2', 2))
+    objPlaLib.assign_plate(SP.Plates('AL3', 3))
+    objOpt = SP.Optimizer()
+    objSweep = objOpt.sweep_method(objVess, objStruct, SP.ISO12215('A'), objDes,
+                                   objPlaLib, SP.StressCalculator(), 0, 3,
+                                   [LB.mAL_5083_O], [LB.mAL_6082_T6_5],
+                                   [LB.mFlatBar60x5, LB.mTee40x40x4], [], 0, 0)
+    rows = [row for row in objSweep[0] if row.nStiff == 0]
+    assert rows and all(row.plateCheck == 'Out of range' for row in rows)
+    assert not any(objOpt.is_feasible(row) for row in rows)
+
+    best = objOpt.sweep_method(objVess, objStruct, SP.ISO12215('A'), objDes,
+                               objPlaLib, SP.StressCalculator(), 0, 3,
+                               [LB.mAL_5083_O], [LB.mAL_6082_T6_5],
+                               [LB.mFlatBar60x5, LB.mTee40x40x4], [], 0, 0,
+                               keepBest=2)
+    assert best[0] and all(row.plateCheck == 'OK' for row in best[0])
+
+
+def create_two_section_structure(objVess, objDes):
+    objStruct = create_section_structure(objVess, objDes)
+    objStrak = SP.Strake('Strake S1', 2, 670, 3, 1.004, 1.320)
+    objStruct.assign_strake(objStrak)
+    objDes.create_section(objStrak, 'S1 section1', 670, 936, 5.673, 1.004, 1.320, 'side')
+    return objStruct
+
+
+def setup_evolution(objEA, maxNrStiff=2):
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objStruct = create_two_section_structure(objVess, objDes)
+    objPlaLib = SP.PlatingLibrary()
+    for tp in (3, 4, 6, 8):
+        objPlaLib.assign_plate(SP.Plates('AL%d' % tp, tp))
+    args = (objVess, objStruct, SP.ISO12215('A'), objDes, objPlaLib, SP.StressCalculator(),
+            [(0, 0), (1, 0)], 0, maxNrStiff, [LB.mAL_5083_O, LB.mAL_6061_T6],
+            [LB.mAL_6082_T6_5, LB.mAL_6061_T6],
+            [LB.mFlatBar60x5, LB.mFlatBar40x5, LB.mTee40x40x4])
+    objEA.setup(*args)
+    return args
+
+
+def test_evolution_kernels_match_member_objects():
+    objEA = SP.EvolutionaryOptimizer()
+    [objVess, objStruct, objRule, objDes, objPlaLib, objStress, sections, minNrStiff,
+     maxNrStiff, panMat, stiffMat, profiles] = setup_evolution(objEA)
+    genes = numpy.indices(tuple(objEA.upper[0])).reshape(5, -1).T
+    objTopo = SP.Structure(objVess)
+    for s, [strakeListID, secListID] in enumerate(sections):
+        objSect = objStruct.Strake[strakeListID].sections[secListID]
+        [weight, violation, tp, ratSM, ratAw, reason, thin] = objEA.evaluate_section(s, genes)
+        for i, [n, k, l, p, m] in enumerate(genes):
+            objTopo.Panel = []
+            objTopo.Stiffener = []
+            objDes.create_section_topology(objSect, objTopo, objEA.nStiffs[n])
+            objDes.assign_material_to_all_panels(objTopo, panMat[k])
+            objDes.assign_material_to_all_stiffeners(objTopo, stiffMat[l])
+            objDes.evaluate(objRule, objTopo, objVess)
+            objPlate = SP.Plates('plate', objEA.thicknesses[p])
+            expected = 0.0
+            for objPan in objTopo.Panel:
+                objPan.assign_plate(objPlate)
+                objPan.calc_weight()
+                expected += objPan.weight
+            tpMin = max(max(objPan.tReq, objPan.tMin) for objPan in objTopo.Panel)
+            assert thin[i] == (objPlate.tp < tpMin)
+            if objTopo.Stiffener:
+                for objStiff in objTopo.Stiffener:
+                    objStiff.assign_profile(profiles[m])
+                    objStiff.calc_weight()
+                    expected += objStiff.weight
+                assert ratSM[i] == pytest.approx(
+                    min(profiles[m].SM / objStiff.SMMin for objStiff in objTopo.Stiffener))
+                assert ratAw[i] == pytest.approx(
+                    min(profiles[m].Aw / objStiff.AwMin for objStiff in objTopo.Stiffener))
+                [passed, reasons] = objDes.calc_stiff_max_prop(objStress, objTopo, objRule)
+                failed = numpy.flatnonzero(~passed)
+                assert reason[i] == (reasons[failed[0]] if len(failed) else 0)
+            assert weight[i] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('shareMaterials', [False, True])
+def test_exhaustive_search_takes_the_exact_best(shareMaterials):
+    objEA = SP.EvolutionaryOptimizer(shareMaterials=shareMaterials, exhaustive=True)
+    args = setup_evolution(objEA)
+    rows = objEA.optimize(*args)
+    genes = numpy.indices(tuple(objEA.upper[0])).reshape(5, -1).T
+    population = numpy.stack([numpy.repeat(genes, len(genes), axis=0),
+                              numpy.tile(genes, (len(genes), 1))], axis=1)
+    fitness = objEA.evaluate(population)[0]
+    assert len(rows) == 2
+    assert objEA.history[-1] == pytest.approx(fitness.min())
+    if shareMaterials:
+        assert rows[0][1] == rows[1][1]
+        assert rows[0][2] == rows[1][2] or '-' in (rows[0][2], rows[1][2])
+
+
+def test_evolution_is_reproducible_and_bounded_by_the_exact_best():
+    objExact = SP.EvolutionaryOptimizer(exhaustive=True)
+    args = setup_evolution(objExact, maxNrStiff=3)
+    objExact.optimize(*args)
+    runs = []
+    for i in range(0, 2):
+        objEA = SP.EvolutionaryOptimizer(popSize=10, generations=5, seed=1)
+        runs.append((objEA.optimize(*args), objEA.history, objEA.evaluations))
+    assert runs[0][0] == runs[1][0] and runs[0][1] == runs[1][1]
+    [rows, history, evaluations] = runs[0]
+    assert len(rows) == 2 and all(row[3] in objExact.thicknesses for row in rows)
+    assert all(a >= b for a, b in zip(history, history[1:]))
+    assert history[-1] >= objExact.history[-1]
+    assert evaluations < 2 * objExact.upper[0].prod()
+
+
+@pytest.mark.parametrize('designCategory', ['A', 'B', 'C', 'D'])
+def test_panel_pressure_factors_match_scalar_rule(designCategory):
+    objVess = create_vessel()
+    objRule = SP.ISO12215(designCategory)
+    objStruct = create_prototype_structure(objVess, SP.Designer())
+    objCtx = objRule.get_rule_context(objVess)
+    PressFact = objRule.calc_panel_pressure_factors_array(objRule.measure_panels(objStruct),
+                                                          objCtx)
+    for i, objPan in enumerate(objStruct.Panel):
+        [b, lPan, xPos, zPos, loc] = objRule.measure_panel(objPan)
+        scalar = objRule.calc_panel_pressure_factors(
+            [b, lPan, xPos, zPos, loc, objCtx.mLDC, objCtx.nCG, objCtx.LWL,
+             objCtx.hT, objCtx.tC, objCtx.fB])
+        assert list(scalar[1:]) == pytest.approx([value[i] for value in PressFact[1:]])
+
+
+@pytest.mark.parametrize('designCategory', ['A', 'B', 'C', 'D'])
+def test_stiffener_pressure_factors_match_scalar_rule(designCategory):
+    objVess = create_vessel()
+    objRule = SP.ISO12215(designCategory)
+    objStruct = create_prototype_structure(objVess, SP.Designer())
+    objCtx = objRule.get_rule_context(objVess)
+    PressFact = objRule.calc_stiff_pressure_factors_array(objRule.measure_stiffeners(objStruct),
+                                                          objCtx)
+    for i, objStiff in enumerate(objStruct.Stiffener):
+        [lStiff, xPos, zPos, sStiff, loc, stiffType] = objRule.measure_stiffener(objStiff)
+        scalar = objRule.calc_stiff_pressure_factors(
+            [lStiff, xPos, zPos, sStiff, loc, stiffType, objCtx.mLDC, objCtx.nCG,
+             objCtx.LWL, objCtx.hT, objCtx.tC, objCtx.fB])
+        assert list(scalar[1:]) == pytest.approx([value[i] for value in PressFact[1:]])
+
+
+@pytest.mark.parametrize('designCategory', ['A', 'B', 'C', 'D'])
+def test_design_pressures_match_scalar_rules(designCategory):
+    objVess = create_vessel()
+    objRule = SP.ISO12215(designCategory)
+    objStruct = create_prototype_structure(objVess, SP.Designer())
+    objCtx = objRule.get_rule_context(objVess)
+    members = (
+        (objStruct.Panel, objRule.measure_panel, objRule.measure_panels(objStruct),
+         objRule.calc_panel_pressure_factors_array, objRule.calc_panel_pressures),
+        (objStruct.Stiffener, objRule.measure_stiffener, objRule.measure_stiffeners(objStruct),
+         objRule.calc_stiff_pressure_factors_array, objRule.calc_stiffener_pressures))
+    for objMembers, measure, data, calc_factors, calc_pressures in members:
+        [ruleType, kL, kAR_d, kAR_p, AD, kZ] = calc_factors(data, objCtx)
+        [ruleType, pMax] = objRule.calc_design_pressures_array(
+            [kL, kAR_d, kAR_p, kZ, data[4]], objCtx)
+        for i, objMember in enumerate(objMembers):
+            loc = measure(objMember)[4]
+            [ruleType, pMaxMember] = calc_pressures(
+                [objCtx.kDC, kL[i], kAR_d[i], kAR_p[i], kZ[i], loc, objCtx.nCG,
+                 objCtx.LWL, objCtx.bC, objCtx.mLDC])
+            assert pMaxMember == pytest.approx(pMax[i])
+
+
+@pytest.mark.parametrize('designCategory', ['A', 'B', 'C', 'D'])
+def test_panel_req_match_scalar_rule(designCategory):
+    objVess = create_vessel()
+    objRule = SP.ISO12215(designCategory)
+    objStruct = create_prototype_structure(objVess, SP.Designer())
+    objCtx = objRule.get_rule_context(objVess)
+    objMat = LB.mAL_5083_O
+    panData = objRule.measure_panels(objStruct)
+    [ruleType, kL, kAR_d, kAR_p, AD, kZ] = objRule.calc_panel_pressure_factors_array(
+        panData, objCtx)
+    [ruleType, pMax] = objRule.calc_design_pressures_array(
+        [kL, kAR_d, kAR_p, kZ, panData[4]], objCtx)
+    n = len(pMax)
+    PanReq = objRule.calc_panel_req_array(
+        [pMax, panData[0], panData[1], panData[4], numpy.full(n, objMat.tensileStrength),
+         numpy.full(n, objMat.yieldStrength), numpy.full(n, objMat.yieldStrength)], objCtx)
+    for i, objPan in enumerate(objStruct.Panel):
+        [b, lPan, xPos, zPos, loc] = objRule.measure_panel(objPan)
+        scalarReq = objRule.calc_panel_req(
+            [pMax[i], b, lPan, loc, objCtx.mLDC, objCtx.V, objMat.tensileStrength,
+             objMat.yieldStrength, objMat.yieldStrength])
+        assert list(scalarReq[1:]) == pytest.approx([value[i] for value in PanReq[1:]])
+
+
+@pytest.mark.parametrize('designCategory', ['A', 'B', 'C', 'D'])
+def test_stiffener_req_match_scalar_rule(designCategory):
+    objVess = create_vessel()
+    objRule = SP.ISO12215(designCategory)
+    objStruct = create_designed_structure(objVess, SP.Designer(), objRule)
+    stiffData = objRule.measure_stiffeners(objStruct)
+    pMax = numpy.array([objStiff.pMax for objStiff in objStruct.Stiffener])
+    yieldStiff = LB.mAL_6082_T6_5.yieldStrength
+    objProfs = [LB.mFlatBar60x5, LB.mFlatBar40x5, LB.mTee40x40x4] + create_machined()
+    [ruleType, AwMin, SMMin, ratAw, ratSM] = objRule.calc_stiff_req_array(
+        [pMax, stiffData[0], stiffData[3], numpy.full(len(pMax), yieldStiff)], objProfs)
+    for i, objStiff in enumerate(objStruct.Stiffener):
+        [lStiff, xPos, zPos, sStiff, loc, stiffType] = objRule.measure_stiffener(objStiff)
+        scalarReq = objRule.calc_stiff_req([pMax[i], lStiff, sStiff, yieldStiff])
+        assert list(scalarReq[1:]) == pytest.approx([AwMin[i], SMMin[i]])
+        assert ratAw[i] == pytest.approx([objProf.Aw / AwMin[i] for objProf in objProfs])
+        assert ratSM[i] == pytest.approx([objProf.SM / SMMin[i] for objProf in objProfs])
+
+
+@pytest.mark.parametrize('designCategory', ['A', 'B', 'C', 'D'])
+def test_stiffener_stress_and_prop_match_scalar_rules(designCategory):
+    objVess = create_vessel()
+    objRule = SP.ISO12215(designCategory)
+    objStress = SP.StressCalculator()
+    objStruct = create_designed_structure(objVess, SP.Designer(), objRule)
+    yieldStiff = LB.mAL_6082_T6_5.yieldStrength
+    objProfs = [LB.mFlatBar60x5, LB.mFlatBar40x5, LB.mTee40x40x4] + create_machined()
+    stress = objStress.calc_stiff_stress_array(objStruct, objProfs)
+    for i, objStiff in enumerate(objStruct.Stiffener):
+        for j, objProf in enumerate(objProfs):
+            objStiff.Profile = objProf
+            sigma = objStress.calc_stiff_stress(objStiff, objStruct)
+            assert sigma == pytest.approx(stress[i, j], rel=1e-12)
+            for factor in (0.3, 1.0, 3.0):
+                [passed, reason] = objRule.check_stiff_prop(
+                    [yieldStiff, objProf.Aw, objStiff.AwMin, sigma * factor, objProf.pType,
+                     objProf.hw, objProf.tw, objProf.wf, objProf.tf])
+                arrays = objRule.check_stiff_prop_array(
+                    [numpy.array([yieldStiff]), numpy.array([objProf.Aw]),
+                     numpy.array([objStiff.AwMin]), numpy.array([sigma * factor]),
+                     numpy.array([objRule.profTypes.index(objProf.pType)]),
+                     numpy.array([objProf.hw]), numpy.array([objProf.tw]),
+                     numpy.array([objProf.wf]), numpy.array([objProf.tf])])
+                assert (passed, reason) == (arrays[0][0], arrays[1][0])
+
+
+@pytest.mark.parametrize('name, value', [('LWL', 9.0), ('mLDC', 6000), ('V', 30.0)])
+def test_vessel_changes_rebuild_the_rule_context(name, value):
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objRule = SP.ISO12215('A')
+    objStruct = create_designed_structure(objVess, objDes, objRule)
+    before = objStruct.panTable.column('pMax').copy()
+    objCtx = objRule.get_rule_context(objVess)
+    setattr(objVess, name, value)
+    assert objRule.get_rule_context(objVess) is not objCtx
+    objDes.calc_pressure_factors(objRule, objStruct, objVess)
+    objDes.calc_design_pressures(objRule, objStruct, objVess)
+    after = objStruct.panTable.column('pMax')
+    assert not numpy.allclose(after, before)
+
+    # The same pressures as with a new vessel and rules
+    objVessNew = create_vessel()
+    setattr(objVessNew, name, value)
+    objStructNew = create_designed_structure(objVessNew, objDes, SP.ISO12215('A'))
+    assert after == pytest.approx(objStructNew.panTable.column('pMax'))
+
+
+def rule_results(objVess, objStruct, objRule, fused):
+    """ Numerical member columns after the rules have been evaluated. """
+    objDes = SP.Designer()
+    if fused:
+        objDes.evaluate(objRule, objStruct, objVess)
+    else:
+        objDes.calc_pressure_factors(objRule, objStruct, objVess)
+        objDes.calc_design_pressures(objRule, objStruct, objVess)
+        objDes.calc_scantling_req(objRule, objStruct, objVess)
+    return [table.column(name).copy() for table in (objStruct.panTable, objStruct.stiffTable)
+            for name in table.numColumns]
+
+
+@pytest.mark.parametrize('fused', [False, True])
+@pytest.mark.parametrize('maxsize', [4096, 12, 5])
+@pytest.mark.parametrize('cacheClass', [SP.RuleCache, CollidingRuleCache])
+def test_rule_cache_gives_the_same_results(fused, maxsize, cacheClass):
+    objVess = create_vessel()
+    objRule = SP.ISO12215('A')
+    expected = rule_results(objVess, create_repeated_structure(objVess, SP.Designer()),
+                            objRule, fused)
+    # maxsize 12 holds the classes of one kernel call but not all of them,
+    # 5 is less than the classes of one call, so nothing is cached
+    objRule.cache = cacheClass(maxsize)
+    objStruct = create_repeated_structure(objVess, SP.Designer())
+    for _ in range(2):
+        results = rule_results(objVess, objStruct, objRule, fused)
+        for value, expectedValue in zip(results, expected):
+            numpy.testing.assert_array_equal(value, expectedValue)
+        assert len(objRule.cache.entries) <= maxsize
+    assert objRule.cache.members > objRule.cache.misses
+    if maxsize == 4096:
+        assert objRule.cache.hits > 0
+    elif maxsize == 5:
+        assert objRule.cache.hits == 0
+
+
+@pytest.mark.parametrize('designCategory', ['A', 'B', 'C', 'D'])
+def test_evaluate_matches_staged_calls(designCategory):
+    objVess = create_vessel()
+    objRule = SP.ISO12215(designCategory)
+    staged = create_repeated_structure(objVess, SP.Designer())
+    fused = create_repeated_structure(objVess, SP.Designer())
+    expected = rule_results(objVess, staged, objRule, False)
+    results = rule_results(objVess, fused, objRule, True)
+    for value, expectedValue in zip(results, expected):
+        assert value == pytest.approx(expectedValue, rel=1e-12, nan_ok=True)
+    for name in ('ruleType', 'kDC', 'nCG'):
+        assert getattr(fused, name) == getattr(staged, name)
+
+
+@pytest.mark.parametrize('secIDs', [(0, 0), (1, 0)])
+def test_staged_sweep_matches_reference(secIDs):
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objRule = SP.ISO12215('A')
+    objStress = SP.StressCalculator()
+    objStruct = create_prototype_structure(objVess, objDes, 0)
+    panMat = [LB.mAL_5083_O, LB.mAL_6061_T6]
+    stiffMat = [LB.mAL_6082_T6_5, LB.mAL_6061_T6]
+    extrusions = [LB.mFlatBar60x5, LB.mFlatBar40x5, LB.mTee40x40x4]
+    machined = create_machined()
+    objSweep = SP.Optimizer().sweep_method(objVess, objStruct, objRule, objDes, LB.mPlaLib,
+                                           objStress, 0, 3, panMat, stiffMat, extrusions,
+                                           machined, secIDs[0], secIDs[1], 1)
+    expected = reference_sweep(objVess, objStruct, objRule, objDes, LB.mPlaLib, objStress,
+                               0, 3, panMat, stiffMat, [extrusions, machined], *secIDs)
+    assert_rows_equal(objSweep[0], expected[0])
+    assert_rows_equal(objSweep[1], expected[1])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sweep_leaves_the_last_design(workers):
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objRule = SP.ISO12215('A')
+    objStress = SP.StressCalculator()
+    panMat = [LB.mAL_5083_O, LB.mAL_6061_T6]
+    stiffMat = [LB.mAL_6082_T6_5, LB.mAL_6061_T6]
+    extrusions = [LB.mFlatBar60x5, LB.mTee40x40x4]
+    machined = create_machined()
+    objStruct = create_prototype_structure(objVess, objDes, 0)
+    SP.Optimizer().sweep_method(objVess, objStruct, objRule, objDes, LB.mPlaLib, objStress,
+                                0, 3, panMat, stiffMat, extrusions, machined, 1, 0, workers)
+    expected = create_prototype_structure(objVess, objDes, 0)
+    reference_sweep(objVess, expected, objRule, objDes, LB.mPlaLib, objStress, 0, 3,
+                    panMat, stiffMat, [extrusions, machined], 1, 0)
+    for table, expectedTable in ((objStruct.panTable, expected.panTable),
+                                 (objStruct.stiffTable, expected.stiffTable)):
+        assert len(table) == len(expectedTable) > 0
+        for name in table.numColumns:
+            assert table.column(name) == pytest.approx(expectedTable.column(name),
+                                                       rel=1e-12, nan_ok=True)
+        for name in table.catColumns:
+            assert table.values(name) == expectedTable.values(name)
+    [panTotals, stiffTotals] = expected.calc_totals()
+    assert objStruct.panTotals == pytest.approx(panTotals)
+    assert objStruct.stiffTotals == pytest.approx(stiffTotals)
+
+
+@pytest.mark.parametrize('secIDs', [(0, 0), (1, 0)])
+def test_parallel_sweep_matches_reference(secIDs):
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objRule = SP.ISO12215('A')
+    objStress = SP.StressCalculator()
+    objStruct = create_prototype_structure(objVess, objDes, 0)
+    panMat = [LB.mAL_5083_O, LB.mAL_6061_T6]
+    stiffMat = [LB.mAL_6082_T6_5, LB.mAL_6061_T6]
+    extrusions = [LB.mFlatBar60x5, LB.mFlatBar40x5, LB.mTee40x40x4]
+    machined = create_machined()
+    objSweep = SP.Optimizer().sweep_method(objVess, objStruct, objRule, objDes, LB.mPlaLib,
+                                           objStress, 0, 3, panMat, stiffMat, extrusions,
+                                           machined, secIDs[0], secIDs[1], 2)
+    expected = reference_sweep(objVess, objStruct, objRule, objDes, LB.mPlaLib, objStress,
+                               0, 3, panMat, stiffMat, [extrusions, machined], *secIDs)
+    assert_rows_equal(objSweep[0], expected[0])
+    assert_rows_equal(objSweep[1], expected[1])
+
+
+def test_parallel_sweep_can_stop_early():
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objStruct = create_prototype_structure(objVess, objDes, 0)
+    rows = SP.Optimizer().iter_sweep(objVess, objStruct, SP.ISO12215('A'), objDes,
+                                     LB.mPlaLib, SP.StressCalculator(), 0, 6,
+                                     [LB.mAL_5083_O], [LB.mAL_6082_T6_5],
+                                     [LB.mFlatBar60x5], create_machined(), 0, 0, 2)
+    assert len(list(itertools.islice(rows, 5))) == 5
+    rows.close()
+
+
+def brute_force_front(objectives):
+    expected = []
+    for i, objective in enumerate(objectives):
+        dominated = ((objectives <= objective).all(axis=1)
+                     & (objectives < objective).any(axis=1))
+        if not dominated.any():
+            expected.append(i)
+    return expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pareto_indices_match_brute_force(seed):
+    rng = numpy.random.default_rng(seed)
+    objectives = rng.integers(0, 6, size=(300, 4)).astype(float)
+    objectives[rng.random(300) < 0.05, 0] = numpy.inf
+    front = SP.Optimizer().pareto_indices(objectives)
+    assert sorted(front.tolist()) == brute_force_front(objectives)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_pareto_indices_of_distinct_objectives(seed):
+    # As many distinct values of the last objective as rows
+    rng = numpy.random.default_rng(seed)
+    objectives = rng.random((400, 4))
+    objectives[:, 1:3] -= objectives[:, [0]]
+    front = SP.Optimizer().pareto_indices(objectives)
+    assert sorted(front.tolist()) == brute_force_front(objectives)
+
+
+def test_pareto_indices_when_all_rows_are_on_the_front():
+    i = numpy.arange(2000, dtype=float)
+    objectives = numpy.column_stack([i, -i, i, i % 3])
+    front = SP.Optimizer().pareto_indices(objectives[::-1])
+    assert len(front) == len(objectives)
+
+
+@pytest.mark.parametrize('kind', ['Extrusions', 'Machined'])
+@pytest.mark.parametrize('withProp', [False, True])
+@pytest.mark.parametrize('subset', [False, True])
+def test_recommended_profiles_match_brute_force(kind, withProp, subset):
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objRule = SP.ISO12215('A')
+    objStress = SP.StressCalculator()
+    objStruct = create_designed_structure(objVess, objDes, objRule)
+    objProfLib = SP.ProfileLibrary()
+    for objProf in LB.mProfLib.Extrusions:
+        objProfLib.assign_extrusion(objProf)
+    for objProf in create_machined():
+        objProfLib.assign_machined(objProf)
+    objProfs = getattr(objProfLib, kind)
+    # Only the small profiles, so some stiffeners do not get one
+    allowed = objProfs[:3] if subset else None
+    for objStiff in objStruct.Stiffener:
+        objStiff.Profile = LB.mFlatBar80x6
+
+    passed = numpy.ones((len(objStruct.Stiffener), len(objProfs)), dtype=bool)
+    if withProp:
+        passed = objDes.calc_stiff_max_prop(objStress, objStruct, objRule, objProfs)[0]
+        found = objDes.assign_recommended_profiles(objStruct, objProfLib, allowed, kind,
+                                                   objRule, objStress)
+    else:
+        found = objDes.assign_recommended_profiles(objStruct, objProfLib, allowed, kind)
+
+    for i, objStiff in enumerate(objStruct.Stiffener):
+        best = None
+        for j, objProf in enumerate(objProfs):
+            if allowed is not None and objProf not in allowed:
+                continue
+            if (objProf.SM >= objStiff.SMMin and objProf.Aw >= objStiff.AwMin
+                    and passed[i, j] and (best is None or objProf.Atot < best.Atot)):
+                best = objProf
+        assert found[i] == (best is not None)
+        assert objStiff.Profile is (best or LB.mFlatBar80x6)
+
+
+def test_recommended_plates_match_brute_force():
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objRule = SP.ISO12215('A')
+    objStruct = create_prototype_structure(objVess, objDes)
+    objDes.assign_material_to_all_panels(objStruct, LB.mAL_5083_O)
+    objDes.calc_pressure_factors(objRule, objStruct, objVess)
+    objDes.calc_design_pressures(objRule, objStruct, objVess)
+    objDes.calc_scantling_req(objRule, objStruct, objVess)
+    minTP = numpy.fmax(objStruct.panTable.column('tReq'), objStruct.panTable.column('tMin'))
+    # Thicknesses around the requirements, unsorted and with a duplicate,
+    # so the thickest panels are out of range
+    thicknesses = numpy.unique(minTP)
+    [low, high] = thicknesses[[0, -1]]
+    objPlaLib = SP.PlatingLibrary()
+    for i, tp in enumerate((low, low - 0.1, low, (low + high) / 2)):
+        objPlaLib.assign_plate(SP.Plates('AL%d' % i, tp))
+    outOfRange = objDes.assign_recommended_plates(objStruct, objPlaLib)
+
+    for i, objPan in enumerate(objStruct.Panel):
+        minTP = max(objPan.tReq, objPan.tMin)
+        thick = [objPlate for objPlate in objPlaLib.Plates if objPlate.tp >= minTP]
+        assert outOfRange[i] == (not thick)
+        if thick:
+            # The first plate of the library of the closest thickness
+            assert objPan.Plate is min(thick, key=lambda objPlate: objPlate.tp)
+        else:
+            assert objPan.Plate is objPlaLib.Plates[-1]
+    assert outOfRange.any() and not outOfRange.all()
+
+
+def dominates(objProf, objOther):
+    """ Dominance of ProfileLibrary.prune_dominated, without the tie break on
+        the list order.
+    """
+    if objProf.pType != objOther.pType:
+        return False
+    if objProf.SM < objOther.SM or objProf.Aw < objOther.Aw or objProf.Atot > objOther.Atot:
+        return False
+    hwtw = objProf.hw / objProf.tw
+    if objProf.pType == 'Flat Bar':
+        return hwtw <= 12 or hwtw <= objOther.hw / objOther.tw
+    d = (objProf.wf - objProf.tw) / 2 if objProf.pType == 'T-shaped' else objProf.wf - objProf.tw
+    dOther = ((objOther.wf - objOther.tw) / 2 if objOther.pType == 'T-shaped'
+              else objOther.wf - objOther.tw)
+    return hwtw <= 40 and (d / objProf.tf <= 12 or d / objProf.tf <= dOther / objOther.tf)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_prune_dominated_points_to_kept_profiles(seed):
+    rng = numpy.random.default_rng(seed)
+    objProfs = []
+    for i in range(120):
+        pType = ('Flat Bar', 'T-shaped', 'L-shaped')[rng.integers(0, 3)]
+        [hw, tw] = [float(rng.integers(4, 18) * 5), float(rng.integers(2, 7))]
+        [wf, tf] = [0, 0]
+        if pType != 'Flat Bar':
+            [wf, tf] = [float(rng.integers(2, 7) * 10), float(rng.integers(2, 5))]
+        objProfs.append(SP.Machined('%s %d' % (pType, i), tw, hw, tf, wf, pType))
+    # Equal profiles, of which the first one is kept
+    objProfs += objProfs[:10]
+
+    [kept, removed] = SP.ProfileLibrary.prune_dominated(objProfs)
+    assert len(kept) + len(removed) == len(objProfs)
+    for objProf, objDominating in removed:
+        assert any(objDominating is objKept for objKept in kept)
+        assert dominates(objDominating, objProf)
+    for objProf in kept:
+        assert not any(dominates(objOther, objProf) and objOther is not objProf
+                       and (objOther.SM, objOther.Aw, objOther.Atot)
+                       != (objProf.SM, objProf.Aw, objProf.Atot)
+                       for objOther in objProfs)
+
+
+def test_profile_index_follows_library_changes():
+    objProfLib = SP.ProfileLibrary()
+    for objProf in (LB.mFlatBar40x5, LB.mFlatBar50x6, LB.mFlatBar80x6):
+        objProfLib.assign_extrusion(objProf)
+    assert objProfLib.query_profiles(LB.mFlatBar50x6.SM) == [LB.mFlatBar50x6,
+                                                             LB.mFlatBar80x6]
+
+    # Same length, so only the invalidation rebuilds the index
+    objProfLib.set_extrusion(1, LB.mFlatBar40x6)
+    assert objProfLib.query_profiles(LB.mFlatBar50x6.SM) == [LB.mFlatBar80x6]
+    assert objProfLib.profile_frontier()[0] == objProfLib.Extrusions
+
+    objProfLib.remove_extrusion(LB.mFlatBar80x6)
+    assert objProfLib.query_profiles(LB.mFlatBar50x6.SM) == []
+
+    objProfLib.Extrusions[0] = LB.mFlatBar80x6
+    objProfLib.clear_index('Extrusions')
+    assert objProfLib.query_profiles(LB.mFlatBar50x6.SM) == [LB.mFlatBar80x6]
+
+
+def test_thickness_index_follows_library_changes():
+    objPlaLib = SP.PlatingLibrary()
+    for tp in (3, 5, 8):
+        objPlaLib.assign_plate(SP.Plates('AL%d' % tp, tp))
+    assert objPlaLib.recommended_plates([4.0])[0].tolist() == [1]
+
+    # Same length, so only the invalidation rebuilds the index
+    objPlaLib.set_plate(1, SP.Plates('AL6', 6))
+    assert objPlaLib.Plates[objPlaLib.recommended_plates([4.0])[0][0]].tp == 6
+
+    objPlaLib.remove_plate(objPlaLib.Plates[1])
+    assert objPlaLib.Plates[objPlaLib.recommended_plates([4.0])[0][0]].tp == 8
+
+    objPlaLib.Plates[1].tp = 4
+    objPlaLib.clear_index()
+    assert objPlaLib.Plates[objPlaLib.recommended_plates([4.0])[0][0]].tp == 4
+
+
+def test_l_shaped_section_modulus_matches_rectangles():
+    # L-shaped 40 x 3 / 20 x 3 as web and flange rectangles, in cm
+    objProf = SP.Machined('L-shaped 40 x 3 / 20 x 3', 3.0, 40.0, 3.0, 20.0, 'L-shaped')
+    rects = [(0.3, 4.0, 2.0), (2.0, 0.3, 4.15)]
+    area = sum(b*h for b, h, y in rects)
+    ycog = sum(b*h*y for b, h, y in rects) / area
+    Ixx = sum(b*h**3/12 + b*h*(y - ycog)**2 for b, h, y in rects)
+    assert objProf.SM == pytest.approx(Ixx / ycog)
+    objTee = SP.Machined('T-shaped 40 x 3 / 20 x 3', 3.0, 40.0, 3.0, 20.0, 'T-shaped')
+    assert objProf.SM == pytest.approx(objTee.SM)
+
+
+@pytest.mark.parametrize('pType', ['Flat Bar', 'T-shaped', 'L-shaped'])
+def test_machined_method_matches_brute_force_grid(pType):
+    pytest.importorskip('scipy')
+    objVess = create_vessel()
+    objDes = SP.Designer()
+    objStruct = create_section_structure(objVess, objDes)
+    objOpt = SP.Optimizer()
+    bounds = {'hw': (10.0, 60.0), 'tw': (2.0, 8.0), 'wf': (10.0, 40.0), 'tf': (2.0, 8.0)}
+    [objProf, stiffWeight, SMMin, AwMin, feasible] = objOpt.machined_method(
+        objVess, objStruct, SP.ISO12215('A'), objDes, 2, LB.mAL_6082_T6_5, pType, 0, 0,
+        bounds=bounds, increment=1.0)
+    assert feasible
+    assert objProf.SM >= SMMin and objProf.Aw >= AwMin
+
+    names = ['hw', 'tw'] if pType == 'Flat Bar' else ['hw', 'tw', 'wf', 'tf']
+    grids = [numpy.arange(bounds[name][0], bounds[name][1] + 1.0) for name in names]
+    best = numpy.inf
+    for x in itertools.product(*grids):
+        [hw, tw, wf, tf] = objOpt.machined_dims(x, pType)
+        if (objOpt.machined_constraints([hw, tw, wf, tf], pType, AwMin, SMMin) >= 0).all():
+            best = min(best, hw*tw + wf*tf)
+    # The snapped profile is on the grid, and at most a few increments heavier
+    assert best <= objProf.Atot <= 1.05 * best
@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import pytest
-from schprog.skeleton import fib
+
+# schprog.skeleton of the PyScaffold template is not part of the package
+fib = pytest.importorskip('schprog.skeleton').fib
 
 __author__ = "Marcus Naslund"
 __copyright__ = "Marcus Naslund"